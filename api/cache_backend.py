@@ -0,0 +1,451 @@
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, NamedTuple, Tuple
+
+SNAPSHOT_MAGIC = b"BZS1"
+# magic, version, expires_at (unix seconds), payload length
+SNAPSHOT_HEADER = struct.Struct("<4sQdQ")
+SNAPSHOT_FILENAME = "bazaar_snapshot.bin"
+COUNTERS_FILENAME = "shared_cache.sqlite3"
+REFRESH_LEASE_NAME = "bazaar_refresh"
+DEFAULT_LEASE_SECONDS = 15.0
+DEFAULT_MAX_RESPONSES = 256
+# How often rate-limit counters of clients that stopped calling are swept.
+RATE_LIMIT_PRUNE_INTERVAL_SECONDS = 60.0
+
+
+class Snapshot(NamedTuple):
+    version: int
+    data: Dict[str, Any]
+    expires_at: float
+
+
+EMPTY_SNAPSHOT = Snapshot(0, {}, 0.0)
+# (snapshot version, observed at, item -> mid price)
+PriceSample = Tuple[int, float, Dict[str, float]]
+# (row id, item, hour since the epoch, mean buy price, mean sell price, mean volume)
+HourlySample = Tuple[int, str, int, float, float, float]
+# Open clock hour per item: (hour, buy sum, sell sum, volume sum, snapshot count)
+OpenHour = Tuple[int, float, float, float, int]
+
+
+def _fold_open_hours(
+    open_hours: Dict[str, OpenHour],
+    hour: int,
+    observations: Dict[str, Tuple[float, float, float]],
+) -> Tuple[List[Tuple[str, int, float, float, float]], Dict[str, OpenHour]]:
+    """Add one snapshot to each item's open hour; an hour that has ended comes back as its mean."""
+    finished = []
+    updated: Dict[str, OpenHour] = {}
+    for item, (buy_price, sell_price, volume) in observations.items():
+        open_hour, buy_sum, sell_sum, volume_sum, count = open_hours.get(item, (hour, 0.0, 0.0, 0.0, 0))
+        if open_hour != hour:
+            if count:
+                finished.append((item, open_hour, buy_sum / count, sell_sum / count, volume_sum / count))
+            buy_sum, sell_sum, volume_sum, count = 0.0, 0.0, 0.0, 0
+        updated[item] = (hour, buy_sum + buy_price, sell_sum + sell_price, volume_sum + volume, count + 1)
+    return finished, updated
+
+
+class MemoryCacheBackend:
+    """Per-process cache backend. Each worker keeps its own snapshot, buckets and responses."""
+
+    def __init__(self, *, max_responses: int = DEFAULT_MAX_RESPONSES) -> None:
+        self._snapshot = EMPTY_SNAPSHOT
+        self._snapshot_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._rate_limit_buckets: Dict[str, Deque[float]] = {}
+        self._rate_limit_lock = threading.Lock()
+        self._responses: "OrderedDict[str, Tuple[float, bytes, str]]" = OrderedDict()
+        self._responses_lock = threading.Lock()
+        self._max_responses = max(1, max_responses)
+        self._rate_limit_pruned_at = 0.0
+        self._backoffs: Dict[str, float] = {}
+        self._price_samples: Deque[PriceSample] = deque()
+        self._open_hours: Dict[str, OpenHour] = {}
+        self._hourly_samples: List[HourlySample] = []
+        self._hourly_sample_id = 0
+        self._seasonality_lock = threading.Lock()
+
+    def read_snapshot(self) -> Snapshot:
+        return self._snapshot
+
+    def install_snapshot(self, data: Dict[str, Any], ttl_seconds: float) -> Snapshot:
+        with self._snapshot_lock:
+            snapshot = Snapshot(self._snapshot.version + 1, data, time.time() + ttl_seconds)
+            self._snapshot = snapshot
+        return snapshot
+
+    def acquire_refresh_lease(self, *, wait_seconds: float = 0.0) -> bool:
+        if wait_seconds > 0:
+            return self._refresh_lock.acquire(timeout=wait_seconds)
+        return self._refresh_lock.acquire(blocking=False)
+
+    def release_refresh_lease(self) -> None:
+        try:
+            self._refresh_lock.release()
+        except RuntimeError:
+            pass
+
+    def backoff_until(self, name: str) -> float:
+        return self._backoffs.get(name, 0.0)
+
+    def set_backoff(self, name: str, seconds: float) -> None:
+        self._backoffs[name] = time.time() + seconds
+
+    def record_price_samples(self, version: int, observed_at: float, mids: Dict[str, float], *, keep: int) -> None:
+        self._price_samples.append((version, observed_at, dict(mids)))
+        while self._price_samples and self._price_samples[0][0] <= version - keep:
+            self._price_samples.popleft()
+
+    def price_samples_after(self, version: int) -> List[PriceSample]:
+        return [sample for sample in list(self._price_samples) if sample[0] > version]
+
+    def accumulate_seasonality(self, hour: int, observations: Dict[str, Tuple[float, float, float]], *, keep_hours: int) -> None:
+        with self._seasonality_lock:
+            finished, updated = _fold_open_hours(self._open_hours, hour, observations)
+            self._open_hours.update(updated)
+            for sample in finished:
+                self._hourly_sample_id += 1
+                self._hourly_samples.append((self._hourly_sample_id, *sample))
+            if self._hourly_samples and self._hourly_samples[0][2] <= hour - keep_hours:
+                self._hourly_samples = [sample for sample in self._hourly_samples if sample[2] > hour - keep_hours]
+
+    def hourly_samples_after(self, row_id: int) -> List[HourlySample]:
+        samples = self._hourly_samples
+        return samples[bisect_right(samples, row_id, key=lambda sample: sample[0]):]
+
+    def hit_rate_limit(self, key: str, *, window_seconds: float, max_requests: int, now: float) -> bool:
+        with self._rate_limit_lock:
+            cutoff = now - window_seconds
+            if now - self._rate_limit_pruned_at >= RATE_LIMIT_PRUNE_INTERVAL_SECONDS:
+                self._rate_limit_buckets = {
+                    bucket_key: bucket
+                    for bucket_key, bucket in self._rate_limit_buckets.items()
+                    if bucket and bucket[-1] >= cutoff
+                }
+                self._rate_limit_pruned_at = now
+            bucket = self._rate_limit_buckets.setdefault(key, deque())
+            while bucket and bucket[0] < cutoff:
+                bucket.popleft()
+            if len(bucket) >= max_requests:
+                return False
+            bucket.append(now)
+            return True
+
+    def get_response(self, key: str) -> Tuple[bytes, str] | None:
+        with self._responses_lock:
+            entry = self._responses.get(key)
+            if entry is None:
+                return None
+            expires_at, body, media_type = entry
+            if time.time() >= expires_at:
+                del self._responses[key]
+                return None
+            self._responses.move_to_end(key)
+            return body, media_type
+
+    def set_response(self, key: str, body: bytes, media_type: str, ttl_seconds: float) -> None:
+        if ttl_seconds <= 0:
+            return
+        with self._responses_lock:
+            self._responses[key] = (time.time() + ttl_seconds, body, media_type)
+            self._responses.move_to_end(key)
+            while len(self._responses) > self._max_responses:
+                self._responses.popitem(last=False)
+
+
+class SharedFileCacheBackend:
+    """Cache backend shared by every worker process on one host.
+
+    The Bazaar snapshot lives in a memory-mapped file with a small versioned header.
+    Writers build the next file beside it and atomically swap it in with os.replace,
+    so readers always map a complete snapshot. Readers keep their parsed copy until it
+    expires and only decode the mapped payload when the header version changes.
+
+    Rate-limit counters, cached responses, the refresh lease, upstream backoffs, the recent price
+    series and the hour-of-week samples live in SQLite so every worker sees the same limits and
+    history, history survives restarts, and only the lease holder calls upstream.
+    """
+
+    def __init__(self, directory: str, *, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILENAME)
+        self.database_path = os.path.join(directory, COUNTERS_FILENAME)
+        self.lease_seconds = lease_seconds
+        self._owner = f"{os.getpid()}:{id(self)}"
+        self._local = threading.local()
+        self._refresh_lock = threading.Lock()
+        self._reader_lock = threading.Lock()
+        self._mapped_identity: Tuple[int, int] | None = None
+        self._snapshot = EMPTY_SNAPSHOT
+        self._rate_limit_pruned_at = 0.0
+        self._initialize_database()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.database_path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _initialize_database(self) -> None:
+        connection = self._connection()
+        connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS rate_limit_hits (key TEXT NOT NULL, ts REAL NOT NULL);
+            CREATE INDEX IF NOT EXISTS rate_limit_hits_key_ts ON rate_limit_hits (key, ts);
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                media_type TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS leases (name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS backoffs (name TEXT PRIMARY KEY, until REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS price_samples (
+                version INTEGER NOT NULL,
+                observed_at REAL NOT NULL,
+                item TEXT NOT NULL,
+                price REAL NOT NULL,
+                PRIMARY KEY (version, item)
+            );
+            CREATE TABLE IF NOT EXISTS seasonality_open (
+                item TEXT PRIMARY KEY,
+                hour INTEGER NOT NULL,
+                buy_sum REAL NOT NULL,
+                sell_sum REAL NOT NULL,
+                volume_sum REAL NOT NULL,
+                count INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS seasonality_hours (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                item TEXT NOT NULL,
+                hour INTEGER NOT NULL,
+                buy REAL NOT NULL,
+                sell REAL NOT NULL,
+                volume REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS seasonality_hours_hour ON seasonality_hours (hour);
+            """
+        )
+
+    def _file_identity(self) -> Tuple[int, int] | None:
+        try:
+            stat = os.stat(self.snapshot_path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def read_snapshot(self) -> Snapshot:
+        snapshot = self._snapshot
+        if snapshot.data and time.time() < snapshot.expires_at:
+            return snapshot
+
+        with self._reader_lock:
+            identity = self._file_identity()
+            if identity is None or identity == self._mapped_identity:
+                return self._snapshot
+            try:
+                with open(self.snapshot_path, "rb") as file_handle:
+                    with mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        magic, version, expires_at, length = SNAPSHOT_HEADER.unpack_from(mapped, 0)
+                        if magic != SNAPSHOT_MAGIC or SNAPSHOT_HEADER.size + length > len(mapped):
+                            return self._snapshot
+                        if version != self._snapshot.version:
+                            data = json.loads(mapped[SNAPSHOT_HEADER.size:SNAPSHOT_HEADER.size + length])
+                        else:
+                            data = self._snapshot.data
+            except (OSError, ValueError, struct.error):
+                return self._snapshot
+
+            self._mapped_identity = identity
+            self._snapshot = Snapshot(version, data if isinstance(data, dict) else {}, expires_at)
+            return self._snapshot
+
+    def install_snapshot(self, data: Dict[str, Any], ttl_seconds: float) -> Snapshot:
+        current = self.read_snapshot()
+        snapshot = Snapshot(current.version + 1, data, time.time() + ttl_seconds)
+        payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, snapshot.version, snapshot.expires_at, len(payload))
+
+        file_descriptor, temp_path = tempfile.mkstemp(prefix=".snapshot-", dir=self.directory)
+        try:
+            with os.fdopen(file_descriptor, "wb") as file_handle:
+                file_handle.write(header)
+                file_handle.write(payload)
+            os.replace(temp_path, self.snapshot_path)
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+        with self._reader_lock:
+            self._snapshot = snapshot
+            self._mapped_identity = None
+        return snapshot
+
+    def acquire_refresh_lease(self, *, wait_seconds: float = 0.0) -> bool:
+        deadline = time.time() + max(0.0, wait_seconds)
+        acquired = self._refresh_lock.acquire(timeout=wait_seconds) if wait_seconds > 0 else self._refresh_lock.acquire(blocking=False)
+        if not acquired:
+            return False
+        connection = self._connection()
+        while True:
+            now = time.time()
+            cursor = connection.execute(
+                """
+                INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+                WHERE leases.expires_at < ? OR leases.owner = excluded.owner
+                """,
+                (REFRESH_LEASE_NAME, self._owner, now + self.lease_seconds, now),
+            )
+            if cursor.rowcount > 0:
+                return True
+            if now >= deadline:
+                self._refresh_lock.release()
+                return False
+            time.sleep(0.05)
+
+    def release_refresh_lease(self) -> None:
+        try:
+            self._connection().execute(
+                "DELETE FROM leases WHERE name = ? AND owner = ?",
+                (REFRESH_LEASE_NAME, self._owner),
+            )
+        finally:
+            try:
+                self._refresh_lock.release()
+            except RuntimeError:
+                pass
+
+    def backoff_until(self, name: str) -> float:
+        row = self._connection().execute("SELECT until FROM backoffs WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0.0
+
+    def set_backoff(self, name: str, seconds: float) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO backoffs (name, until) VALUES (?, ?)",
+            (name, time.time() + seconds),
+        )
+
+    def record_price_samples(self, version: int, observed_at: float, mids: Dict[str, float], *, keep: int) -> None:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(
+                "INSERT OR REPLACE INTO price_samples (version, observed_at, item, price) VALUES (?, ?, ?, ?)",
+                [(version, observed_at, item, price) for item, price in mids.items()],
+            )
+            connection.execute("DELETE FROM price_samples WHERE version <= ?", (version - keep,))
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+
+    def price_samples_after(self, version: int) -> List[PriceSample]:
+        samples: List[PriceSample] = []
+        rows = self._connection().execute(
+            "SELECT version, observed_at, item, price FROM price_samples WHERE version > ? ORDER BY version",
+            (version,),
+        )
+        for sample_version, observed_at, item, price in rows:
+            if not samples or samples[-1][0] != sample_version:
+                samples.append((sample_version, observed_at, {}))
+            samples[-1][2][item] = price
+        return samples
+
+    def accumulate_seasonality(self, hour: int, observations: Dict[str, Tuple[float, float, float]], *, keep_hours: int) -> None:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            open_hours = {
+                item: (open_hour, buy_sum, sell_sum, volume_sum, count)
+                for item, open_hour, buy_sum, sell_sum, volume_sum, count in connection.execute(
+                    "SELECT item, hour, buy_sum, sell_sum, volume_sum, count FROM seasonality_open"
+                )
+            }
+            finished, updated = _fold_open_hours(open_hours, hour, observations)
+            connection.executemany(
+                "INSERT INTO seasonality_hours (item, hour, buy, sell, volume) VALUES (?, ?, ?, ?, ?)",
+                finished,
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO seasonality_open (item, hour, buy_sum, sell_sum, volume_sum, count) VALUES (?, ?, ?, ?, ?, ?)",
+                [(item, *open_hour) for item, open_hour in updated.items()],
+            )
+            connection.execute("DELETE FROM seasonality_hours WHERE hour <= ?", (hour - keep_hours,))
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+
+    def hourly_samples_after(self, row_id: int) -> List[HourlySample]:
+        return [
+            tuple(row)
+            for row in self._connection().execute(
+                "SELECT id, item, hour, buy, sell, volume FROM seasonality_hours WHERE id > ? ORDER BY id",
+                (row_id,),
+            )
+        ]
+
+    def hit_rate_limit(self, key: str, *, window_seconds: float, max_requests: int, now: float) -> bool:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if now - self._rate_limit_pruned_at >= RATE_LIMIT_PRUNE_INTERVAL_SECONDS:
+                # Keys that never come back would otherwise keep their rows forever.
+                connection.execute("DELETE FROM rate_limit_hits WHERE ts < ?", (now - window_seconds,))
+                self._rate_limit_pruned_at = now
+            connection.execute("DELETE FROM rate_limit_hits WHERE key = ? AND ts < ?", (key, now - window_seconds))
+            (count,) = connection.execute("SELECT COUNT(*) FROM rate_limit_hits WHERE key = ?", (key,)).fetchone()
+            allowed = count < max_requests
+            if allowed:
+                connection.execute("INSERT INTO rate_limit_hits (key, ts) VALUES (?, ?)", (key, now))
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+        return allowed
+
+    def get_response(self, key: str) -> Tuple[bytes, str] | None:
+        row = self._connection().execute(
+            "SELECT body, media_type FROM responses WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        ).fetchone()
+        if row is None:
+            return None
+        return bytes(row[0]), row[1]
+
+    def set_response(self, key: str, body: bytes, media_type: str, ttl_seconds: float) -> None:
+        if ttl_seconds <= 0:
+            return
+        now = time.time()
+        connection = self._connection()
+        connection.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        connection.execute(
+            "INSERT OR REPLACE INTO responses (key, body, media_type, expires_at) VALUES (?, ?, ?, ?)",
+            (key, body, media_type, now + ttl_seconds),
+        )
+
+
+def cache_backend_from_env() -> MemoryCacheBackend | SharedFileCacheBackend:
+    backend_name = os.getenv("CACHE_BACKEND", "").strip().lower()
+    if backend_name in {"shared", "file", "sqlite"}:
+        directory = os.getenv("CACHE_DIR", "").strip() or os.path.join(tempfile.gettempdir(), "skyblock-mutations-cache")
+        return SharedFileCacheBackend(directory)
+    return MemoryCacheBackend()
@@ -0,0 +1,309 @@
+import heapq
+import math
+from typing import Any, Dict, List, Mapping, Sequence
+
+try:
+    from api.optimize import maximize_linear_program
+except ImportError:
+    from optimize import maximize_linear_program
+
+FLOW_EPSILON = 1e-9
+
+
+def recipe_closure(catalog_by_name: Mapping[str, Mapping[str, Any]], name: str) -> List[str]:
+    """`name` and every mutation it consumes, directly or further upstream, upstream first."""
+    ordered: List[str] = []
+    seen = set()
+
+    def visit(current: str) -> None:
+        if current in seen:
+            return
+        seen.add(current)
+        for ingredient, _amount in catalog_by_name[current]["ingredients"]:
+            if ingredient in catalog_by_name:
+                visit(ingredient)
+        ordered.append(current)
+
+    visit(name)
+    return ordered
+
+
+def batch_hours(mutation: Mapping[str, Any], cycle_time_hours: float) -> float:
+    """Expected hours for one plot to spawn and grow a full batch (same model as profit / hour)."""
+    return ((1.0 / mutation.get("metric_spawn_chance", 0.25)) + mutation["growth_stages"]) * cycle_time_hours
+
+
+def solve_production_flow(
+    catalog_by_name: Mapping[str, Mapping[str, Any]],
+    name: str,
+    *,
+    total_plots: float,
+    cycle_time_hours: float,
+    allocations: Mapping[str, float] | None = None,
+) -> Dict[str, Any] | None:
+    """Steady-state output of `name` when every upstream mutation is farmed in-house.
+
+    Variables are plot-batches per hour for each mutation in the recipe closure. Rows keep the
+    shared plots (and any fixed per-mutation `allocations`) within capacity, and every
+    intermediate produced at least as fast as it is consumed; the objective is output of
+    `name` per hour. Plain crops are assumed to be on hand. The bottleneck is the allocation
+    with the highest shadow price, or, when only the shared plots bind, the stage that needs
+    the most plots. None when `name` consumes no mutations.
+    """
+    stages = recipe_closure(catalog_by_name, name)
+    if len(stages) == 1:
+        return None
+    allocations = {stage: plots for stage, plots in (allocations or {}).items() if stage in stages}
+    index = {stage: position for position, stage in enumerate(stages)}
+    hours = [batch_hours(catalog_by_name[stage], cycle_time_hours) for stage in stages]
+
+    rows: List[List[float]] = [list(hours)]
+    bounds: List[float] = [float(total_plots)]
+    allocation_rows: Dict[str, int] = {}
+    for stage, plots in allocations.items():
+        row = [0.0] * len(stages)
+        row[index[stage]] = hours[index[stage]]
+        allocation_rows[stage] = len(rows)
+        rows.append(row)
+        bounds.append(max(0.0, float(plots)))
+    for stage in stages[:-1]:
+        # Consumption by downstream batches minus this stage's own output must stay <= 0.
+        row = [0.0] * len(stages)
+        row[index[stage]] = -float(catalog_by_name[stage]["base_limit"])
+        for consumer in stages:
+            for ingredient, amount in catalog_by_name[consumer]["ingredients"]:
+                if ingredient == stage:
+                    row[index[consumer]] += float(amount)
+        rows.append(row)
+        bounds.append(0.0)
+
+    objective = [0.0] * len(stages)
+    objective[-1] = float(catalog_by_name[name]["base_limit"])
+    result = maximize_linear_program(objective, rows, bounds)
+    if result.status != "optimal":
+        return None
+
+    stage_rows = []
+    for stage, batches, stage_hours in zip(stages, result.x, hours):
+        mutation = catalog_by_name[stage]
+        consumed = sum(
+            amount * result.x[index[consumer]]
+            for consumer in stages
+            for ingredient, amount in catalog_by_name[consumer]["ingredients"]
+            if ingredient == stage
+        )
+        stage_rows.append({
+            "name": stage,
+            "plots": batches * stage_hours,
+            "batch_hours": stage_hours,
+            "output_per_hour": batches * mutation["base_limit"],
+            "consumed_per_hour": consumed,
+        })
+
+    binding = {stage: result.duals[row] for stage, row in allocation_rows.items() if result.duals[row] > FLOW_EPSILON}
+    if binding:
+        bottleneck = max(binding, key=binding.get)
+        bottleneck_kind = "allocation"
+    else:
+        bottleneck = max(stage_rows, key=lambda stage: stage["plots"])["name"]
+        bottleneck_kind = "plots"
+    return {
+        "throughput_per_hour": result.objective,
+        "bottleneck": bottleneck,
+        "bottleneck_kind": bottleneck_kind,
+        # Extra output per hour from one more shared plot / one more plot on each fixed allocation.
+        "marginal_output_per_plot": result.duals[0],
+        "marginal_output_per_allocated_plot": {stage: result.duals[row] for stage, row in allocation_rows.items()},
+        "stages": stage_rows,
+    }
+
+
+def solve_catalog_flows(
+    catalog: Sequence[Mapping[str, Any]],
+    *,
+    total_plots: float,
+    cycle_time_hours: float,
+    allocations: Mapping[str, float] | None = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Production flow for every mutation that consumes other mutations."""
+    catalog_by_name = {mutation["name"]: mutation for mutation in catalog}
+    flows = {}
+    for mutation in catalog:
+        flow = solve_production_flow(
+            catalog_by_name,
+            mutation["name"],
+            total_plots=total_plots,
+            cycle_time_hours=cycle_time_hours,
+            allocations=allocations,
+        )
+        if flow is not None:
+            flows[mutation["name"]] = flow
+    return flows
+
+
+def critical_path_hours(
+    catalog_by_name: Mapping[str, Mapping[str, Any]],
+    name: str,
+    cycle_time_hours: float,
+    memo: Dict[str, float] | None = None,
+) -> float:
+    """Hours to build `name` from plain crops with unlimited plots: its batch plus the slowest upstream chain.
+
+    `memo` holds finished subtrees, so a catalog-wide pass visits every mutation once.
+    """
+    memo = {} if memo is None else memo
+    if name not in memo:
+        upstream = [
+            critical_path_hours(catalog_by_name, ingredient, cycle_time_hours, memo)
+            for ingredient, _amount in catalog_by_name[name]["ingredients"]
+            if ingredient in catalog_by_name
+        ]
+        memo[name] = batch_hours(catalog_by_name[name], cycle_time_hours) + max(upstream, default=0.0)
+    return memo[name]
+
+
+def stage_owns_plots(stage: str, running: Sequence[tuple]) -> bool:
+    """True when every busy plot is already growing `stage`."""
+    return all(running_stage == stage for _end, running_stage in running)
+
+
+def plan_build(
+    catalog_by_name: Mapping[str, Mapping[str, Any]],
+    name: str,
+    *,
+    total_plots: int,
+    cycle_time_hours: float,
+    batches: int | None = None,
+    memo: Dict[str, float] | None = None,
+) -> Dict[str, Any] | None:
+    """End-to-end lead time for `batches` plot-batches of `name` (default: one per plot), starting from plain crops.
+
+    Demand is pushed down the recipe graph and rounded to whole plot-batches per stage; a stage
+    can be planted once every upstream stage it consumes has been harvested. Batches are list-
+    scheduled onto the plots, longest remaining chain first (critical-path priority), which is
+    time-optimal whenever the plots are not the constraint. `lower_bound_hours` is the larger of
+    the unlimited-plot critical path and the total plot time spread evenly, so the gap to
+    `lead_time_hours` bounds how far the schedule can be from optimal. None when `name` consumes
+    no mutations.
+    """
+    stages = recipe_closure(catalog_by_name, name)
+    if len(stages) == 1 or total_plots < 1:
+        return None
+    memo = {} if memo is None else memo
+    hours = {stage: batch_hours(catalog_by_name[stage], cycle_time_hours) for stage in stages}
+
+    # Downstream first, so every consumer's batch count is final before its ingredients are sized.
+    needed = {stage: 0 for stage in stages}
+    needed[name] = total_plots if batches is None else max(1, int(batches))
+    for stage in reversed(stages):
+        for ingredient, amount in catalog_by_name[stage]["ingredients"]:
+            if ingredient in needed:
+                needed[ingredient] += amount * needed[stage]
+        if stage != name:
+            needed[stage] = math.ceil(needed[stage] / max(1, catalog_by_name[stage]["base_limit"]))
+
+    # Remaining hours from the start of a stage's batch to the end of the build.
+    tail: Dict[str, float] = {}
+    for stage in reversed(stages):
+        consumers = [
+            tail[consumer]
+            for consumer in stages
+            if consumer in tail and any(ingredient == stage for ingredient, _amount in catalog_by_name[consumer]["ingredients"])
+        ]
+        tail[stage] = hours[stage] + max(consumers, default=0.0)
+
+    inputs = {
+        stage: {ingredient for ingredient, _amount in catalog_by_name[stage]["ingredients"] if ingredient in needed}
+        for stage in stages
+    }
+    remaining = dict(needed)  # batches still to plant
+    unfinished = dict(needed)  # batches still to harvest
+    harvested_at = {stage: 0.0 for stage in stages}
+    started_at: Dict[str, float] = {}
+    order: List[str] = []
+    plots = [0.0] * total_plots
+    running: List[tuple] = []
+    clock = 0.0
+    while True:
+        ready = sorted(
+            (stage for stage in stages if remaining[stage] and not any(unfinished[i] for i in inputs[stage])),
+            key=lambda stage: tail[stage],
+            reverse=True,
+        )
+        if ready and stage_owns_plots(ready[0], running):
+            # No stage can finish (and change what is ready) before this one's batches are all
+            # planted, so hand them out in whole rounds: equal batches on plots that free up
+            # within one batch of each other go round-robin.
+            stage = ready[0]
+            if stage not in started_at:
+                started_at[stage] = clock
+                order.append(stage)
+            free_times = sorted([clock] * len(plots) + [end for end, _stage in running])
+            rounds, extra = divmod(remaining[stage], total_plots)
+            ends = [free + (rounds + (position < extra)) * hours[stage] for position, free in enumerate(free_times)]
+            remaining[stage] = 0
+            running = [(end, stage) for end in ends if end > clock]
+            # Each plot's last batch stands in for the ones before it, which finish earlier.
+            unfinished[stage] = len(running)
+            plots = [end for end in ends if end <= clock]
+            heapq.heapify(running)
+            continue
+        for stage in ready:
+            while remaining[stage] and plots:
+                heapq.heappop(plots)
+                remaining[stage] -= 1
+                heapq.heappush(running, (clock + hours[stage], stage))
+                if stage not in started_at:
+                    started_at[stage] = clock
+                    order.append(stage)
+        if not running:
+            break
+        clock = running[0][0]
+        while running and running[0][0] <= clock:
+            end, stage = heapq.heappop(running)
+            heapq.heappush(plots, end)
+            unfinished[stage] -= 1
+            harvested_at[stage] = max(harvested_at[stage], end)
+
+    critical_path = [name]
+    while True:
+        upstream = inputs[critical_path[-1]]
+        if not upstream:
+            break
+        critical_path.append(max(upstream, key=lambda ingredient: critical_path_hours(catalog_by_name, ingredient, cycle_time_hours, memo)))
+    critical_hours = critical_path_hours(catalog_by_name, name, cycle_time_hours, memo)
+    work_hours = sum(needed[stage] * hours[stage] for stage in stages)
+    return {
+        "lead_time_hours": clock,
+        "critical_path_hours": critical_hours,
+        "critical_path": list(reversed(critical_path)),
+        "work_hours": work_hours,
+        "lower_bound_hours": max(critical_hours, work_hours / total_plots),
+        "build_order": [
+            {
+                "name": stage,
+                "batches": needed[stage],
+                "start_hours": started_at[stage],
+                "end_hours": harvested_at[stage],
+                "batch_hours": hours[stage],
+            }
+            for stage in order
+        ],
+    }
+
+
+def plan_catalog_builds(
+    catalog: Sequence[Mapping[str, Any]],
+    *,
+    total_plots: int,
+    cycle_time_hours: float,
+) -> Dict[str, Dict[str, Any]]:
+    """Build plan for every mutation that consumes other mutations, sharing memoized subtrees."""
+    catalog_by_name = {mutation["name"]: mutation for mutation in catalog}
+    memo: Dict[str, float] = {}
+    plans = {}
+    for mutation in catalog:
+        plan = plan_build(catalog_by_name, mutation["name"], total_plots=total_plots, cycle_time_hours=cycle_time_hours, memo=memo)
+        if plan is not None:
+            plans[mutation["name"]] = plan
+    return plans
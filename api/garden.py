@@ -0,0 +1,474 @@
+import math
+import random
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Sequence, Tuple
+
+GREENHOUSE_SIZE = 10
+# Bernoulli masks are drawn with this many random words, i.e. spawn chances are rounded to 1/2**16.
+SPAWN_CHANCE_BITS = 16
+MAX_FOOTPRINT = 3
+# shared_data.RECIPES entries that are rules rather than crops (handled by the mechanics registry).
+RECIPE_RULE_KEYS = frozenset({"Adjacent Crops", "Unique Crops"})
+RECIPE_NAME_ALIASES = {"dead bush": "Dead Plants"}
+
+
+class GardenGeometry(NamedTuple):
+    """Many plots packed into one integer bitboard.
+
+    Cell (board, row, col) is bit `board * board_bits + row * stride + col`. Every row carries
+    one guard column and every board one guard row, so single-step shifts never wrap into a
+    neighbouring row or board once the result is masked with `cells`.
+    """
+    boards: int
+    width: int
+    height: int
+    stride: int
+    board_bits: int
+    cells: int
+    board_mask: int
+
+
+class AdjacencyRule(NamedTuple):
+    """Where a mutation can spawn: an empty `footprint` x `footprint` block whose surrounding ring
+    holds at least `required` of each crop and at most `max_adjacent_crops` planted cells."""
+    required: Tuple[Tuple[str, int], ...] = ()
+    footprint: int = 1
+    max_adjacent_crops: int | None = None
+
+
+def garden_geometry(boards: int, width: int = GREENHOUSE_SIZE, height: int = GREENHOUSE_SIZE) -> GardenGeometry:
+    stride = width + 1
+    board_bits = (height + 1) * stride
+    row_mask = (1 << width) - 1
+    board_mask = 0
+    for row in range(height):
+        board_mask |= row_mask << (row * stride)
+    cells = 0
+    for board in range(boards):
+        cells |= board_mask << (board * board_bits)
+    return GardenGeometry(boards, width, height, stride, board_bits, cells, board_mask)
+
+
+def pack_layouts(
+    layouts: Sequence[Sequence[Sequence[str | None]]],
+    width: int = GREENHOUSE_SIZE,
+    height: int = GREENHOUSE_SIZE,
+) -> Tuple[GardenGeometry, Dict[str, int]]:
+    """Pack row-major grids of crop names (None = empty spot) into one bitboard per crop."""
+    geometry = garden_geometry(len(layouts), width, height)
+    crops: Dict[str, int] = {}
+    for board, layout in enumerate(layouts):
+        if len(layout) != height or any(len(row) != width for row in layout):
+            raise ValueError(f"Layout {board} must be {height} rows of {width} cells")
+        for row, cells in enumerate(layout):
+            for col, crop in enumerate(cells):
+                if crop:
+                    crops[crop] = crops.get(crop, 0) | (1 << (board * geometry.board_bits + row * geometry.stride + col))
+    return geometry, crops
+
+
+def tile_boards(geometry: GardenGeometry, mask: int) -> int:
+    """`mask`, laid out on board 0, repeated on every board by doubling shifts."""
+    tiled, boards = mask, 1
+    while boards < geometry.boards:
+        step = min(boards, geometry.boards - boards)
+        tiled |= (tiled & ((1 << (step * geometry.board_bits)) - 1)) << (boards * geometry.board_bits)
+        boards += step
+    return tiled
+
+
+def parse_layout(text: str, legend: Mapping[str, str]) -> List[List[str | None]]:
+    """Grid from one line per row, mapping each character through `legend` ('.' = empty)."""
+    return [[legend[char] if char != "." else None for char in line.strip()] for line in text.strip().splitlines()]
+
+
+def ring_size(footprint: int) -> int:
+    return (4 * footprint) + 4
+
+
+def recipe_adjacency(
+    ingredients: Iterable[str],
+    recipe: Mapping[str, Any],
+    footprint: int = 1,
+) -> Tuple[Tuple[Tuple[str, int], ...] | None, int]:
+    """Per-spot neighbour minimums from a `RECIPES` entry, named like the catalog ingredients.
+
+    Recipe names are matched case-insensitively, also against seed items ("Wheat" places
+    "Wheat Seeds"). A recipe that needs more neighbours than a footprint's ring holds implies a
+    larger mutation, so the footprint grows up to `MAX_FOOTPRINT`. Returns ((crop, minimum), ...)
+    and the footprint; the requirements are () when the recipe names no crops, and None when they
+    do not fit any ring, i.e. the recipe cannot be placed on the grid at all.
+    """
+    by_name = {}
+    for ingredient in ingredients:
+        by_name[ingredient.lower()] = ingredient
+        if ingredient.lower().endswith(" seeds"):
+            by_name.setdefault(ingredient.lower()[:-len(" seeds")], ingredient)
+    requirements = []
+    for crop, minimum in recipe.items():
+        if crop in RECIPE_RULE_KEYS or not isinstance(minimum, int) or minimum <= 0:
+            continue
+        name = RECIPE_NAME_ALIASES.get(crop.lower(), crop)
+        requirements.append((by_name.get(name.lower(), name), minimum))
+    needed = sum(minimum for _crop, minimum in requirements)
+    if needed > ring_size(MAX_FOOTPRINT):
+        return None, footprint
+    while ring_size(footprint) < needed:
+        footprint += 1
+    return tuple(requirements), footprint
+
+
+def adjacency_rule(mutation: Mapping[str, Any]) -> AdjacencyRule:
+    """Spawn rule of a compiled catalog entry: its recipe's neighbours, else one of each ingredient.
+
+    The fallback is a guess; `layout_searchable` on the entry says whether the rule came from the recipe.
+    """
+    required = mutation.get("adjacent_requirements") or tuple((crop, 1) for crop, _amount in mutation.get("ingredients", ()))
+    return AdjacencyRule(
+        required=tuple(required),
+        footprint=mutation.get("footprint", 1),
+        max_adjacent_crops=mutation.get("max_adjacent_crops"),
+    )
+
+
+def _shift(geometry: GardenGeometry, mask: int, rows: int, cols: int) -> int:
+    """Bit of each cell set when the cell `rows` down and `cols` right of it is set in `mask`."""
+    offset = rows * geometry.stride + cols
+    shifted = mask >> offset if offset >= 0 else mask << -offset
+    return shifted & geometry.cells
+
+
+def _block_offsets(footprint: int) -> List[Tuple[int, int]]:
+    return [(row, col) for row in range(footprint) for col in range(footprint)]
+
+
+def _ring_offsets(footprint: int) -> List[Tuple[int, int]]:
+    return [
+        (row, col)
+        for row in range(-1, footprint + 1)
+        for col in range(-1, footprint + 1)
+        if not (0 <= row < footprint and 0 <= col < footprint)
+    ]
+
+
+def _anchor_cells(geometry: GardenGeometry, footprint: int) -> int:
+    """Top-left corners whose whole footprint lies on the board."""
+    anchors = geometry.cells
+    for row, col in _block_offsets(footprint):
+        anchors &= _shift(geometry, geometry.cells, row, col)
+    return anchors
+
+
+def _expand(geometry: GardenGeometry, anchors: int, footprint: int) -> int:
+    cells = 0
+    for row, col in _block_offsets(footprint):
+        cells |= _shift(geometry, anchors, -row, -col)
+    return cells
+
+
+def _count_planes(masks: Iterable[int]) -> List[int]:
+    """Bit-sliced per-cell sum of `masks`: planes[i] holds bit i of every cell's count."""
+    planes: List[int] = []
+    for carry in masks:
+        for index, plane in enumerate(planes):
+            planes[index], carry = plane ^ carry, plane & carry
+            if not carry:
+                break
+        if carry:
+            planes.append(carry)
+    return planes
+
+
+def _at_least(planes: Sequence[int], minimum: int, cells: int) -> int:
+    """Cells whose bit-sliced count is >= `minimum`."""
+    if minimum <= 0:
+        return cells
+    if minimum.bit_length() > len(planes):
+        return 0
+    greater = 0
+    equal = cells
+    for index in range(len(planes) - 1, -1, -1):
+        if (minimum >> index) & 1:
+            equal &= planes[index]
+        else:
+            greater |= equal & planes[index]
+            equal &= ~planes[index]
+    return greater | equal
+
+
+def _equals(planes: Sequence[int], value: int, cells: int) -> int:
+    if value.bit_length() > len(planes):
+        return 0
+    equal = cells
+    for index, plane in enumerate(planes):
+        equal &= plane if (value >> index) & 1 else ~plane
+    return equal
+
+
+def _increment(planes: List[int], mask: int) -> None:
+    carry = mask
+    for index, plane in enumerate(planes):
+        planes[index], carry = plane ^ carry, plane & carry
+        if not carry:
+            return
+    planes.append(carry)
+
+
+def _ring_count(geometry: GardenGeometry, mask: int, footprint: int) -> List[int]:
+    return _count_planes(_shift(geometry, mask, row, col) for row, col in _ring_offsets(footprint))
+
+
+def _crop_ring_count(
+    geometry: GardenGeometry,
+    crops: Mapping[str, int],
+    crop: str,
+    footprint: int,
+    ring_cache: Dict[Tuple[str, int], List[int]] | None,
+) -> List[int]:
+    mask = crops.get(crop, 0)
+    if ring_cache is None:
+        return _ring_count(geometry, mask, footprint)
+    key = (crop, mask)
+    planes = ring_cache.get(key)
+    if planes is None:
+        planes = ring_cache[key] = _ring_count(geometry, mask, footprint)
+    return planes
+
+
+def eligible_spots(
+    geometry: GardenGeometry,
+    crops: Mapping[str, int],
+    rule: AdjacencyRule,
+    occupied: int = 0,
+    ring_cache: Dict[Tuple[str, int], List[int]] | None = None,
+) -> int:
+    """Anchors where the mutation may spawn this cycle, for every packed board at once.
+
+    `ring_cache` memoizes per-crop neighbour counts across calls that share a geometry and rule.
+    """
+    planted = occupied
+    for mask in crops.values():
+        planted |= mask
+    empty = geometry.cells & ~planted
+    spots = _anchor_cells(geometry, rule.footprint)
+    for row, col in _block_offsets(rule.footprint):
+        spots &= _shift(geometry, empty, row, col)
+    for crop, minimum in rule.required:
+        spots &= _at_least(_crop_ring_count(geometry, crops, crop, rule.footprint, ring_cache), minimum, geometry.cells)
+    if rule.max_adjacent_crops is not None:
+        crowded = _at_least(_ring_count(geometry, planted, rule.footprint), rule.max_adjacent_crops + 1, geometry.cells)
+        spots &= ~crowded
+    return spots
+
+
+def requirement_progress(
+    geometry: GardenGeometry,
+    crops: Mapping[str, int],
+    rule: AdjacencyRule,
+    ring_cache: Dict[Tuple[str, int], List[int]] | None = None,
+) -> int:
+    """Required neighbours already present around each empty anchor (capped at each minimum), summed.
+
+    A search gradient toward spots.
+    """
+    planted = 0
+    for mask in crops.values():
+        planted |= mask
+    empty = geometry.cells & ~planted
+    anchors = _anchor_cells(geometry, rule.footprint)
+    for row, col in _block_offsets(rule.footprint):
+        anchors &= _shift(geometry, empty, row, col)
+    present = []
+    for crop, minimum in rule.required:
+        planes = _crop_ring_count(geometry, crops, crop, rule.footprint, ring_cache)
+        present.extend(_at_least(planes, threshold, anchors) for threshold in range(1, minimum + 1))
+    return sum((plane.bit_count() << index) for index, plane in enumerate(_count_planes(present)))
+
+
+def _bernoulli_mask(rng: random.Random, nbits: int, probability: float) -> int:
+    """Random mask whose bits are independently set with `probability` (rounded to 1/2**16)."""
+    threshold = round(min(max(probability, 0.0), 1.0) * (1 << SPAWN_CHANCE_BITS))
+    if threshold >= 1 << SPAWN_CHANCE_BITS:
+        return (1 << nbits) - 1
+    mask = 0
+    for bit in range(SPAWN_CHANCE_BITS):
+        word = rng.getrandbits(nbits)
+        mask = (mask | word) if (threshold >> bit) & 1 else (mask & word)
+    return mask
+
+
+def _resolve_overlaps(geometry: GardenGeometry, spawned: int, footprint: int) -> int:
+    """Drop spawns whose block overlaps a spawn earlier in reading order (conservative for chains)."""
+    if footprint == 1:
+        return spawned
+    blocked = 0
+    for row in range(-(footprint - 1), 1):
+        for col in range(-(footprint - 1), footprint):
+            if row < 0 or col < 0:
+                blocked |= _shift(geometry, spawned, row, col)
+    return spawned & ~blocked
+
+
+def _per_board(geometry: GardenGeometry, mask: int) -> List[int]:
+    return [((mask >> (board * geometry.board_bits)) & geometry.board_mask).bit_count() for board in range(geometry.boards)]
+
+
+def _nonempty_boards(geometry: GardenGeometry, mask: int) -> int:
+    """How many boards have any bit of `mask` set, without splitting it per board.
+
+    Right shifts OR each bit's higher neighbours into it until the window is one board wide,
+    so every board's first bit ends up holding the whole board.
+    """
+    window = 1
+    while window * 2 <= geometry.board_bits:
+        mask |= mask >> window
+        window *= 2
+    if window < geometry.board_bits:
+        mask |= mask >> (geometry.board_bits - window)
+    return (mask & tile_boards(geometry, 1)).bit_count()
+
+
+def _grow(geometry: GardenGeometry, age: List[int], growing: int, growth_stages: int) -> Tuple[List[int], int]:
+    """Age `growing` anchors one stage; returns the age planes and the anchors harvested this cycle.
+
+    Shared by both simulations: a mutation spawns at stage 0, ages at the start of every later
+    cycle and is harvested in the cycle it reaches `growth_stages`, so a spot that spawns every
+    time it can completes one batch per 1/p + g cycles. Harvested anchors restart at stage 0.
+    """
+    _increment(age, growing)
+    ripe = growing & _equals(age, growth_stages, geometry.cells)
+    if ripe:
+        age = [plane & ~ripe for plane in age]
+    return age, ripe
+
+
+def simulate_garden(
+    layouts: Sequence[Sequence[Sequence[str | None]]],
+    rule: AdjacencyRule,
+    *,
+    spawn_chance: float,
+    growth_stages: int,
+    cycles: int,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """Step every layout through `cycles` garden cycles at once and measure its real spawn rate.
+
+    Each cycle, growing mutations age one stage (see `_grow`) and are harvested once they have
+    grown `growth_stages` stages, then every other eligible spot spawns with `spawn_chance`.
+    Mutations count as planted neighbours, so isolation rules can be broken by
+    an adjacent spawn. `effective_spawn_chance` is spawns per free spot-cycle over the spots that
+    qualified on the empty layout, directly comparable to the flat per-spot spawn chance.
+    """
+    geometry, crops = pack_layouts(layouts)
+    rng = random.Random(seed)
+    nbits = geometry.boards * geometry.board_bits
+    footprint = rule.footprint
+    growth_stages = max(int(growth_stages), 1)
+
+    designated = eligible_spots(geometry, crops, rule)
+    occupied = 0  # anchors of growing mutations
+    age: List[int] = []  # bit-sliced stages grown per anchor
+    spawns = [0] * geometry.boards
+    harvests = [0] * geometry.boards
+    free_spot_cycles = [0] * geometry.boards
+    for _ in range(cycles):
+        age, mature = _grow(geometry, age, occupied, growth_stages)
+        # A harvested cell is replanted and spawns again from the next cycle, as in the 1/p + g model.
+        if mature:
+            occupied &= ~mature
+            for board, count in enumerate(_per_board(geometry, mature)):
+                harvests[board] += count
+
+        for board, count in enumerate(_per_board(geometry, designated & ~(occupied | mature))):
+            free_spot_cycles[board] += count
+        eligible = eligible_spots(geometry, crops, rule, _expand(geometry, occupied | mature, footprint))
+        spawned = _resolve_overlaps(geometry, eligible & _bernoulli_mask(rng, nbits, spawn_chance), footprint)
+        if spawned:
+            occupied |= spawned
+            age = [plane & ~spawned for plane in age]
+            for board, count in enumerate(_per_board(geometry, spawned)):
+                spawns[board] += count
+
+    results = []
+    for board, qualifying in enumerate(_per_board(geometry, designated)):
+        results.append({
+            "qualifying_spots": qualifying,
+            "spawns": spawns[board],
+            "harvests": harvests[board],
+            "harvests_per_cycle": harvests[board] / cycles if cycles else 0.0,
+            "effective_spawn_chance": spawns[board] / free_spot_cycles[board] if free_spot_cycles[board] else 0.0,
+        })
+    return results
+
+
+def simulate_spread(
+    layout: Sequence[Sequence[str | None]],
+    spots: Iterable[Tuple[int, int]],
+    rule: AdjacencyRule,
+    *,
+    spawn_chance: float,
+    growth_stages: int,
+    spread_chance: float,
+    trials: int = 256,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Monte Carlo of one batch on `layout` when the mutation eats the crops around it.
+
+    All trials run side by side as packed boards. Each cycle, growing mutations age a stage and
+    ripe ones are harvested, exactly as in `simulate_garden`; then free planned `spots` that still
+    satisfy `rule` spawn with `spawn_chance`; then every growing mutation destroys each planted
+    cell in its ring with `spread_chance`. Eaten ingredients can stop neighbouring spots from ever
+    spawning. A trial ends once nothing can spawn and everything spawned is harvested, and
+    `batch_cycles` counts the harvest cycle like the 1/p + g model does. Returns per-trial means.
+    """
+    # Every trial starts from the same board, so pack it once and tile it.
+    _single, crops = pack_layouts([layout])
+    geometry = garden_geometry(trials)
+    crops = {crop: tile_boards(geometry, mask) for crop, mask in crops.items()}
+    rng = random.Random(seed)
+    nbits = geometry.boards * geometry.board_bits
+    footprint = rule.footprint
+    growth_stages = max(int(growth_stages), 1)
+    max_cycles = int(math.ceil(20.0 / max(spawn_chance, 1e-6))) + growth_stages
+
+    planned = 0
+    for row, col in spots:
+        planned |= 1 << (row * geometry.stride + col)
+    designated = tile_boards(geometry, planned)
+    planted_at_start = {crop: mask.bit_count() for crop, mask in crops.items()}
+
+    occupied = 0
+    mature = 0
+    age: List[int] = []
+    batch_cycles = 0
+    for _ in range(max_cycles):
+        age, ripe = _grow(geometry, age, occupied & ~mature, growth_stages)
+        mature |= ripe
+        # Harvested spots stay occupied: each planned spot yields one mutation per batch.
+        occupied_cells = _expand(geometry, occupied, footprint)
+        open_spots = designated & ~occupied & eligible_spots(geometry, crops, rule, occupied_cells)
+        active_boards = _nonempty_boards(geometry, open_spots | (occupied & ~mature) | ripe)
+        if not active_boards:
+            break
+        batch_cycles += active_boards
+
+        spawned = _resolve_overlaps(geometry, open_spots & _bernoulli_mask(rng, nbits, spawn_chance), footprint)
+        occupied |= spawned
+
+        growing = occupied & ~mature
+        bitten = 0
+        for row, col in _ring_offsets(footprint):
+            bitten |= _shift(geometry, growing, -row, -col) & _bernoulli_mask(rng, nbits, spread_chance)
+        if bitten:
+            for crop, mask in crops.items():
+                crops[crop] = mask & ~bitten
+
+    planned_spots = planned.bit_count()
+    surviving = mature.bit_count() / trials
+    return {
+        "trials": trials,
+        "planned_spots": planned_spots,
+        "surviving_spots": surviving,
+        "survival_rate": surviving / planned_spots if planned_spots else 0.0,
+        "destroyed": {crop: (planted_at_start[crop] - mask.bit_count()) / trials for crop, mask in crops.items()},
+        "batch_cycles": batch_cycles / trials,
+    }
@@ -0,0 +1,173 @@
+import math
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+
+# Relative price resolution of the memoized policies (about 2% steps in the price ratio).
+PRICE_RATIO_BUCKET = 0.02
+MAX_POLICY_ITERATIONS = 64
+RATE_TOLERANCE = 1e-12
+
+
+def ramp_index_distribution(stages: int, reset_chance: float) -> List[List[float]]:
+    """P(ramp index = k at stage t) when every stage either advances the ramp or resets it to 0."""
+    distribution = [[1.0]]
+    for _ in range(stages):
+        previous = distribution[-1]
+        current = [0.0] * (len(previous) + 1)
+        current[0] = reset_chance * sum(previous)
+        for index, probability in enumerate(previous):
+            current[index + 1] += (1.0 - reset_chance) * probability
+        distribution.append(current)
+    return distribution
+
+
+def expected_multiplier_at_stage(stage_multipliers: Sequence[float], reset_chance: float, stage: int) -> float:
+    distribution = ramp_index_distribution(stage, reset_chance)[stage]
+    return sum(probability * stage_multipliers[index] for index, probability in enumerate(distribution))
+
+
+def calibrate_reset_chance(stage_multipliers: Sequence[float], stage: int, target_multiplier: float) -> float:
+    """Per-stage reset probability whose expected multiplier at `stage` equals `target_multiplier`."""
+    low, high = 0.0, 1.0
+    for _ in range(60):
+        middle = (low + high) / 2.0
+        if expected_multiplier_at_stage(stage_multipliers, middle, stage) > target_multiplier:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2.0
+
+
+class HarvestPolicy(NamedTuple):
+    harvest: Tuple[Tuple[bool, ...], ...]  # harvest[t][k]: harvest at stage t with ramp index k
+    expected_stage: float
+    expected_multiplier: float
+
+
+def _reachable_indexes(stage: int, reset_chance: float) -> range:
+    return range(stage, stage + 1) if reset_chance <= 0.0 else range(stage + 1)
+
+
+def _best_response(
+    stage_multipliers: Sequence[float],
+    reset_chance: float,
+    fixed_ratio: float,
+    rate: float,
+) -> Tuple[Tuple[bool, ...], ...]:
+    """Backward induction maximizing E[reward - rate * cycles] over when to harvest."""
+    max_stage = len(stage_multipliers) - 1
+    harvest: List[Tuple[bool, ...]] = [()] * (max_stage + 1)
+    next_values: List[float] = []
+    for stage in range(max_stage, -1, -1):
+        values = [0.0] * (stage + 1)
+        decisions = [False] * (stage + 1)
+        for index in _reachable_indexes(stage, reset_chance):
+            reward = stage_multipliers[index] + fixed_ratio
+            if stage == max_stage:
+                values[index], decisions[index] = reward, True
+                continue
+            wait = -rate + ((1.0 - reset_chance) * next_values[index + 1])
+            if reset_chance > 0.0:
+                wait += reset_chance * next_values[0]
+            # Stage 0 is the freshly spawned plant; it is only harvestable from stage 1.
+            if stage >= 1 and reward >= wait:
+                values[index], decisions[index] = reward, True
+            else:
+                values[index] = wait
+        harvest[stage] = tuple(decisions)
+        next_values = values
+    return tuple(harvest)
+
+
+def _evaluate(
+    harvest: Tuple[Tuple[bool, ...], ...],
+    stage_multipliers: Sequence[float],
+    reset_chance: float,
+) -> Tuple[float, float]:
+    """Expected harvest stage and multiplier of a policy, by pushing the ramp distribution forward."""
+    expected_stage = 0.0
+    expected_multiplier = 0.0
+    alive = [1.0]
+    for stage, decisions in enumerate(harvest):
+        continuing = [0.0] * (stage + 1)
+        for index, probability in enumerate(alive):
+            if probability <= 0.0:
+                continue
+            if decisions[index]:
+                expected_stage += probability * stage
+                expected_multiplier += probability * stage_multipliers[index]
+            else:
+                continuing[index] = probability
+        alive = [0.0] * (stage + 2)
+        total = sum(continuing)
+        alive[0] = reset_chance * total
+        for index, probability in enumerate(continuing):
+            alive[index + 1] += (1.0 - reset_chance) * probability
+    return expected_stage, expected_multiplier
+
+
+@lru_cache(maxsize=512)
+def solve_harvest_policy(
+    stage_multipliers: Tuple[float, ...],
+    reset_chance: float,
+    spawn_chance: float,
+    fixed_ratio: float,
+) -> HarvestPolicy:
+    """Harvest policy maximizing expected profit per cycle, with profit in units of one multiplier point.
+
+    A batch earns multiplier * crop_value + fixed_value and takes 1/p spawn cycles plus the
+    stages it was grown. Rewards scale out, so only fixed_value / crop_value matters, and the
+    cycle time scales the rate without moving the optimum. The ratio objective is solved with
+    Dinkelbach iterations over a backward induction on (stage, ramp index).
+    """
+    spawn_cycles = 1.0 / spawn_chance
+    harvest = _best_response(stage_multipliers, reset_chance, fixed_ratio, math.inf)
+    rate = -math.inf
+    for _ in range(MAX_POLICY_ITERATIONS):
+        expected_stage, expected_multiplier = _evaluate(harvest, stage_multipliers, reset_chance)
+        next_rate = (expected_multiplier + fixed_ratio) / (spawn_cycles + expected_stage)
+        if next_rate - rate <= RATE_TOLERANCE * max(1.0, abs(next_rate)):
+            break
+        rate = next_rate
+        harvest = _best_response(stage_multipliers, reset_chance, fixed_ratio, rate)
+    expected_stage, expected_multiplier = _evaluate(harvest, stage_multipliers, reset_chance)
+    return HarvestPolicy(harvest, expected_stage, expected_multiplier)
+
+
+def _bucketed_ratio(ratio: float) -> float:
+    # asinh keeps the buckets relative for large ratios and well defined through zero.
+    return math.sinh(round(math.asinh(ratio) / PRICE_RATIO_BUCKET) * PRICE_RATIO_BUCKET)
+
+
+def plan_harvest_stage(
+    *,
+    stage_multipliers: Tuple[float, ...],
+    reset_chance: float,
+    spawn_chance: float,
+    crop_value: float,
+    fixed_value: float,
+) -> Dict[str, Any] | None:
+    """Best harvest policy for one batch, or None when the multiplier has nothing to act on.
+
+    `crop_value` is the batch's crop revenue at 1x and `fixed_value` the rest of the profit
+    (mutation sale minus setup). Policies are memoized per price-ratio bucket.
+    """
+    if len(stage_multipliers) < 2 or crop_value <= 0.0 or not (0.0 < spawn_chance <= 1.0):
+        return None
+    policy = solve_harvest_policy(
+        stage_multipliers,
+        reset_chance,
+        spawn_chance,
+        _bucketed_ratio(fixed_value / crop_value),
+    )
+    thresholds: List[int | None] = []
+    for decisions in policy.harvest:
+        thresholds.append(next((index for index, harvest in enumerate(decisions) if harvest), None))
+    return {
+        "max_stage": len(stage_multipliers) - 1,
+        "reset_chance": reset_chance,
+        "expected_stage": policy.expected_stage,
+        "expected_multiplier": policy.expected_multiplier,
+        # Per stage, the lowest ramp index worth harvesting at (None = keep growing).
+        "harvest_from_ramp_index": thresholds,
+    }
@@ -2,22 +2,65 @@ import csv
 import io
 import os
 import json
+import hashlib
 import time
 import math
 import logging
-from collections import defaultdict, deque
-from threading import Lock
-from typing import Dict, Any, Deque, List
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, NamedTuple
 from urllib.parse import urlparse
 
-from fastapi import FastAPI, Query, Request
+from fastapi import Depends, FastAPI, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 try:
-    from api.shared_data import NPC_PRICES, get_bazaar_prices, csv_data, DEFAULT_REQS
+    from api.shared_data import NPC_PRICES, RECIPES, get_bazaar_prices, csv_data, DEFAULT_REQS
+    from api.cache_backend import cache_backend_from_env
+    from api.planner import plan_milestones, plan_target_quantity
+    from api.flow import plan_catalog_builds, solve_catalog_flows
+    from api.harvest import plan_harvest_stage
+    from api.pareto import pareto_front
+    from api.stability import price_noise_widths, rank_stability
+    from api.price_stats import PriceHistory, mid_prices
+    from api.seasonality import SeasonalityIndex, hour_of_week_label
+    from api.upgrades import FORTUNE_STEP, compute_upgrade_gains, parse_upgrade_costs
+    from api.layout import apply_optimized_layout, spread_risk_by_layout, spread_risk_for
+    from api.garden import recipe_adjacency
+    from api.mechanics import (
+        DEFAULT_METRIC_SPAWN_CHANCE,
+        LONELILY_METRIC_SPAWN_CHANCE,
+        MARKET_SPREAD_WARNING,
+        PLACEHOLDER_STAGE_CURVE_WARNING,
+        compile_mechanics,
+        mechanics_for,
+    )
+    from api.mut_calc import compute_profit_rates
 except ImportError:
-    from shared_data import NPC_PRICES, get_bazaar_prices, csv_data, DEFAULT_REQS
+    from shared_data import NPC_PRICES, RECIPES, get_bazaar_prices, csv_data, DEFAULT_REQS
+    from cache_backend import cache_backend_from_env
+    from planner import plan_milestones, plan_target_quantity
+    from flow import plan_catalog_builds, solve_catalog_flows
+    from harvest import plan_harvest_stage
+    from pareto import pareto_front
+    from stability import price_noise_widths, rank_stability
+    from price_stats import PriceHistory, mid_prices
+    from seasonality import SeasonalityIndex, hour_of_week_label
+    from upgrades import FORTUNE_STEP, compute_upgrade_gains, parse_upgrade_costs
+    from layout import apply_optimized_layout, spread_risk_by_layout, spread_risk_for
+    from garden import recipe_adjacency
+    from mechanics import (
+        DEFAULT_METRIC_SPAWN_CHANCE,
+        LONELILY_METRIC_SPAWN_CHANCE,
+        MARKET_SPREAD_WARNING,
+        PLACEHOLDER_STAGE_CURVE_WARNING,
+        compile_mechanics,
+        mechanics_for,
+    )
+    from mut_calc import compute_profit_rates
 
 app = FastAPI(title="Skyblock Mutations API")
 logger = logging.getLogger(__name__)
@@ -97,11 +140,22 @@ app.add_middleware(
 RATE_LIMIT_WINDOW_SECONDS = _env_int("RATE_LIMIT_WINDOW_SECONDS", 60, minimum=1, maximum=3600)
 RATE_LIMIT_MAX_REQUESTS = _env_int("RATE_LIMIT_MAX_REQUESTS", 120, minimum=1, maximum=5000)
 BAZAAR_CACHE_TTL_SECONDS = _env_int("BAZAAR_CACHE_TTL_SECONDS", 30, minimum=5, maximum=300)
-_rate_limit_buckets: Dict[str, Deque[float]] = defaultdict(deque)
-_rate_limit_lock = Lock()
-_bazaar_cache_lock = Lock()
-_bazaar_cache_data: Dict[str, Dict[str, float]] = {}
-_bazaar_cache_expires_at = 0.0
+BAZAAR_COLD_START_WAIT_SECONDS = 6.0
+# After a failed cold-start fetch, every worker skips upstream for this long.
+BAZAAR_FAILURE_BACKOFF_SECONDS = 5.0
+BAZAAR_BACKOFF_NAME = "bazaar_fetch"
+# Query parameters that never change the computed leaderboard (the frontend's cache buster).
+RESPONSE_CACHE_IGNORED_PARAMS = {"t"}
+# Snapshot-derived responses served from the shared response cache with an ETag.
+CACHED_RESPONSE_PATHS = frozenset({"/api/leaderboard", "/api/bundle"})
+# Endpoints that build a full leaderboard share the per-client budget.
+RATE_LIMITED_PATHS = frozenset({"/api/leaderboard", "/api/upgrades"})
+# Memory (per process) by default; CACHE_BACKEND=shared shares snapshot, limits and responses across workers.
+_cache_backend = cache_backend_from_env()
+# Rolling per-item price stats over the shared snapshot series (see PriceHistory).
+_price_history = PriceHistory()
+_seasonality_index = SeasonalityIndex(_cache_backend)
+DEFAULT_RISK_AVERSION = 1.0
 
 
 def _client_ip_from_request(request: Request) -> str:
@@ -115,30 +169,88 @@ def _client_ip_from_request(request: Request) -> str:
     return "unknown"
 
 
+def _response_cache_key(request: Request, snapshot_version: int, catalog_version: str) -> str:
+    params = sorted(
+        (key, value)
+        for key, value in request.query_params.multi_items()
+        if key not in RESPONSE_CACHE_IGNORED_PARAMS
+    )
+    return f"{request.url.path}|{snapshot_version}|{catalog_version}|{json.dumps(params, separators=(',', ':'))}"
+
+
+def _response_etag(cache_key: str, snapshot_expires_at: float) -> str:
+    # The expiry pins the snapshot across processes whose per-process version counters may collide.
+    digest = hashlib.sha256(f"{cache_key}|{snapshot_expires_at!r}".encode("utf-8")).hexdigest()[:24]
+    return f'"{digest}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+# Registered before the rate limiter so it runs inside it: cached hits still spend a token.
+@app.middleware("http")
+async def _cache_leaderboard_responses(request: Request, call_next):
+    if request.url.path not in CACHED_RESPONSE_PATHS or request.method != "GET":
+        return await call_next(request)
+
+    snapshot = _cache_backend.read_snapshot()
+    ttl_seconds = snapshot.expires_at - time.time()
+    if not snapshot.data or ttl_seconds <= 0:
+        response = await call_next(request)
+        response.headers["X-Cache"] = "BYPASS"
+        return response
+
+    catalog_version = CATALOG_VERSION
+    cache_key = _response_cache_key(request, snapshot.version, catalog_version)
+    etag = _response_etag(cache_key, snapshot.expires_at)
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers={"ETag": etag, "X-Cache": "HIT"})
+
+    cached = _cache_backend.get_response(cache_key)
+    if cached is not None:
+        body, media_type = cached
+        return Response(content=body, media_type=media_type, headers={"X-Cache": "HIT", "ETag": etag})
+
+    response = await call_next(request)
+    if response.status_code != 200:
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    headers = dict(response.headers)
+    headers.pop("content-length", None)
+    headers["X-Cache"] = "MISS"
+    # Only cache and tag the body if neither the snapshot nor the catalog moved while it was built.
+    if _cache_backend.read_snapshot().version == snapshot.version and CATALOG_VERSION == catalog_version:
+        _cache_backend.set_response(cache_key, body, response.media_type or "application/json", ttl_seconds)
+        headers["ETag"] = etag
+    return Response(content=body, status_code=response.status_code, headers=headers, media_type=response.media_type)
+
+
 @app.middleware("http")
 async def _rate_limit_leaderboard(request: Request, call_next):
-    if request.url.path == "/api/leaderboard":
+    if request.url.path in RATE_LIMITED_PATHS:
         client_ip = _client_ip_from_request(request)
-        now = time.monotonic()
-        with _rate_limit_lock:
-            bucket = _rate_limit_buckets[client_ip]
-            cutoff = now - RATE_LIMIT_WINDOW_SECONDS
-            while bucket and bucket[0] < cutoff:
-                bucket.popleft()
-            if len(bucket) >= RATE_LIMIT_MAX_REQUESTS:
-                return JSONResponse(
-                    status_code=429,
-                    content={"detail": "Rate limit exceeded. Try again shortly."},
-                    headers={
-                        "Retry-After": str(RATE_LIMIT_WINDOW_SECONDS),
-                        "X-RateLimit-Limit": str(RATE_LIMIT_MAX_REQUESTS),
-                        "X-RateLimit-Window": str(RATE_LIMIT_WINDOW_SECONDS),
-                    },
-                )
-            bucket.append(now)
+        allowed = _cache_backend.hit_rate_limit(
+            client_ip,
+            window_seconds=RATE_LIMIT_WINDOW_SECONDS,
+            max_requests=RATE_LIMIT_MAX_REQUESTS,
+            now=time.time(),
+        )
+        if not allowed:
+            return JSONResponse(
+                status_code=429,
+                content={"detail": "Rate limit exceeded. Try again shortly."},
+                headers={
+                    "Retry-After": str(RATE_LIMIT_WINDOW_SECONDS),
+                    "X-RateLimit-Limit": str(RATE_LIMIT_MAX_REQUESTS),
+                    "X-RateLimit-Window": str(RATE_LIMIT_WINDOW_SECONDS),
+                },
+            )
 
     response = await call_next(request)
-    if request.url.path == "/api/leaderboard":
+    if request.url.path in RATE_LIMITED_PATHS:
         response.headers["X-RateLimit-Limit"] = str(RATE_LIMIT_MAX_REQUESTS)
         response.headers["X-RateLimit-Window"] = str(RATE_LIMIT_WINDOW_SECONDS)
     return response
@@ -168,10 +280,25 @@ async def _security_headers(request: Request, call_next):
     response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
     return response
 
+
+# Registered last so it runs outermost, for every endpoint: a worker that only serves
+# /api/upgrades or /api/seasonality still picks up catalog edits.
+@app.middleware("http")
+async def _poll_mutation_catalog(request: Request, call_next):
+    maybe_reload_mutation_catalog()
+    return await call_next(request)
+
+
+MUTATION_DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "mutation_ingredient_list.json")
+# Optional CSV file that replaces the crop drop table bundled in shared_data.csv_data.
+MUTATION_CSV_PATH = os.getenv("MUTATION_CSV_PATH", "").strip() or None
+# How often requests check the catalog files for changes; 0 disables hot reloading.
+CATALOG_RELOAD_INTERVAL_SECONDS = _env_int("CATALOG_RELOAD_INTERVAL_SECONDS", 10, minimum=0, maximum=3600)
+
+
 def _load_manual_data() -> Dict[str, Any]:
-    json_path = os.path.join(os.path.dirname(__file__), "..", "mutation_ingredient_list.json")
     try:
-        with open(json_path, "r", encoding="utf-8") as file_handle:
+        with open(MUTATION_DATA_PATH, "r", encoding="utf-8") as file_handle:
             loaded = json.load(file_handle)
             return loaded if isinstance(loaded, dict) else {}
     except (OSError, json.JSONDecodeError):
@@ -181,19 +308,20 @@ def _load_manual_data() -> Dict[str, Any]:
 
 MANUAL_DATA = _load_manual_data()
 
-DEFAULT_GROWTH_STAGE_BY_MUTATION = {
-    "Magic Jellybean": 120,
-    "All-in Aloe": 14,
-}
-
-DEFAULT_SPECIAL_MULTIPLIER_BY_MUTATION = {
-    "Magic Jellybean": 10.0,
-    "All-in Aloe": 1.8,
-}
-
 SPREAD_WARNING_RATIO = 1.5  # 50% difference => 1.5x ratio between prices.
-DEFAULT_METRIC_SPAWN_CHANCE = 0.25
-LONELILY_METRIC_SPAWN_CHANCE = 0.0045
+HOURS_PER_WEEK = 168.0
+BASE_CYCLE_HOURS = 4.0
+GREENHOUSE_MAX_UPGRADE = 9
+UNIQUE_CROPS_MAX = 12
+# Cycle-time reductions and additive yield bonuses at the max greenhouse upgrade / unique crop count.
+GREENHOUSE_SPEED_REDUCTION = 0.25
+GREENHOUSE_YIELD_BONUS = 0.20
+UNIQUE_SPEED_REDUCTION = 0.30
+UNIQUE_YIELD_BONUS = 0.36
+HARVEST_HARBINGER_FORTUNE = 50.0
+INFINI_VACUUM_FORTUNE = 200.0
+IMPROVED_HARVEST_BOOST_MULTIPLIER = 1.3
+HARVEST_BOOST_MULTIPLIER = 1.2
 CHIP_LEVEL_CAP_BY_RARITY: Dict[str, int] = {
     "rare": 10,
     "epic": 15,
@@ -222,9 +350,168 @@ CSV_IGNORED_COLUMNS = {
 }
 MUSHROOM_SOURCE_COLUMNS = {"Red Mushroom", "Brown Mushroom"}
 MUSHROOM_PRICE_OVERRIDE = 10.0
-VALID_LEADERBOARD_MODES = {"profit", "smart", "target", "hourly"}
+VALID_LEADERBOARD_MODES = {"profit", "smart", "target", "hourly", "liquidity", "renewal"}
 VALID_SETUP_MODES = {"insta_buy", "buy_order"}
 VALID_SELL_MODES = {"insta_sell", "sell_offer"}
+# Row / column order of the market-mode matrix.
+MATRIX_SETUP_MODES = ("insta_buy", "buy_order")
+MATRIX_SELL_MODES = ("insta_sell", "sell_offer")
+VALID_RESPONSE_FORMATS = {"rows", "columns"}
+# Metrics the Pareto view can compare: where each lives in a row and its default direction.
+PARETO_METRICS: Dict[str, tuple[tuple[str, ...], str]] = {
+    "profit": (("profit",), "max"),
+    "profit_per_hour": (("profit_per_hour",), "max"),
+    "profit_per_growth_cycle": (("profit_per_growth_cycle",), "max"),
+    "liquidity_adjusted_profit_per_hour": (("liquidity_adjusted_profit_per_hour",), "max"),
+    "risk_adjusted_profit_per_hour": (("risk_adjusted_profit_per_hour",), "max"),
+    "revenue": (("revenue",), "max"),
+    "score": (("score",), "max"),
+    "opt_cost": (("opt_cost",), "min"),
+    "expected_hours": (("hourly", "expected_hours"), "min"),
+    "payback_hours": (("hourly", "payback_hours_ready"), "min"),
+    "estimated_time_hours": (("breakdown", "estimated_time_hours"), "min"),
+    "growth_stages": (("breakdown", "growth_stages"), "min"),
+}
+VALID_HARVEST_MODES = {"full", "custom_time"}
+MAX_HORIZON_CYCLES = 10_000
+# Row-level fields emitted as one array each in the columnar response format.
+COLUMNAR_ROW_FIELDS = (
+    "mutationName",
+    "score",
+    "profit",
+    "profit_per_growth_cycle",
+    "profit_per_hour",
+    "opt_cost",
+    "revenue",
+    "warning",
+    "mut_price",
+    "limit",
+    "liquidity_adjusted_profit_per_hour",
+    "pareto_optimal",
+)
+# tau_hours and the legacy harvest-mode fields are identical for every row, so they live in "constants".
+COLUMNAR_HOURLY_FIELDS = (
+    "mutation_chance",
+    "profit_per_hour_selected",
+    "p",
+    "g",
+    "N",
+    "expected_spawn_cycles",
+    "expected_cycles",
+    "expected_hours",
+    "cycles_per_harvest_per_spot",
+    "hours_per_harvest_per_spot",
+    "harvests_per_cycle",
+    "harvests_per_hour",
+    "profit_per_hour",
+    "payback_hours_ready",
+    "harvest_time_hours",
+    "completed_cycles",
+    "expected_spawned",
+    "expected_mutations",
+    "expected_revenue",
+    "expected_profit",
+    "expected_profit_per_hour",
+)
+COLUMNAR_LIQUIDITY_FIELDS = (
+    "setup_fill_hours",
+    "sell_fill_hours",
+    "bottleneck_hours",
+    "bottleneck",
+    "liquidity_adjusted_profit_per_hour",
+)
+COLUMNAR_RENEWAL_FIELDS = (
+    "p",
+    "N",
+    "v_net",
+    "cycles_per_harvest_per_spot",
+    "hours_per_harvest_per_spot",
+    "harvests_per_cycle",
+    "harvests_per_hour",
+    "profit_per_cycle",
+    "profit_per_hour",
+    "payback_hours",
+)
+COLUMNAR_SPREAD_RISK_FIELDS = (
+    "applied",
+    "survival_rate",
+    "surviving_spots",
+    "replant_cost",
+    "lost_revenue",
+    "profit_loss",
+)
+COLUMNAR_BUILD_PLAN_FIELDS = (
+    "lead_time_hours",
+    "critical_path_hours",
+    "work_hours",
+    "lower_bound_hours",
+)
+COLUMNAR_PRICE_RISK_FIELDS = (
+    "horizon_hours",
+    "samples",
+    "revenue_sigma",
+    "profit_per_hour_sigma",
+    "mutation_drawdown",
+)
+COLUMNAR_MODE_MATRIX_FIELDS = (
+    "profit",
+    "profit_per_hour",
+    "liquidity_adjusted_profit_per_hour",
+    "best",
+)
+COLUMNAR_ORDER_TIMING_FIELDS = (
+    "buy_hour_of_week",
+    "sell_hour_of_week",
+    "setup_cost_change",
+    "revenue_change",
+    "projected_profit",
+    "projected_profit_per_hour",
+)
+COLUMNAR_RANK_STABILITY_FIELDS = (
+    "p_top1",
+    "p_top5",
+    "median_rank",
+    "rank_low",
+    "rank_high",
+)
+COLUMNAR_PRODUCTION_FLOW_FIELDS = (
+    "throughput_per_hour",
+    "bottleneck",
+    "bottleneck_kind",
+    "marginal_output_per_plot",
+)
+# Nested per-row blocks of scalars, each emitted as its own group of columns.
+COLUMNAR_BLOCK_FIELDS: Dict[str, tuple[str, ...]] = {
+    "hourly": COLUMNAR_HOURLY_FIELDS,
+    "liquidity": COLUMNAR_LIQUIDITY_FIELDS,
+    "renewal": COLUMNAR_RENEWAL_FIELDS,
+    "spread_risk": COLUMNAR_SPREAD_RISK_FIELDS,
+    "price_risk": COLUMNAR_PRICE_RISK_FIELDS,
+    "production_flow": COLUMNAR_PRODUCTION_FLOW_FIELDS,
+    "build_plan": COLUMNAR_BUILD_PLAN_FIELDS,
+    "rank_stability": COLUMNAR_RANK_STABILITY_FIELDS,
+    "order_timing": COLUMNAR_ORDER_TIMING_FIELDS,
+    "mode_matrix": COLUMNAR_MODE_MATRIX_FIELDS,
+}
+COLUMNAR_BREAKDOWN_FIELDS = (
+    "base_limit",
+    "total_setup_cost",
+    "total_revenue",
+    "growth_stages",
+    "estimated_time_hours",
+)
+COLUMNAR_INGREDIENT_FIELDS = (
+    "name",
+    "amount",
+    "unit_price",
+    "total_cost",
+    "fill_hours",
+    "top_of_book_price",
+    "slippage_cost",
+    "depth_exhausted",
+)
+# Per-yield math values that vary by crop; the global buffs are hoisted into "constants".
+COLUMNAR_YIELD_FIELDS = ("name", "kind", "amount", "unit_price", "total_value", "base", "limit", "fortune", "overdrive_bonus", "special")
 
 
 def normalized_chip_rarity(value: Any, default: str = "legendary") -> str:
@@ -259,6 +546,64 @@ def canonical_crop_name(name: str) -> str:
     return cleaned
 
 
+def parse_crop_progress(value: Any) -> Dict[str, float]:
+    """Parse "Wheat:1200000,Carrot:5e6" into collected amounts per milestone crop."""
+    progress: Dict[str, float] = {}
+    if not isinstance(value, str):
+        return progress
+    for entry in value.split(","):
+        name, separator, amount = entry.partition(":")
+        if not separator:
+            continue
+        crop_name = canonical_crop_name(name)
+        if crop_name in DEFAULT_REQS:
+            progress[crop_name] = max(0.0, _safe_float(amount.strip()))
+    return progress
+
+
+def parse_plot_allocation(value: Any, mutation_names: Iterable[str]) -> Dict[str, float]:
+    """Parse "Lonelily:2,Noctilume:0.5" into plots reserved per mutation (names match case-insensitively)."""
+    allocations: Dict[str, float] = {}
+    if not isinstance(value, str):
+        return allocations
+    by_lower = {name.lower(): name for name in mutation_names}
+    for entry in value.split(","):
+        name, separator, plots = entry.partition(":")
+        mutation_name = by_lower.get(name.strip().lower())
+        if separator and mutation_name:
+            allocations[mutation_name] = max(0.0, _safe_float(plots.strip()))
+    return allocations
+
+
+def parse_pareto_metrics(value: Any) -> List[tuple[str, str]]:
+    """Parse "profit_per_hour,opt_cost:min" into (metric, "max" | "min") pairs; a bare name uses its default direction."""
+    metrics: List[tuple[str, str]] = []
+    if not isinstance(value, str):
+        return metrics
+    for entry in value.split(","):
+        name, _separator, direction = entry.partition(":")
+        name = name.strip()
+        if name not in PARETO_METRICS or any(name == seen for seen, _direction in metrics):
+            continue
+        direction = direction.strip().lower()
+        metrics.append((name, direction if direction in {"max", "min"} else PARETO_METRICS[name][1]))
+    return metrics
+
+
+def pareto_point(row: Dict[str, Any], metrics: List[tuple[str, str]]) -> tuple[float, ...] | None:
+    """A row's metrics oriented so larger is better, or None when any is missing or non-finite."""
+    point = []
+    for name, direction in metrics:
+        value: Any = row
+        for key in PARETO_METRICS[name][0]:
+            value = value.get(key) if isinstance(value, dict) else None
+        value = _finite_or_none(value)
+        if value is None:
+            return None
+        point.append(value if direction == "max" else -value)
+    return tuple(point)
+
+
 def has_wide_spread(price_a: float, price_b: float) -> bool:
     if price_a <= 0 or price_b <= 0:
         return False
@@ -267,28 +612,143 @@ def has_wide_spread(price_a: float, price_b: float) -> bool:
     return (hi / lo) >= SPREAD_WARNING_RATIO
 
 
-def get_cached_bazaar_prices() -> Dict[str, Dict[str, float]]:
-    global _bazaar_cache_data, _bazaar_cache_expires_at
+def estimate_fill_hours(market: Dict[str, Any], quantity: float, *, is_buying: bool, mode_str: str) -> float | None:
+    """Expected hours for an order of `quantity` to fill against current Bazaar flow.
+
+    Instant modes fill immediately up to the resting volume on the other side of the book
+    and wait for the remainder at that side's weekly turnover rate. Order modes wait for
+    counterparties: buy orders fill as others insta-sell (sellMovingWeek), sell offers fill
+    as others insta-buy (buyMovingWeek). Returns None when volume data is unavailable.
+    """
+    if quantity <= 0:
+        return 0.0
+    if is_buying:
+        resting_key, flow_key = ("buyVolume", "buyMovingWeek") if mode_str == "insta_buy" else (None, "sellMovingWeek")
+    else:
+        resting_key, flow_key = ("sellVolume", "sellMovingWeek") if mode_str == "insta_sell" else (None, "buyMovingWeek")
+
+    if flow_key not in market:
+        return None
+    resting = max(0.0, _safe_float(market.get(resting_key))) if resting_key else 0.0
+    remaining = max(0.0, quantity - resting)
+    if remaining <= 0:
+        return 0.0
+    hourly_flow = _safe_float(market.get(flow_key)) / HOURS_PER_WEEK
+    if hourly_flow <= 0:
+        return None
+    return remaining / hourly_flow
+
+
+class DepthCurve(NamedTuple):
+    prices: tuple[float, ...]
+    cumulative_quantity: tuple[float, ...]
+    cumulative_cost: tuple[float, ...]
+
+
+def build_depth_curve(levels: Any) -> DepthCurve | None:
+    """Precompute cumulative quantity and cost over [price, amount] levels, best price first."""
+    prices: List[float] = []
+    cumulative_quantity: List[float] = []
+    cumulative_cost: List[float] = []
+    quantity_total = 0.0
+    cost_total = 0.0
+    for level in levels or ():
+        try:
+            price, amount = float(level[0]), float(level[1])
+        except (TypeError, ValueError, IndexError):
+            continue
+        if not (math.isfinite(price) and math.isfinite(amount)) or price <= 0 or amount <= 0:
+            continue
+        quantity_total += amount
+        cost_total += price * amount
+        prices.append(price)
+        cumulative_quantity.append(quantity_total)
+        cumulative_cost.append(cost_total)
+    if not prices:
+        return None
+    return DepthCurve(tuple(prices), tuple(cumulative_quantity), tuple(cumulative_cost))
+
+
+def cost_at_size(curve: DepthCurve, quantity: float) -> tuple[float, float]:
+    """Return (total cost, unfilled quantity) for walking `quantity` through the book.
 
-    now = time.monotonic()
-    with _bazaar_cache_lock:
-        if _bazaar_cache_data and now < _bazaar_cache_expires_at:
-            return _bazaar_cache_data
-        stale_data = _bazaar_cache_data
+    Quantity beyond the visible depth is priced at the worst visible level and reported
+    as unfilled so callers can flag it.
+    """
+    if quantity <= 0:
+        return 0.0, 0.0
+    index = bisect_left(curve.cumulative_quantity, quantity)
+    if index >= len(curve.prices):
+        unfilled = quantity - curve.cumulative_quantity[-1]
+        return curve.cumulative_cost[-1] + (unfilled * curve.prices[-1]), unfilled
+    filled_before = curve.cumulative_quantity[index - 1] if index > 0 else 0.0
+    cost_before = curve.cumulative_cost[index - 1] if index > 0 else 0.0
+    return cost_before + ((quantity - filled_before) * curve.prices[index]), 0.0
 
-    fresh_data = get_bazaar_prices()
-    if isinstance(fresh_data, dict) and fresh_data:
-        with _bazaar_cache_lock:
-            _bazaar_cache_data = fresh_data
-            _bazaar_cache_expires_at = now + BAZAAR_CACHE_TTL_SECONDS
-        return fresh_data
 
-    if stale_data:
-        return stale_data
+_depth_curve_cache: Dict[str, Any] = {"snapshot": None, "curves": {}}
+
+
+def get_depth_curves(bazaar_data: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, DepthCurve]]:
+    """Depth curves per item and side, built once per Bazaar snapshot object."""
+    cached = _depth_curve_cache
+    if cached["snapshot"] is bazaar_data:
+        return cached["curves"]
+
+    curves: Dict[str, Dict[str, DepthCurve]] = {}
+    for item, market in bazaar_data.items():
+        if not isinstance(market, dict):
+            continue
+        sides = {}
+        insta_buy_curve = build_depth_curve(market.get("buySummary"))
+        if insta_buy_curve:
+            sides["insta_buy"] = insta_buy_curve
+        insta_sell_curve = build_depth_curve(market.get("sellSummary"))
+        if insta_sell_curve:
+            sides["insta_sell"] = insta_sell_curve
+        if sides:
+            curves[item] = sides
+
+    _depth_curve_cache.update(snapshot=bazaar_data, curves=curves)
+    return curves
+
+
+def get_cached_bazaar_prices() -> Dict[str, Dict[str, float]]:
+    snapshot = _cache_backend.read_snapshot()
+    if snapshot.data and time.time() < snapshot.expires_at:
+        return snapshot.data
+    if not snapshot.data and time.time() < _cache_backend.backoff_until(BAZAAR_BACKOFF_NAME):
+        return {}
+
+    # Only the lease holder calls upstream. Everyone else keeps serving the stale
+    # snapshot, or waits briefly for the leader on a cold start.
+    wait_seconds = 0.0 if snapshot.data else BAZAAR_COLD_START_WAIT_SECONDS
+    if not _cache_backend.acquire_refresh_lease(wait_seconds=wait_seconds):
+        return _cache_backend.read_snapshot().data
 
-    with _bazaar_cache_lock:
-        _bazaar_cache_expires_at = now + 5.0
-    return {}
+    try:
+        snapshot = _cache_backend.read_snapshot()
+        if snapshot.data and time.time() < snapshot.expires_at:
+            return snapshot.data
+        if not snapshot.data and time.time() < _cache_backend.backoff_until(BAZAAR_BACKOFF_NAME):
+            return {}
+
+        fresh_data = get_bazaar_prices()
+        if isinstance(fresh_data, dict) and fresh_data:
+            observed_at = time.time()
+            # Other workers may have installed versions since this one last did.
+            _price_history.catch_up(_cache_backend.price_samples_after(_price_history.version))
+            annotated = _price_history.observe(fresh_data, observed_at, version=snapshot.version + 1)
+            _seasonality_index.observe(annotated)
+            installed = _cache_backend.install_snapshot(annotated, BAZAAR_CACHE_TTL_SECONDS)
+            _cache_backend.record_price_samples(installed.version, observed_at, mid_prices(fresh_data), keep=_price_history.window)
+            refresh_cached_leaderboards(snapshot.data, installed.data)
+            return installed.data
+        if not snapshot.data:
+            _cache_backend.set_backoff(BAZAAR_BACKOFF_NAME, BAZAAR_FAILURE_BACKOFF_SECONDS)
+        return snapshot.data
+    finally:
+        _cache_backend.release_refresh_lease()
 
 
 def _safe_float(value: Any, default: float = 0.0) -> float:
@@ -307,8 +767,12 @@ def _safe_non_negative_int(value: Any, default: int) -> int:
     return max(0, parsed)
 
 
-def _build_mutation_catalog() -> tuple[tuple[Dict[str, Any], ...], frozenset[str]]:
-    reader = csv.DictReader(io.StringIO(csv_data))
+def _build_mutation_catalog(
+    manual_data: Dict[str, Any] | None = None,
+    csv_text: str | None = None,
+) -> tuple[tuple[Dict[str, Any], ...], frozenset[str]]:
+    manual_data = MANUAL_DATA if manual_data is None else manual_data
+    reader = csv.DictReader(io.StringIO(csv_data if csv_text is None else csv_text))
     fieldnames = [column.strip() for column in (reader.fieldnames or [])]
     raw_crop_columns = [column for column in fieldnames if column and column not in CSV_IGNORED_COLUMNS]
     catalog: List[Dict[str, Any]] = []
@@ -321,10 +785,10 @@ def _build_mutation_catalog() -> tuple[tuple[Dict[str, Any], ...], frozenset[str
             if key
         }
         mutation_name = cleaned_row.get("Mutation/Drops", "")
-        if not mutation_name or mutation_name not in MANUAL_DATA:
+        if not mutation_name or mutation_name not in manual_data:
             continue
 
-        mutation_data = MANUAL_DATA[mutation_name]
+        mutation_data = manual_data[mutation_name]
         crop_drops: List[Dict[str, Any]] = []
         for crop_name in raw_crop_columns:
             base_drop = _safe_float(cleaned_row.get(crop_name, "0.0"))
@@ -341,13 +805,11 @@ def _build_mutation_catalog() -> tuple[tuple[Dict[str, Any], ...], frozenset[str
             })
             target_crops.add(display_name)
 
-        special_multiplier = _safe_float(
-            mutation_data.get("special_multiplier", DEFAULT_SPECIAL_MULTIPLIER_BY_MUTATION.get(mutation_name, 1.0)),
-            1.0,
-        )
-        effective_special_multiplier = _safe_float(
-            mutation_data.get("effective_special_multiplier", special_multiplier),
-            special_multiplier,
+        mechanics = compile_mechanics(mutation_name, mutation_data, _safe_float, _safe_non_negative_int)
+        mechanics["adjacent_requirements"], mechanics["footprint"] = recipe_adjacency(
+            mutation_data.get("ingredients", {}),
+            RECIPES.get(mutation_name, {}),
+            mechanics["footprint"],
         )
         mutation_chance_override = mutation_data.get("mutation_chance_override")
 
@@ -355,25 +817,125 @@ def _build_mutation_catalog() -> tuple[tuple[Dict[str, Any], ...], frozenset[str
             "name": mutation_name,
             "base_limit": _safe_non_negative_int(mutation_data.get("count", 1), 1),
             "ingredients": tuple(mutation_data.get("ingredients", {}).items()),
-            "growth_stages": _safe_non_negative_int(
-                mutation_data.get("growth_stages", DEFAULT_GROWTH_STAGE_BY_MUTATION.get(mutation_name, 30)),
-                30,
-            ),
-            "effective_special_multiplier": effective_special_multiplier,
+            **mechanics,
             "mutation_chance_override": _safe_float(mutation_chance_override) if mutation_chance_override is not None else None,
             "crop_drops": tuple(crop_drops),
         })
 
+    # The layout search plants single cells, so it only models recipes that fit a ring and whose
+    # neighbours are single-cell crops; anything else keeps the catalog's own counts.
+    multi_cell = {mutation["name"] for mutation in catalog if mutation["footprint"] > 1}
+    for mutation in catalog:
+        requirements = mutation["adjacent_requirements"]
+        mutation["layout_searchable"] = (
+            mutation["name"] in RECIPES
+            and requirements is not None
+            and not any(crop in multi_cell for crop, _minimum in requirements)
+        )
+
     return tuple(catalog), frozenset(target_crops)
 
 
+def _catalog_version(manual_data: Dict[str, Any], csv_text: str) -> str:
+    """Content hash of the catalog sources, identical in every worker that loaded the same files."""
+    digest = hashlib.sha256(json.dumps(manual_data, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(csv_text.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
 MUTATION_CATALOG, VALID_TARGET_CROPS = _build_mutation_catalog()
+CATALOG_VERSION = _catalog_version(MANUAL_DATA, csv_data)
+_catalog_reload_lock = threading.Lock()
+_catalog_watch_state: Dict[str, Any] = {"stamp": None, "next_check": 0.0}
+
+
+def _catalog_source_stamp() -> tuple:
+    stamp = []
+    for path in (MUTATION_DATA_PATH, MUTATION_CSV_PATH):
+        if path is None:
+            continue
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stamp.append((path, None))
+            continue
+        stamp.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(stamp)
+
+
+def compile_mutation_catalog() -> tuple[Dict[str, Any], tuple[Dict[str, Any], ...], frozenset[str], str]:
+    """Read and validate the catalog files; raises ValueError instead of falling back to empty data."""
+    try:
+        with open(MUTATION_DATA_PATH, "r", encoding="utf-8") as file_handle:
+            manual_data = json.load(file_handle)
+        if MUTATION_CSV_PATH is not None:
+            with open(MUTATION_CSV_PATH, "r", encoding="utf-8") as file_handle:
+                csv_text = file_handle.read()
+        else:
+            csv_text = csv_data
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError) as error:
+        raise ValueError(f"catalog files could not be read: {error}") from error
+
+    if not isinstance(manual_data, dict):
+        raise ValueError("mutation data must be an object keyed by mutation name")
+    for mutation_name, mutation_data in manual_data.items():
+        if not isinstance(mutation_data, dict) or not isinstance(mutation_data.get("ingredients", {}), dict):
+            raise ValueError(f"mutation entry {mutation_name!r} is malformed")
+
+    catalog, target_crops = _build_mutation_catalog(manual_data, csv_text)
+    if not catalog:
+        raise ValueError("catalog would be empty")
+    return manual_data, catalog, target_crops, _catalog_version(manual_data, csv_text)
+
+
+def reload_mutation_catalog(*, force: bool = False) -> bool:
+    """Recompile the catalog if its files changed and swap it in. Returns True when a new version is live.
+
+    Invalid files are logged and skipped; the current catalog keeps serving until a valid edit lands.
+    """
+    global MANUAL_DATA, MUTATION_CATALOG, VALID_TARGET_CROPS, CATALOG_VERSION
+    if not _catalog_reload_lock.acquire(blocking=False):
+        return False
+    try:
+        stamp = _catalog_source_stamp()
+        if not force and stamp == _catalog_watch_state["stamp"]:
+            return False
+        _catalog_watch_state["stamp"] = stamp
+        try:
+            manual_data, catalog, target_crops, version = compile_mutation_catalog()
+        except ValueError as error:
+            logger.warning("Catalog reload skipped: %s", error)
+            return False
+        if version == CATALOG_VERSION:
+            return False
+        # Requests read these once at the start, so each sees either the old or the new catalog.
+        MANUAL_DATA, MUTATION_CATALOG, VALID_TARGET_CROPS, CATALOG_VERSION = manual_data, catalog, target_crops, version
+        logger.info("Mutation catalog reloaded as version %s (%d mutations).", version, len(catalog))
+        return True
+    finally:
+        _catalog_reload_lock.release()
+
+
+def maybe_reload_mutation_catalog(now: float | None = None) -> None:
+    """Cheap request-path check: at most one stat per interval, and compilation runs on a background thread."""
+    if CATALOG_RELOAD_INTERVAL_SECONDS <= 0:
+        return
+    now = time.time() if now is None else now
+    if now < _catalog_watch_state["next_check"]:
+        return
+    _catalog_watch_state["next_check"] = now + CATALOG_RELOAD_INTERVAL_SECONDS
+    if _catalog_source_stamp() != _catalog_watch_state["stamp"] and not _catalog_reload_lock.locked():
+        threading.Thread(target=_reload_and_warm_catalog, daemon=True).start()
+
+
+_catalog_watch_state["stamp"] = _catalog_source_stamp()
+if MUTATION_CSV_PATH is not None:
+    reload_mutation_catalog(force=True)
 
 
 def metric_spawn_chance_for_mutation(mutation_name: str) -> float:
-    if mutation_name == "Lonelily":
-        return LONELILY_METRIC_SPAWN_CHANCE
-    return DEFAULT_METRIC_SPAWN_CHANCE
+    return mechanics_for(mutation_name).spawn_chance
 
 
 def build_expected_cycle_profit_model(
@@ -441,23 +1003,1066 @@ def build_expected_cycle_profit_model(
     }
 
 
-def build_warning_messages(mutation_name: str, market_warning: bool) -> List[str]:
-    messages: List[str] = []
+@lru_cache(maxsize=256)
+def _finite_horizon_spot_expectations(spawn_chance: float, growth_stages: int, cycles: int) -> tuple[float, float]:
+    """Expected (spawned, matured) mutations for one replanted spot over `cycles` growth cycles.
+
+    Each cycle an empty spot spawns with probability p; a spawn matures g cycles later,
+    is harvested, and the spot is empty again for the next cycle. Only the last g spawn
+    masses are needed to know what matures, so this is O(cycles) with a ring buffer.
+    """
+    empty = 1.0
+    spawned_total = 0.0
+    matured_total = 0.0
+    growing: deque = deque([0.0] * growth_stages)
+    for _ in range(cycles):
+        spawned = empty * spawn_chance
+        empty -= spawned
+        spawned_total += spawned
+        if growth_stages:
+            growing.append(spawned)
+            matured = growing.popleft()
+        else:
+            matured = spawned
+        matured_total += matured
+        empty += matured
+    return spawned_total, matured_total
+
+
+def build_finite_horizon_model(
+    *,
+    revenue_per_harvest: float,
+    setup_cost: float,
+    spawn_chance: float,
+    growth_stages: int,
+    cycle_time_hours: float,
+    batch_size: int,
+    horizon_hours: float,
+) -> Dict[str, Any]:
+    """Expected spawns, harvests, revenue and profit for a play session of `horizon_hours`.
+
+    Setup is placed once for the session; every matured spot earns revenue_per_harvest / N.
+    """
+    if not (math.isfinite(cycle_time_hours) and cycle_time_hours > 0.0) or not (math.isfinite(spawn_chance) and spawn_chance > 0.0):
+        return {
+            "harvest_time_hours": horizon_hours,
+            "completed_cycles": 0,
+            "expected_spawned": None,
+            "expected_mutations": None,
+            "expected_revenue": None,
+            "expected_profit": None,
+            "expected_profit_per_hour": None,
+        }
+
+    completed_cycles = min(MAX_HORIZON_CYCLES, int(math.floor((horizon_hours / cycle_time_hours) + 1e-9)))
+    spawned_per_spot, matured_per_spot = _finite_horizon_spot_expectations(
+        min(1.0, float(spawn_chance)),
+        max(0, int(growth_stages)),
+        completed_cycles,
+    )
+    spots = float(max(0, batch_size))
+    # Each of the N spots matures matured_per_spot times and earns 1/N of a full batch's revenue.
+    expected_revenue = revenue_per_harvest * matured_per_spot if spots > 0 else 0.0
+    expected_profit = expected_revenue - setup_cost
+    return {
+        "harvest_time_hours": horizon_hours,
+        "completed_cycles": completed_cycles,
+        "expected_spawned": spots * spawned_per_spot,
+        "expected_mutations": spots * matured_per_spot,
+        "expected_revenue": expected_revenue,
+        "expected_profit": expected_profit,
+        "expected_profit_per_hour": expected_profit / horizon_hours if horizon_hours > 0 else None,
+    }
+
+
+def build_warning_messages(mutation: Dict[str, Any], market_warning: bool) -> List[str]:
+    """Market warning first, then the mutation's own warnings compiled into the catalog."""
+    own_warnings = mutation.get("warning_messages", ())
     if market_warning:
-        messages.append("Market spreads are wide right now. Double check your buy and sell strategy before placing large orders.")
-    if mutation_name == "Devourer":
-        messages.append("Devourer can spread into nearby crops and destroy them if you do not isolate it.")
-    if mutation_name == "Magic Jellybean":
-        messages.append("Magic Jellybean has 120 growth stages. It is best to harvest when its fully grown so you waste less time waiting for spawns.")
-    if mutation_name == "All-in Aloe":
-        messages.append("All-in Aloe is evaluated at Stage 14. Its raw multiplier there is 60x, but the calculator uses the reset-adjusted expected multiplier of 9.37x.")
-    return messages
+        return [MARKET_SPREAD_WARNING, *own_warnings]
+    return list(own_warnings)
+
+
+def build_columnar_leaderboard(
+    leaderboard_rows: List[Dict[str, Any]],
+    metadata: Dict[str, Any],
+    constants: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Transpose leaderboard rows into one array per metric.
+
+    Nested per-row lists (ingredients, yields) become positional tuples described by a
+    shared "fields" header, and request-wide multipliers are emitted once in "constants".
+    """
+    columns: Dict[str, List[Any]] = {field: [] for field in COLUMNAR_ROW_FIELDS}
+    block_columns: Dict[str, Dict[str, List[Any]]] = {
+        block: {field: [] for field in fields}
+        for block, fields in COLUMNAR_BLOCK_FIELDS.items()
+    }
+    breakdown_columns: Dict[str, List[Any]] = {field: [] for field in COLUMNAR_BREAKDOWN_FIELDS}
+    warning_messages: List[List[str]] = []
+    hourly_warnings: List[List[str]] = []
+    smart_progress: List[Dict[str, float]] = []
+    ingredient_rows: List[List[List[Any]]] = []
+    yield_rows: List[List[List[Any]]] = []
+
+    for row in leaderboard_rows:
+        for field in COLUMNAR_ROW_FIELDS:
+            columns[field].append(row.get(field))
+        for block, fields in COLUMNAR_BLOCK_FIELDS.items():
+            values = row.get(block) or {}
+            for field in fields:
+                block_columns[block][field].append(values.get(field))
+        breakdown = row.get("breakdown", {})
+        for field in COLUMNAR_BREAKDOWN_FIELDS:
+            breakdown_columns[field].append(breakdown.get(field))
+        warning_messages.append(row.get("warning_messages", []))
+        hourly_warnings.append(row.get("hourly", {}).get("warnings", []))
+        smart_progress.append(row.get("smart_progress", {}))
+        ingredient_rows.append([
+            [ingredient.get(field) for field in COLUMNAR_INGREDIENT_FIELDS]
+            for ingredient in breakdown.get("ingredients", [])
+        ])
+        yield_rows.append([
+            [
+                yld["name"],
+                "mutation" if yld["name"] == row.get("mutationName") else "crop",
+                yld["amount"],
+                yld["unit_price"],
+                yld["total_value"],
+                yld["math"]["base"],
+                yld["math"]["limit"],
+                yld["math"]["fortune"],
+                yld["math"].get("overdrive_bonus", 0.0),
+                yld["math"]["special"],
+            ]
+            for yld in breakdown.get("yields", [])
+        ])
+
+    breakdown_columns["ingredients"] = {"fields": list(COLUMNAR_INGREDIENT_FIELDS), "rows": ingredient_rows}
+    breakdown_columns["yields"] = {"fields": list(COLUMNAR_YIELD_FIELDS), "rows": yield_rows}
+    block_columns["hourly"]["warnings"] = hourly_warnings
+    columns["warning_messages"] = warning_messages
+    columns["smart_progress"] = smart_progress
+
+    return {
+        "format": "columns",
+        "length": len(leaderboard_rows),
+        "columns": columns,
+        **block_columns,
+        "breakdown": breakdown_columns,
+        "constants": constants,
+        "metadata": metadata,
+    }
+
+
+def _finite_or_none(value: Any) -> float | None:
+    if isinstance(value, (int, float)) and math.isfinite(float(value)):
+        return float(value)
+    return None
+
+
+def _finite_or_zero(value: Any) -> float:
+    finite = _finite_or_none(value)
+    return finite if finite is not None else 0.0
+
+
+def compute_leaderboard_row(
+    mutation: Dict[str, Any],
+    context: Dict[str, Any],
+    bazaar_data: Dict[str, Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Build one leaderboard row from the request-derived `context` and a Bazaar snapshot.
+
+    A row only reads the prices of the items build_price_dependency_index lists for its
+    mutation, which is what lets cached rows be refreshed selectively.
+    """
+    plots = context["plots"]
+    setup_mode = context["setup_mode"]
+    sell_mode = context["sell_mode"]
+    mode = context["mode"]
+    is_ironman = context["is_ironman"]
+    normalized_target_crop = context["target_crop"]
+    missing_crops = context["missing_crops"]
+    harvest_mode = context["harvest_mode"]
+    custom_time_hours = context["custom_time_hours"]
+    mutation_chance = context["mutation_chance"]
+    per_harvest_cost = context["per_harvest_cost"]
+    cycle_time_hours = context["cycle_time_hours"]
+    effective_fortune = context["effective_fortune"]
+    normalized_overdrive_crop = context["overdrive_crop"]
+    overdrive_bonus = context["overdrive_bonus"]
+    base_yield_mult = context["base_yield_mult"]
+    evergreen_buff = context["evergreen_buff"]
+    gh_buff = context["gh_buff"]
+    unique_buff = context["unique_buff"]
+    harvest_boost_multiplier = context["harvest_boost_multiplier"]
+
+    def get_item_price(item: str, is_buying: bool, mode_str: str):
+        if item in NPC_PRICES:
+            return NPC_PRICES[item]
+        market = bazaar_data.get(item, {"buyPrice": 0, "sellPrice": 0})
+        if is_buying:
+            if mode_str == "insta_buy":
+                return market.get('buyPrice', market.get('sellPrice', 0))
+            else: # buy_order
+                return market.get('sellPrice', market.get('buyPrice', 0))
+        else:
+            if mode_str == "insta_sell":
+                return market.get('sellPrice', market.get('buyPrice', 0))
+            else: # sell_offer
+                return market.get('buyPrice', market.get('sellPrice', 0))
+
+    depth_curves = get_depth_curves(bazaar_data)
+
+    def get_price_at_size(item: str, quantity: float, is_buying: bool, mode_str: str) -> tuple[float, float, float]:
+        """Return (average unit price, top-of-book unit price, unfilled quantity) for an instant order at size."""
+        top_price = get_item_price(item, is_buying, mode_str)
+        curve = depth_curves.get(item, {}).get(mode_str) if item not in NPC_PRICES else None
+        if curve is None or quantity <= 0:
+            return top_price, top_price, 0.0
+        total_cost, unfilled = cost_at_size(curve, quantity)
+        return total_cost / quantity, top_price, unfilled
+
+    def get_fill_hours(item: str, quantity: float, is_buying: bool, mode_str: str) -> float | None:
+        if item in NPC_PRICES:
+            return 0.0
+        return estimate_fill_hours(bazaar_data.get(item, {}), quantity, is_buying=is_buying, mode_str=mode_str)
+
+    mut_name = mutation["name"]
+    base_limit = mutation["base_limit"]
+    limit = base_limit * plots
+
+    def price_setup(mode_str: str) -> tuple[float, List[Dict[str, Any]], float, List[str]]:
+        """Setup cost, ingredient rows, fill hours and unfillable items for one setup mode.
+
+        Fill hours are infinite when any ingredient has no flow to fill against.
+        """
+        cost = 0.0
+        rows: List[Dict[str, Any]] = []
+        fill_hours_total = 0.0
+        unfillable: List[str] = []
+        for ing, qty_per_plot in mutation["ingredients"]:
+            total_qty = qty_per_plot * plots
+            cost_per_ing, top_of_book_price, unfilled_qty = get_price_at_size(ing, total_qty, True, mode_str)
+            total_cost = total_qty * cost_per_ing
+            cost += total_cost
+            fill_hours = get_fill_hours(ing, total_qty, True, mode_str)
+            if fill_hours is None:
+                unfillable.append(ing)
+            else:
+                # Ingredient orders are placed together, so the slowest one gates the setup.
+                fill_hours_total = max(fill_hours_total, fill_hours)
+            rows.append({
+                "name": ing,
+                "amount": total_qty,
+                "unit_price": cost_per_ing,
+                "total_cost": total_cost,
+                "fill_hours": fill_hours,
+                "top_of_book_price": top_of_book_price,
+                "slippage_cost": total_cost - (total_qty * top_of_book_price),
+                "depth_exhausted": unfilled_qty > 0,
+            })
+        return cost, rows, (math.inf if unfillable else fill_hours_total), unfillable
+
+    # 1. Setup Cost
+    opt_cost, ingredient_costs, setup_fill_hours, illiquid_items = price_setup(setup_mode)
+    ing_warning = False
+    for ing, _qty_per_plot in mutation["ingredients"]:
+        ing_market = bazaar_data.get(ing, {"buyPrice": 0, "sellPrice": 0})
+        if has_wide_spread(ing_market.get("buyPrice", 0), ing_market.get("sellPrice", 0)):
+            ing_warning = True
+
+    market_data = bazaar_data.get(mut_name, {"buyPrice": 0, "sellPrice": 0})
+    mut_warning = has_wide_spread(market_data.get("buyPrice", 0), market_data.get("sellPrice", 0))
+
+    # 2. Return per Batch (One Harvest)
+    growth_stages = mutation["growth_stages"]
+    effective_special_mult = mutation["effective_special_multiplier"]
+    # Breakdown and profit-per-harvest values represent a full mature batch.
+    # Spawn probability is only applied in expected-cycle timing metrics.
+    effective_limit = float(limit)
+
+    spread_risk = None
+    spread_layouts = spread_risk_by_layout(mutation)
+    if spread_layouts is not None:
+        # The spread chance is not measured yet, so losses are reported but only priced in on request.
+        # Spots whose ingredients get eaten never spawn, and eaten crops are bought again next batch.
+        layout_risks = [
+            {
+                "layout": name,
+                "planned_spots": measured["planned_spots"] * plots,
+                "survival_rate": measured["survival_rate"],
+                "surviving_spots": measured["surviving_spots"] * plots,
+                "replant_cost": sum(
+                    destroyed * plots * get_item_price(crop, True, setup_mode)
+                    for crop, destroyed in measured["destroyed"].items()
+                ),
+            }
+            for name, measured in spread_layouts.items()
+        ]
+        measured_spread = spread_layouts["searched"]
+        spread_risk = {
+            "applied": context["apply_spread_risk"],
+            "survival_rate": measured_spread["survival_rate"],
+            "surviving_spots": measured_spread["surviving_spots"] * plots,
+            "destroyed_crops": {crop: destroyed * plots for crop, destroyed in measured_spread["destroyed"].items()},
+            "replant_cost": layout_risks[0]["replant_cost"],
+            "trials": measured_spread["trials"],
+            "layouts": layout_risks,
+        }
+        if spread_risk["applied"]:
+            effective_limit *= measured_spread["survival_rate"]
+            opt_cost += spread_risk["replant_cost"]
+
+    # Insta-selling the harvest walks down the buy orders, same as insta-buying the setup walks up;
+    # only the surviving spots are sold, so that's the size it is priced at.
+    mut_sell_price_value = 0.0 if is_ironman else get_price_at_size(mut_name, effective_limit, False, sell_mode)[0]
+
+    metric_spawn_chance = mutation.get("metric_spawn_chance", DEFAULT_METRIC_SPAWN_CHANCE)
+
+    crop_drops = []
+    for crop_drop in mutation["crop_drops"]:
+        crop_overdrive_bonus = overdrive_bonus if normalized_overdrive_crop and crop_drop["canonical_name"] == normalized_overdrive_crop else 0.0
+        crop_fortune_mult = (((effective_fortune + crop_overdrive_bonus) / 100) + 1)
+        full_drops = crop_drop["base_drop"] * effective_limit * base_yield_mult * crop_fortune_mult
+        crop_price = crop_drop["price_override"] or get_item_price(crop_drop["source_name"], False, sell_mode)
+        crop_drops.append((crop_drop, crop_overdrive_bonus, crop_fortune_mult, full_drops, crop_price))
+
+    harvest_stage = None
+    if context["optimize_harvest_stage"] and mutation.get("harvest_stage_tunable"):
+        # Ramping multipliers only scale crop drops; the mutation sale and setup are fixed per batch.
+        harvest_stage = plan_harvest_stage(
+            stage_multipliers=mutation["stage_multipliers"],
+            reset_chance=mutation["reset_chance"],
+            spawn_chance=metric_spawn_chance,
+            crop_value=sum(full_drops * crop_price for *_, full_drops, crop_price in crop_drops),
+            fixed_value=(effective_limit * mut_sell_price_value) - opt_cost,
+        )
+        if harvest_stage is not None:
+            harvest_stage["curve_placeholder"] = mutation["stage_curve_placeholder"]
+            harvest_stage["default_stage"] = growth_stages
+            harvest_stage["default_multiplier"] = effective_special_mult
+            growth_stages = harvest_stage["expected_stage"]
+            effective_special_mult = harvest_stage["expected_multiplier"]
+
+    # Lifecycle display is post-spawn only. Expected spawn wait is handled in expected-cycle metrics.
+    estimated_time = growth_stages * cycle_time_hours
+
+    expected_drops_value = 0.0
+    revenue_by_item: Dict[str, float] = {}
+    yields: List[Dict[str, Any]] = []
+    yield_by_name: Dict[str, Dict[str, Any]] = {}
+
+    for crop_drop, crop_overdrive_bonus, crop_fortune_mult, full_drops, crop_price in crop_drops:
+        expected_drops = full_drops * effective_special_mult
+        total_value = expected_drops * crop_price
+        expected_drops_value += total_value
+        if not crop_drop["price_override"]:
+            revenue_by_item[crop_drop["source_name"]] = revenue_by_item.get(crop_drop["source_name"], 0.0) + total_value
+
+        existing = yield_by_name.get(crop_drop["display_name"])
+        if existing:
+            existing["amount"] += expected_drops
+            existing["total_value"] += total_value
+            if existing.get("math"):
+                existing["math"]["base"] += crop_drop["base_drop"]
+        else:
+            yield_item = {
+                "name": crop_drop["display_name"],
+                "amount": expected_drops,
+                "unit_price": crop_price,
+                "total_value": total_value,
+                "math": {
+                    "base": crop_drop["base_drop"],
+                    "limit": effective_limit,
+                    "evergreen_buff": evergreen_buff,
+                    "gh_buff": gh_buff,
+                    "unique_buff": unique_buff,
+                    "harvest_boost": harvest_boost_multiplier,
+                    "wart_buff": harvest_boost_multiplier,
+                    "fortune": crop_fortune_mult,
+                    "overdrive_bonus": crop_overdrive_bonus,
+                    "special": effective_special_mult,
+                },
+            }
+            yields.append(yield_item)
+            yield_by_name[crop_drop["display_name"]] = yield_item
+
+    expected_mut_drops = effective_limit
+    expected_mut_val = expected_mut_drops * mut_sell_price_value
+    total_cycle_revenue = expected_drops_value + expected_mut_val
+    revenue_by_item[mut_name] = revenue_by_item.get(mut_name, 0.0) + expected_mut_val
+
+    if spread_risk is not None:
+        # Revenue is linear in the surviving spots, so the eaten spots' share scales from it.
+        revenue_per_spot = (total_cycle_revenue / effective_limit) if effective_limit > 0 else None
+        for entry in (spread_risk, *spread_risk["layouts"]):
+            planned_spots = entry.get("planned_spots", limit)
+            lost_revenue = revenue_per_spot * planned_spots * (1.0 - entry["survival_rate"]) if revenue_per_spot is not None else None
+            entry["lost_revenue"] = lost_revenue
+            entry["profit_loss"] = (lost_revenue + entry["replant_cost"]) if lost_revenue is not None else None
+
+    if expected_mut_drops > 0:
+        yields.append({
+            "name": mut_name,
+            "amount": expected_mut_drops,
+            "unit_price": mut_sell_price_value,
+            "total_value": expected_mut_val,
+            "math": {
+                "base": 1.0,
+                "limit": effective_limit,
+                "evergreen_buff": 0.0,
+                "gh_buff": 0.0,
+                "unique_buff": 0.0,
+                "harvest_boost": 1.0,
+                "wart_buff": 1.0,
+                "fortune": 1.0,
+                "special": 1.0,
+            },
+        })
+
+    crop_yields_by_name = {yld["name"]: yld["amount"] for yld in yields if yld["name"] in DEFAULT_REQS}
+    smart_progress = {}
+    for req_crop in missing_crops:
+        req_amt = DEFAULT_REQS.get(req_crop, 0)
+        if req_amt <= 0:
+            continue
+        progress_pct = (crop_yields_by_name.get(req_crop, 0) / req_amt) * 100.0
+        if progress_pct > 0:
+            smart_progress[req_crop] = progress_pct
+
+    # 3. Profit metrics
+    profit_batch = total_cycle_revenue - opt_cost
+
+    profit_models = build_expected_cycle_profit_model(
+        profit_per_harvest=profit_batch,
+        spawn_chance=metric_spawn_chance,
+        growth_stages=growth_stages,
+        cycle_time_hours=cycle_time_hours,
+        batch_size=limit,
+    )
+    profit_per_growth_cycle = _finite_or_none(profit_models.get("profit_per_cycle"))
+    profit_per_hour = _finite_or_zero(profit_models.get("profit_per_hour"))
+    hourly_profit_selected = _finite_or_none(profit_models.get("profit_per_hour"))
+    warning_messages = build_warning_messages(mutation, mut_warning)
+    if harvest_stage is not None and harvest_stage["curve_placeholder"]:
+        warning_messages.append(PLACEHOLDER_STAGE_CURVE_WARNING.format(name=mut_name))
+
+    payback_hours_ready = (opt_cost / hourly_profit_selected) if (hourly_profit_selected is not None and hourly_profit_selected > 0) else None
+    finite_horizon = None
+    if harvest_mode == "custom_time":
+        finite_horizon = build_finite_horizon_model(
+            revenue_per_harvest=total_cycle_revenue,
+            setup_cost=opt_cost,
+            spawn_chance=metric_spawn_chance,
+            growth_stages=round(growth_stages),
+            cycle_time_hours=cycle_time_hours,
+            batch_size=limit,
+            horizon_hours=float(custom_time_hours),
+        )
+
+    # Liquidity: buying the next setup and selling the previous harvest overlap with farming,
+    # so steady-state throughput is gated by the slowest of the three stages. A market with no
+    # flow never fills, so its stage is unbounded and the row has no liquidity-adjusted rate.
+    if is_ironman:
+        sell_fill_hours = 0.0
+    else:
+        sell_fill_hours = get_fill_hours(mut_name, expected_mut_drops, False, sell_mode)
+        if sell_fill_hours is None:
+            illiquid_items.append(mut_name)
+            sell_fill_hours = math.inf
+    farming_hours = _finite_or_none(profit_models.get("expected_hours"))
+
+    stage_hours = {
+        "spawn_growth": farming_hours or 0.0,
+        "setup": setup_fill_hours,
+        "sell": sell_fill_hours,
+    }
+    bottleneck = max(stage_hours, key=stage_hours.get)
+    bottleneck_hours = stage_hours[bottleneck]
+    liquidity_adjusted_profit_per_hour = (profit_batch / bottleneck_hours) if 0 < bottleneck_hours < math.inf else None
+
+    # Continuous replanting: every spot respawns independently after each harvest, so the
+    # setup is paid once and each harvested spot earns its share of the batch revenue.
+    renewal_rates = compute_profit_rates({
+        "m": plots,
+        "x": base_limit,
+        "p": mutation["mutation_chance_override"] if mutation["mutation_chance_override"] is not None else mutation_chance,
+        "tau": cycle_time_hours,
+        "g": round(growth_stages),
+        "v": (total_cycle_revenue / limit) if limit > 0 else 0.0,
+        "per_harvest_cost": per_harvest_cost,
+    })
+    renewal_profit_per_hour = _finite_or_zero(renewal_rates["profit_per_hour"])
+    renewal = {
+        "p": renewal_rates["p"],
+        "N": renewal_rates["N"],
+        "v_net": renewal_rates["v_net"],
+        "cycles_per_harvest_per_spot": renewal_rates["cycles_per_harvest_per_spot"],
+        "hours_per_harvest_per_spot": renewal_rates["hours_per_harvest_per_spot"],
+        "harvests_per_cycle": renewal_rates["harvests_per_cycle"],
+        "harvests_per_hour": renewal_rates["harvests_per_hour"],
+        "profit_per_cycle": renewal_rates["profit_per_cycle"],
+        "profit_per_hour": renewal_profit_per_hour,
+        "payback_hours": (opt_cost / renewal_profit_per_hour) if renewal_profit_per_hour > 0 else None,
+        "warnings": renewal_rates["warnings"],
+    }
+
+    mode_matrix = None
+    if context["mode_matrix"]:
+        # Yields, timing and fortune are shared; only the prices and fill times differ per mode.
+        setups: Dict[str, tuple[float, float]] = {}
+        for mode_str in MATRIX_SETUP_MODES:
+            if mode_str == setup_mode:
+                setups[mode_str] = (opt_cost, setup_fill_hours)
+                continue
+            cost, _rows, fill_hours, _unfillable = price_setup(mode_str)
+            if spread_risk is not None and spread_risk["applied"]:
+                cost += sum(destroyed * get_item_price(crop, True, mode_str) for crop, destroyed in spread_risk["destroyed_crops"].items())
+            setups[mode_str] = (cost, fill_hours)
+        sales: Dict[str, tuple[float, float]] = {}
+        for mode_str in MATRIX_SELL_MODES:
+            if mode_str == sell_mode:
+                sales[mode_str] = (total_cycle_revenue, sell_fill_hours)
+                continue
+            revenue = sum(
+                full_drops * effective_special_mult * (crop_drop["price_override"] or get_item_price(crop_drop["source_name"], False, mode_str))
+                for crop_drop, _bonus, _fortune, full_drops, _price in crop_drops
+            )
+            if not is_ironman:
+                revenue += expected_mut_drops * get_price_at_size(mut_name, expected_mut_drops, False, mode_str)[0]
+            fill_hours = 0.0 if is_ironman else get_fill_hours(mut_name, expected_mut_drops, False, mode_str)
+            sales[mode_str] = (revenue, math.inf if fill_hours is None else fill_hours)
+
+        metrics: Dict[str, List[List[float | None]]] = {"profit": [], "profit_per_hour": [], "liquidity_adjusted_profit_per_hour": []}
+        for setup_str in MATRIX_SETUP_MODES:
+            for values in metrics.values():
+                values.append([])
+            cost, setup_hours = setups[setup_str]
+            for sell_str in MATRIX_SELL_MODES:
+                revenue, sell_hours = sales[sell_str]
+                combo_profit = revenue - cost
+                combo_bottleneck = max(farming_hours or 0.0, setup_hours, sell_hours)
+                metrics["profit"][-1].append(combo_profit)
+                metrics["profit_per_hour"][-1].append((combo_profit / farming_hours) if farming_hours else None)
+                metrics["liquidity_adjusted_profit_per_hour"][-1].append((combo_profit / combo_bottleneck) if 0 < combo_bottleneck < math.inf else None)
+        best_metric = {"profit": "profit", "liquidity": "liquidity_adjusted_profit_per_hour"}.get(mode, "profit_per_hour")
+        candidates = [
+            (value, setup_str, sell_str)
+            for setup_str, values in zip(MATRIX_SETUP_MODES, metrics[best_metric])
+            for sell_str, value in zip(MATRIX_SELL_MODES, values)
+            if value is not None
+        ]
+        best_value, best_setup, best_sell = max(candidates) if candidates else (None, None, None)
+        mode_matrix = {
+            "setup_modes": list(MATRIX_SETUP_MODES),
+            "sell_modes": list(MATRIX_SELL_MODES),
+            **metrics,
+            "best": {"setup_mode": best_setup, "sell_mode": best_sell, "metric": best_metric, "value": best_value},
+        }
+
+    # 4. Scoring Logic
+    # Every price-driven score is linear in batch revenue and setup cost; track both slopes so
+    # price_exposure can say how the score moves with each item's price.
+    score = 0
+    score_per_revenue = 0.0
+    score_per_cost = 0.0
+    session_revenue_share = (
+        _finite_or_zero(finite_horizon["expected_revenue"]) / total_cycle_revenue
+        if finite_horizon is not None and total_cycle_revenue
+        else 0.0
+    )
+    if mode == "profit":
+        score = profit_batch if finite_horizon is None else _finite_or_zero(finite_horizon["expected_profit"])
+        score_per_revenue = 1.0 if finite_horizon is None else session_revenue_share
+        score_per_cost = -1.0
+    elif mode == "target" and normalized_target_crop:
+        score = next((item["amount"] for item in yields if item["name"] == normalized_target_crop), 0.0)
+    elif mode == "smart":
+        score = sum(smart_progress.values())
+    elif mode == "hourly":
+        if finite_horizon is not None:
+            score = _finite_or_zero(finite_horizon["expected_profit_per_hour"])
+            if custom_time_hours > 0:
+                score_per_revenue = session_revenue_share / custom_time_hours
+                score_per_cost = -1.0 / custom_time_hours
+        else:
+            score = hourly_profit_selected if hourly_profit_selected is not None else float("-inf")
+            if hourly_profit_selected is not None:
+                score_per_revenue = 1.0 / farming_hours
+                score_per_cost = -1.0 / farming_hours
+    elif mode == "liquidity":
+        score = liquidity_adjusted_profit_per_hour if liquidity_adjusted_profit_per_hour is not None else float("-inf")
+        if liquidity_adjusted_profit_per_hour is not None:
+            score_per_revenue = 1.0 / bottleneck_hours
+            score_per_cost = -1.0 / bottleneck_hours
+    elif mode == "renewal":
+        score = renewal_profit_per_hour
+        # Setup is paid once; each harvested spot earns revenue / limit.
+        if limit > 0 and renewal_rates["harvests_per_hour"]:
+            score_per_revenue = _finite_or_zero(renewal_rates["harvests_per_hour"]) / limit
+
+    price_exposure: Dict[str, float] = {}
+    for item, value in revenue_by_item.items():
+        if value and item not in NPC_PRICES:
+            price_exposure[item] = price_exposure.get(item, 0.0) + score_per_revenue * value
+    setup_costs_by_item = [(ingredient["name"], ingredient["total_cost"]) for ingredient in ingredient_costs]
+    if spread_risk is not None and spread_risk["applied"]:
+        setup_costs_by_item.extend(
+            (crop, destroyed * get_item_price(crop, True, setup_mode))
+            for crop, destroyed in spread_risk["destroyed_crops"].items()
+        )
+    for item, value in setup_costs_by_item:
+        if value and item not in NPC_PRICES:
+            price_exposure[item] = price_exposure.get(item, 0.0) + score_per_cost * value
+
+    breakdown = {
+        "base_limit": base_limit,
+        "ingredients": ingredient_costs,
+        "yields": yields,
+        "total_setup_cost": opt_cost,
+        "total_revenue": total_cycle_revenue,
+        "growth_stages": growth_stages,
+        "estimated_time_hours": estimated_time,
+    }
+
+    return {
+        "mutationName": mut_name,
+        "score": score,
+        "profit": profit_batch,
+        "profit_per_growth_cycle": profit_per_growth_cycle,
+        "profit_per_hour": profit_per_hour,
+        "opt_cost": opt_cost,
+        "revenue": total_cycle_revenue,
+        "warning": len(warning_messages) > 0,
+        "warning_messages": warning_messages,
+        "mut_price": mut_sell_price_value,
+        "limit": limit,
+        "smart_progress": smart_progress,
+        # Score change if each item's price doubled; 0 slopes leave it empty for non-price modes.
+        "price_exposure": {item: weight for item, weight in price_exposure.items() if weight},
+        "hourly": {
+            "mutation_chance": metric_spawn_chance,
+            "profit_per_hour_selected": hourly_profit_selected,
+            "tau_hours": profit_models.get("tau_hours"),
+            "p": profit_models.get("p"),
+            "g": profit_models.get("g"),
+            "N": profit_models.get("N"),
+            "expected_spawn_cycles": profit_models.get("expected_spawn_cycles"),
+            "expected_cycles": profit_models.get("expected_cycles"),
+            "expected_hours": profit_models.get("expected_hours"),
+            "cycles_per_harvest_per_spot": profit_models.get("cycles_per_harvest_per_spot"),
+            "hours_per_harvest_per_spot": profit_models.get("hours_per_harvest_per_spot"),
+            "harvests_per_cycle": profit_models.get("harvests_per_cycle"),
+            "harvests_per_hour": profit_models.get("harvests_per_hour"),
+            "profit_per_hour": profit_models.get("profit_per_hour"),
+            "warnings": profit_models.get("warnings", []),
+            "payback_hours_ready": payback_hours_ready,
+            # Finite-horizon fields; populated when harvest_mode is "custom_time".
+            "harvest_mode": harvest_mode,
+            "custom_time_hours": custom_time_hours if harvest_mode == "custom_time" else None,
+            "harvest_time_hours": None,
+            "completed_cycles": None,
+            "expected_spawned": None,
+            "expected_mutations": None,
+            "expected_revenue": None,
+            "expected_profit": None,
+            "expected_profit_per_hour": hourly_profit_selected,
+            **(finite_horizon or {}),
+        },
+        "liquidity_adjusted_profit_per_hour": liquidity_adjusted_profit_per_hour,
+        "liquidity": {
+            # None where a stage never fills; the bottleneck still names it.
+            "setup_fill_hours": _finite_or_none(setup_fill_hours),
+            "sell_fill_hours": _finite_or_none(sell_fill_hours),
+            "bottleneck_hours": _finite_or_none(bottleneck_hours),
+            "bottleneck": bottleneck,
+            "liquidity_adjusted_profit_per_hour": liquidity_adjusted_profit_per_hour,
+            "illiquid_items": illiquid_items,
+        },
+        "renewal": renewal,
+        "harvest_stage": harvest_stage,
+        "spread_risk": spread_risk,
+        "mode_matrix": mode_matrix,
+        # Filled in per request from the snapshot's rolling price stats (see apply_price_risk).
+        "price_risk": {
+            "horizon_hours": farming_hours,
+            "revenue_by_item": {item: value for item, value in revenue_by_item.items() if value and item not in NPC_PRICES},
+        },
+        "profit_models": profit_models,
+        "breakdown": breakdown,
+    }
+
+
+LEADERBOARD_ROW_CACHE_SIZE = 64
+_price_index_cache: Dict[str, Any] = {"catalog": None, "index": {}}
+_snapshot_diff_cache: Dict[str, Any] = {"old": None, "new": None, "changed": frozenset()}
+# Ranked rows per request context, kept current across snapshots by recomputing only affected rows.
+_leaderboard_row_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_leaderboard_row_cache_lock = threading.Lock()
+_optimized_catalog_cache: Dict[str, Any] = {"catalog": None, "optimized": ()}
+_optimized_catalog_lock = threading.Lock()
+
+
+def build_price_dependency_index(catalog: tuple[Dict[str, Any], ...]) -> Dict[str, frozenset[str]]:
+    """Map each priced item (ingredient, crop drop, mutation) to the mutations whose rows read it."""
+    if _price_index_cache["catalog"] is catalog:
+        return _price_index_cache["index"]
+
+    dependents: Dict[str, set[str]] = {}
+    for mutation in catalog:
+        items = {mutation["name"]}
+        items.update(ingredient for ingredient, _qty in mutation["ingredients"])
+        items.update(
+            crop_drop["source_name"]
+            for crop_drop in mutation["crop_drops"]
+            if not crop_drop["price_override"]
+        )
+        for item in items:
+            dependents.setdefault(item, set()).add(mutation["name"])
+
+    index = {item: frozenset(names) for item, names in dependents.items()}
+    _price_index_cache.update(catalog=catalog, index=index)
+    return index
+
+
+def _without_price_stats(market: Any) -> Any:
+    if isinstance(market, dict) and "priceStats" in market:
+        return {key: value for key, value in market.items() if key != "priceStats"}
+    return market
+
+
+def changed_bazaar_items(old_data: Dict[str, Any], new_data: Dict[str, Any]) -> frozenset[str]:
+    """Items whose Bazaar entry differs between two snapshots, including added and removed ones."""
+    cached = _snapshot_diff_cache
+    if cached["old"] is old_data and cached["new"] is new_data:
+        return cached["changed"]
+    changed = frozenset(
+        item
+        for item in old_data.keys() | new_data.keys()
+        if _without_price_stats(old_data.get(item)) != _without_price_stats(new_data.get(item))
+    )
+    _snapshot_diff_cache.update(old=old_data, new=new_data, changed=changed)
+    return changed
+
+
+def apply_price_risk(row: Dict[str, Any], bazaar_data: Dict[str, Any], risk_aversion: float) -> None:
+    """Fill a row's price-risk block from the snapshot's rolling stats and set its risk-adjusted profit / hour.
+
+    Sell prices can drift while the batch spawns and grows: each revenue item's hourly log-price
+    volatility scales by sqrt(hours) over the expected cycle, with items treated as independent.
+    Kept out of the cached rows because the stats move every snapshot even when prices do not.
+    """
+    block = row.get("price_risk") or {}
+    horizon_hours = block.get("horizon_hours")
+    samples = None
+    revenue_variance: float | None = 0.0
+    for item, value in (block.get("revenue_by_item") or {}).items():
+        stats = (bazaar_data.get(item) or {}).get("priceStats")
+        if stats is None:
+            continue
+        samples = stats["samples"] if samples is None else min(samples, stats["samples"])
+        if stats["hourly_volatility"] is None or not horizon_hours:
+            revenue_variance = None
+            break
+        revenue_variance += (value * stats["hourly_volatility"]) ** 2 * horizon_hours
+    revenue_sigma = math.sqrt(revenue_variance) if samples is not None and revenue_variance is not None else None
+    profit_per_hour_sigma = (revenue_sigma / horizon_hours) if revenue_sigma is not None else None
+    row["price_risk"] = {
+        **block,
+        "samples": samples or 0,
+        "revenue_sigma": revenue_sigma,
+        "profit_per_hour_sigma": profit_per_hour_sigma,
+        "mutation_drawdown": ((bazaar_data.get(row["mutationName"]) or {}).get("priceStats") or {}).get("drawdown"),
+    }
+    row["risk_adjusted_profit_per_hour"] = (
+        row["profit_per_hour"] - (risk_aversion * profit_per_hour_sigma) if profit_per_hour_sigma is not None else None
+    )
+
+
+def plan_order_timing(row: Dict[str, Any], setup_mode: str, sell_mode: str) -> Dict[str, Any] | None:
+    """Best hour of week to place the setup orders and to list the harvest, from the seasonality index.
+
+    None until every Bazaar item the row buys or sells has at least one full hour on record.
+    """
+    setup_field = "sellPrice" if setup_mode == "buy_order" else "buyPrice"
+    sell_field = "buyPrice" if sell_mode == "sell_offer" else "sellPrice"
+    setup_values = {
+        ingredient["name"]: ingredient["total_cost"]
+        for ingredient in row["breakdown"]["ingredients"]
+        if ingredient["total_cost"] and ingredient["name"] not in NPC_PRICES
+    }
+    revenue_values = row["price_risk"]["revenue_by_item"]
+    untimed = {"hour_of_week": None, "label": None, "change": 0.0}
+    buy_window = _seasonality_index.best_window(setup_values, setup_field, buying=True) if setup_values else untimed
+    sell_window = _seasonality_index.best_window(revenue_values, sell_field, buying=False) if revenue_values else untimed
+    if buy_window is None or sell_window is None:
+        return None
+    projected_profit = row["profit"] + sell_window["change"] - buy_window["change"]
+    expected_hours = row["hourly"]["expected_hours"]
+    return {
+        "buy_hour_of_week": buy_window["hour_of_week"],
+        "buy_window": buy_window["label"],
+        "setup_cost_change": buy_window["change"],
+        "sell_hour_of_week": sell_window["hour_of_week"],
+        "sell_window": sell_window["label"],
+        "revenue_change": sell_window["change"],
+        "projected_profit": projected_profit,
+        "projected_profit_per_hour": (projected_profit / expected_hours) if expected_hours else None,
+    }
+
+
+def player_upgrade_steps(metadata: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Next step of each upgrade as its change to the yield model inputs; maxed or inert steps are left out."""
+    yields = metadata["yield_breakdown"]
+    fortunes = metadata["fortune_breakdown"]
+    speeds = metadata["speed_breakdown"]
+    steps: Dict[str, Dict[str, Any]] = {"fortune": {"fortune": FORTUNE_STEP}}
+    if yields["greenhouse_yield_upgrade"] < GREENHOUSE_MAX_UPGRADE:
+        steps["greenhouse_yield"] = {"additive_base": GREENHOUSE_YIELD_BONUS / GREENHOUSE_MAX_UPGRADE}
+    if speeds["greenhouse_speed_upgrade"] < GREENHOUSE_MAX_UPGRADE:
+        steps["greenhouse_speed"] = {"cycle_time_hours": -BASE_CYCLE_HOURS * GREENHOUSE_SPEED_REDUCTION / GREENHOUSE_MAX_UPGRADE}
+    if yields["unique_crops"] < UNIQUE_CROPS_MAX:
+        steps["unique_crop"] = {
+            "additive_base": UNIQUE_YIELD_BONUS / UNIQUE_CROPS_MAX,
+            "cycle_time_hours": -BASE_CYCLE_HOURS * UNIQUE_SPEED_REDUCTION / UNIQUE_CROPS_MAX,
+        }
+    if yields["evergreen_chip_level"] < CHIP_LEVEL_CAP_BY_RARITY[yields["evergreen_chip_rarity"]]:
+        steps["evergreen_chip"] = {"additive_base": EVERGREEN_BONUS_PER_LEVEL[yields["evergreen_chip_rarity"]]}
+    if yields["overdrive_chip_level"] < CHIP_LEVEL_CAP_BY_RARITY[yields["overdrive_chip_rarity"]]:
+        steps["overdrive_chip"] = {"overdrive_bonus": OVERDRIVE_BONUS_PER_LEVEL[yields["overdrive_chip_rarity"]]}
+    # Hypercharge only amplifies InfiniVacuum's fortune.
+    if fortunes["infini_vacuum"] and fortunes["hypercharge_level"] < CHIP_LEVEL_CAP_BY_RARITY[fortunes["hypercharge_rarity"]]:
+        steps["hypercharge_chip"] = {"fortune": INFINI_VACUUM_FORTUNE * HYPERCHARGE_BONUS_PER_LEVEL[fortunes["hypercharge_rarity"]]}
+    return steps
+
+
+def _row_rank_key(entry: Dict[str, Any]):
+    rows = entry["rows"]
+    order = entry["order"]
+    # Same order as a stable descending sort over catalog order.
+    return lambda name: (-rows[name]["score"], order[name])
+
+
+def _build_leaderboard_rows(
+    context: Dict[str, Any],
+    bazaar_data: Dict[str, Dict[str, Any]],
+    catalog: tuple[Dict[str, Any], ...],
+) -> Dict[str, Any]:
+    entry = {
+        "context": context,
+        "catalog": catalog,
+        "snapshot": bazaar_data,
+        "mutations": {mutation["name"]: mutation for mutation in catalog},
+        "order": {mutation["name"]: index for index, mutation in enumerate(catalog)},
+        "rows": {mutation["name"]: compute_leaderboard_row(mutation, context, bazaar_data) for mutation in catalog},
+    }
+    entry["ranked"] = sorted(entry["rows"], key=_row_rank_key(entry))
+    return entry
+
+
+def _refresh_leaderboard_rows(entry: Dict[str, Any], bazaar_data: Dict[str, Dict[str, Any]]) -> int:
+    """Move a cached entry to a new snapshot, recomputing and re-ranking only the affected rows."""
+    index = build_price_dependency_index(entry["catalog"])
+    affected: set[str] = set()
+    for item in changed_bazaar_items(entry["snapshot"], bazaar_data):
+        affected.update(index.get(item, ()))
+
+    if affected:
+        rank_key = _row_rank_key(entry)
+        ranked = [name for name in entry["ranked"] if name not in affected]
+        for name in affected:
+            entry["rows"][name] = compute_leaderboard_row(entry["mutations"][name], entry["context"], bazaar_data)
+            insort(ranked, name, key=rank_key)
+        entry["ranked"] = ranked
+    entry["snapshot"] = bazaar_data
+    return len(affected)
+
+
+def optimized_layout_catalog(catalog: tuple[Dict[str, Any], ...]) -> tuple[Dict[str, Any], ...]:
+    """`catalog` with searched layouts swapped in, built once per catalog so cached rows stay valid."""
+    with _optimized_catalog_lock:
+        if _optimized_catalog_cache["catalog"] is not catalog:
+            _optimized_catalog_cache.update(
+                catalog=catalog,
+                optimized=tuple(apply_optimized_layout(mutation) for mutation in catalog),
+            )
+        return _optimized_catalog_cache["optimized"]
+
+
+def warm_layout_caches(catalog: tuple[Dict[str, Any], ...]) -> None:
+    """Run the layout and spread searches for `catalog` now, so no request pays for them.
+
+    Spread risk goes first because default requests need it; a request that arrives mid-search
+    waits for the search in flight rather than starting its own (see layout._computed_once).
+    """
+    for mutation in catalog:
+        spread_risk_by_layout(mutation)
+    optimized_layout_catalog(catalog)
+
+
+def _reload_and_warm_catalog() -> None:
+    if reload_mutation_catalog():
+        warm_layout_caches(MUTATION_CATALOG)
+
+
+# Each catalog version is searched once at load time, off the request path.
+threading.Thread(target=warm_layout_caches, args=(MUTATION_CATALOG,), daemon=True).start()
+
+
+def get_leaderboard_rows(
+    context: Dict[str, Any],
+    bazaar_data: Dict[str, Dict[str, Any]],
+    catalog: tuple[Dict[str, Any], ...],
+) -> List[Dict[str, Any]]:
+    """Ranked rows for `context`, reusing the cached rows that `bazaar_data` leaves unchanged."""
+    key = tuple(sorted(context.items()))
+    with _leaderboard_row_cache_lock:
+        entry = _leaderboard_row_cache.get(key)
+        if entry is None or entry["catalog"] is not catalog:
+            entry = _build_leaderboard_rows(context, bazaar_data, catalog)
+            _leaderboard_row_cache[key] = entry
+            while len(_leaderboard_row_cache) > LEADERBOARD_ROW_CACHE_SIZE:
+                _leaderboard_row_cache.popitem(last=False)
+        elif entry["snapshot"] is not bazaar_data:
+            _refresh_leaderboard_rows(entry, bazaar_data)
+        _leaderboard_row_cache.move_to_end(key)
+        return [entry["rows"][name] for name in entry["ranked"]]
+
+
+def refresh_cached_leaderboards(previous_data: Dict[str, Any], bazaar_data: Dict[str, Any]) -> int:
+    """Bring every cached leaderboard built on `previous_data` up to `bazaar_data`; returns rows recomputed."""
+    recomputed = 0
+    with _leaderboard_row_cache_lock:
+        for entry in _leaderboard_row_cache.values():
+            if entry["snapshot"] is previous_data and entry["catalog"] is MUTATION_CATALOG:
+                recomputed += _refresh_leaderboard_rows(entry, bazaar_data)
+    return recomputed
+
+
+def build_client_bundle(
+    catalog: tuple[Dict[str, Any], ...],
+    target_crops: frozenset[str],
+    catalog_version: str,
+    bazaar_data: Dict[str, Any],
+    snapshot_version: int,
+) -> Dict[str, Any]:
+    """Everything src/lib/leaderboard.ts needs to rebuild the core leaderboard without a round trip.
+
+    Per mutation: the compiled yield and timing coefficients and any measured spread losses.
+    Per priced item: top-of-book prices with the same fallbacks get_item_price applies, the
+    wide-spread flag, and insta order depth curves. Plus the request-independent constants.
+    """
+    mutations = []
+    items = set(build_price_dependency_index(catalog))
+    for mutation in catalog:
+        spread = spread_risk_for(mutation)
+        if spread is not None:
+            items.update(spread["destroyed"])
+        mutations.append({
+            "name": mutation["name"],
+            "base_limit": mutation["base_limit"],
+            "ingredients": [[ingredient, qty] for ingredient, qty in mutation["ingredients"]],
+            "growth_stages": mutation["growth_stages"],
+            "special_multiplier": mutation["effective_special_multiplier"],
+            "spawn_chance": mutation.get("metric_spawn_chance", DEFAULT_METRIC_SPAWN_CHANCE),
+            "warning_messages": list(mutation.get("warning_messages", ())),
+            "crop_drops": [
+                [drop["source_name"], drop["display_name"], drop["canonical_name"], drop["base_drop"], drop["price_override"]]
+                for drop in mutation["crop_drops"]
+            ],
+            "spread": {"survival_rate": spread["survival_rate"], "destroyed": spread["destroyed"]} if spread is not None else None,
+        })
+
+    depth_curves = get_depth_curves(bazaar_data)
+    prices: Dict[str, List[Any]] = {}
+    depth: Dict[str, Dict[str, List[List[float]]]] = {}
+    for item in sorted(items):
+        if item in NPC_PRICES:
+            continue
+        market = bazaar_data.get(item, {"buyPrice": 0, "sellPrice": 0})
+        prices[item] = [
+            market.get("buyPrice", market.get("sellPrice", 0)),
+            market.get("sellPrice", market.get("buyPrice", 0)),
+            has_wide_spread(market.get("buyPrice", 0), market.get("sellPrice", 0)),
+        ]
+        if item in depth_curves:
+            depth[item] = {
+                side: [list(curve.prices), list(curve.cumulative_quantity), list(curve.cumulative_cost)]
+                for side, curve in depth_curves[item].items()
+            }
+
+    return {
+        "version": f"{catalog_version}:{snapshot_version}",
+        "catalog_version": catalog_version,
+        "snapshot_version": snapshot_version,
+        "constants": {
+            "base_cycle_hours": BASE_CYCLE_HOURS,
+            "greenhouse_max_upgrade": GREENHOUSE_MAX_UPGRADE,
+            "greenhouse_speed_reduction": GREENHOUSE_SPEED_REDUCTION,
+            "greenhouse_yield_bonus": GREENHOUSE_YIELD_BONUS,
+            "unique_crops_max": UNIQUE_CROPS_MAX,
+            "unique_speed_reduction": UNIQUE_SPEED_REDUCTION,
+            "unique_yield_bonus": UNIQUE_YIELD_BONUS,
+            "harvest_harbinger_fortune": HARVEST_HARBINGER_FORTUNE,
+            "infini_vacuum_fortune": INFINI_VACUUM_FORTUNE,
+            "improved_harvest_boost_multiplier": IMPROVED_HARVEST_BOOST_MULTIPLIER,
+            "harvest_boost_multiplier": HARVEST_BOOST_MULTIPLIER,
+            "chip_level_cap": CHIP_LEVEL_CAP_BY_RARITY,
+            "hypercharge_bonus_per_level": HYPERCHARGE_BONUS_PER_LEVEL,
+            "evergreen_bonus_per_level": EVERGREEN_BONUS_PER_LEVEL,
+            "overdrive_bonus_per_level": OVERDRIVE_BONUS_PER_LEVEL,
+            "market_spread_warning": MARKET_SPREAD_WARNING,
+        },
+        "required_crops": DEFAULT_REQS,
+        "target_crops": sorted(target_crops),
+        "mutations": mutations,
+        "npc_prices": NPC_PRICES,
+        # Item -> [buy price, sell price, wide spread].
+        "prices": prices,
+        # Item -> side -> [prices, cumulative quantity, cumulative cost].
+        "depth": depth,
+    }
 
 
 @app.get("/api/ping")
 def ping():
     return {"status": "ok"}
 
+
+@app.get("/api/seasonality")
+def get_seasonality(items: str = Query("")):  # Comma-separated item names; empty for every catalog item
+    """Hour-of-week medians per item, with the cheapest hour for buy orders and the best for sell offers."""
+    if not isinstance(items, str):
+        items = ""
+    names = [name.strip() for name in items.split(",") if name.strip()] or sorted(build_price_dependency_index(MUTATION_CATALOG))
+    result: Dict[str, Any] = {}
+    for name in names:
+        hours = _seasonality_index.profile(name)
+        if hours is None:
+            continue
+        observed = [(bucket, entry) for bucket, entry in enumerate(hours) if entry is not None]
+        best_buy = min(observed, key=lambda pair: pair[1]["sellPrice"], default=(None, None))[0]
+        best_sell = max(observed, key=lambda pair: pair[1]["buyPrice"], default=(None, None))[0]
+        result[name] = {
+            "hours": hours,
+            "best_buy_order_hour": best_buy,
+            "best_buy_order_window": hour_of_week_label(best_buy) if best_buy is not None else None,
+            "best_sell_offer_hour": best_sell,
+            "best_sell_offer_window": hour_of_week_label(best_sell) if best_sell is not None else None,
+        }
+    return {"items": result}
+
+@app.get("/api/bundle")
+def get_bundle():
+    """Catalog coefficients, current prices and formula constants for recomputing the leaderboard client-side."""
+    catalog, target_crops, catalog_version = MUTATION_CATALOG, VALID_TARGET_CROPS, CATALOG_VERSION
+    get_cached_bazaar_prices()
+    snapshot = _cache_backend.read_snapshot()
+    bundle = build_client_bundle(catalog, target_crops, catalog_version, snapshot.data, snapshot.version)
+    bundle["expires_at"] = snapshot.expires_at
+    return bundle
+
 @app.get("/api/leaderboard")
 def get_leaderboard(
     plots: int = Query(1, ge=1, le=3),
@@ -466,11 +2071,13 @@ def get_leaderboard(
     gh_yield_upgrade: int | None = Query(None, ge=0, le=9),
     gh_speed_upgrade: int | None = Query(None, ge=0, le=9),
     unique_crops: int = Query(12, ge=0, le=12),
-    mode: str = Query("profit"),  # "profit", "smart", "target", "hourly"
+    mode: str = Query("profit"),  # "profit", "smart", "target", "hourly", "liquidity", "renewal"
     setup_mode: str = Query("insta_buy"), # "insta_buy" or "buy_order"
     sell_mode: str = Query("sell_offer"), # "insta_sell" or "sell_offer"
     target_crop: str = Query(None),
+    target_quantity: float = Query(0.0, ge=0.0),  # Target mode: rank by expected hours to farm this much
     maxed_crops: str = Query(""),  # Comma-separated list
+    crop_progress: str = Query(""),  # Comma-separated "Crop:amount" pairs for smart-mode planning
     mutation_chance: float = Query(0.25, gt=0.0, lt=1.0),
     harvest_mode: str = Query("full"),  # "full" or "custom_time"
     custom_time_hours: float = Query(24.0, gt=0.0),
@@ -487,6 +2094,18 @@ def get_leaderboard(
     overdrive_crop: str | None = Query(None),
     per_harvest_cost: float = Query(0.0, ge=0.0),
     is_ironman: bool = Query(False),
+    optimize_harvest_stage: bool = Query(False),  # Solve the best harvest stage for ramping multipliers
+    optimize_layout: bool = Query(False),  # Use searched plot layouts when they beat the catalog counts
+    apply_spread_risk: bool = Query(False),  # Price simulated spread losses into profit (the spread chance is assumed)
+    mode_matrix: bool = Query(False),  # Also price every setup x sell mode combination per row
+    production_flow: bool = Query(False),  # Steady-state in-house production of upstream mutations (always on for ironman)
+    plot_allocation: str = Query(""),  # Comma-separated "Mutation:plots" reserved per stage for the flow model
+    build_schedule: bool = Query(False),  # Lead time to build each mutation from plain crops (always on for ironman)
+    stability_draws: int = Query(0, ge=0, le=10000),  # Price resamples for rank stability; 0 turns it off
+    risk_aversion: float = Query(DEFAULT_RISK_AVERSION, ge=0.0, le=10.0),  # k in profit / hour - k * sigma
+    order_timing: bool = Query(False),  # Best hour of week to place the setup and sell orders
+    pareto: str = Query(""),  # Comma-separated metrics for the non-dominated set, e.g. "profit_per_hour,opt_cost:min"
+    response_format: str = Query("rows", alias="format"),  # "rows" or "columns"
 ) -> Dict[str, Any]:
     # Normalize FastAPI Query defaults when function is called directly in tests/scripts.
     def normalized_int(value: Any, *, default: int, minimum: int, maximum: int) -> int:
@@ -494,19 +2113,24 @@ def get_leaderboard(
             return default
         return max(minimum, min(maximum, value))
 
+    def normalized_bool(value: Any, *, default: bool) -> bool:
+        return value if isinstance(value, bool) else default
+
+    # Read the catalog once so a hot reload mid-request cannot mix two versions.
+    catalog, valid_target_crops, catalog_version = MUTATION_CATALOG, VALID_TARGET_CROPS, CATALOG_VERSION
     plots = normalized_int(plots, default=1, minimum=1, maximum=3)
     fortune = normalized_int(fortune, default=2500, minimum=0, maximum=10000)
     if not isinstance(maxed_crops, str):
         maxed_crops = ""
     if not isinstance(mutation_chance, (int, float)) or not math.isfinite(float(mutation_chance)) or not (0.0 < float(mutation_chance) < 1.0):
         mutation_chance = 0.25
-    if not isinstance(harvest_mode, str):
-        harvest_mode = "full"
+    harvest_mode = normalized_choice(harvest_mode, valid_values=VALID_HARVEST_MODES, default="full")
     if not isinstance(custom_time_hours, (int, float)) or not math.isfinite(float(custom_time_hours)) or float(custom_time_hours) <= 0.0:
         custom_time_hours = 24.0
     mode = normalized_choice(mode, valid_values=VALID_LEADERBOARD_MODES, default="profit")
     setup_mode = normalized_choice(setup_mode, valid_values=VALID_SETUP_MODES, default="insta_buy")
     sell_mode = normalized_choice(sell_mode, valid_values=VALID_SELL_MODES, default="sell_offer")
+    response_format = normalized_choice(response_format, valid_values=VALID_RESPONSE_FORMATS, default="rows")
     hypercharge_rarity = normalized_chip_rarity(hypercharge_rarity)
     evergreen_chip_rarity = normalized_chip_rarity(evergreen_chip_rarity)
     overdrive_chip_rarity = normalized_chip_rarity(overdrive_chip_rarity)
@@ -519,11 +2143,32 @@ def get_leaderboard(
     unique_crops = normalized_int(unique_crops, default=12, minimum=0, maximum=12)
     if not isinstance(per_harvest_cost, (int, float)) or not math.isfinite(float(per_harvest_cost)):
         per_harvest_cost = 0.0
+    if isinstance(target_quantity, bool) or not isinstance(target_quantity, (int, float)) or not math.isfinite(float(target_quantity)):
+        target_quantity = 0.0
+    target_quantity = max(0.0, float(target_quantity))
+    harvest_harbinger = normalized_bool(harvest_harbinger, default=False)
+    infini_vacuum = normalized_bool(infini_vacuum, default=False)
+    harvest_boost = normalized_bool(harvest_boost, default=False)
+    improved_harvest_boost = normalized_bool(improved_harvest_boost, default=True)
+    is_ironman = normalized_bool(is_ironman, default=False)
+    optimize_harvest_stage = normalized_bool(optimize_harvest_stage, default=False)
+    optimize_layout = normalized_bool(optimize_layout, default=False)
+    apply_spread_risk = normalized_bool(apply_spread_risk, default=False)
+    mode_matrix = normalized_bool(mode_matrix, default=False)
+    production_flow = normalized_bool(production_flow, default=False) or is_ironman
+    build_schedule = normalized_bool(build_schedule, default=False) or is_ironman
+    stability_draws = normalized_int(stability_draws, default=0, minimum=0, maximum=10000)
+    order_timing = normalized_bool(order_timing, default=False)
+    if isinstance(risk_aversion, bool) or not isinstance(risk_aversion, (int, float)) or not math.isfinite(float(risk_aversion)):
+        risk_aversion = DEFAULT_RISK_AVERSION
+    risk_aversion = max(0.0, min(10.0, float(risk_aversion)))
+    if optimize_layout:
+        catalog = optimized_layout_catalog(catalog)
     normalized_target_crop = canonical_crop_name(target_crop) if isinstance(target_crop, str) and target_crop.strip() else None
-    if normalized_target_crop not in VALID_TARGET_CROPS:
+    if normalized_target_crop not in valid_target_crops:
         normalized_target_crop = None
     normalized_overdrive_crop = canonical_crop_name(overdrive_crop) if isinstance(overdrive_crop, str) and overdrive_crop.strip() else None
-    if normalized_overdrive_crop not in VALID_TARGET_CROPS:
+    if normalized_overdrive_crop not in valid_target_crops:
         normalized_overdrive_crop = None
     
     # Load Data
@@ -538,303 +2183,254 @@ def get_leaderboard(
             seen_maxed.add(cleaned_name)
             maxed_list.append(cleaned_name)
     missing_crops = [crop for crop in DEFAULT_REQS.keys() if crop not in maxed_list]
-    
+    collected_by_crop = parse_crop_progress(crop_progress)
+    remaining_by_crop = {
+        crop: max(0.0, DEFAULT_REQS[crop] - collected_by_crop.get(crop, 0.0))
+        for crop in missing_crops
+    }
     # Cycle Time Math
-    base_cycle_hours = 4.0
-    gh_speed_reduction = (gh_speed_upgrade / 9.0) * 0.25
-    unique_reduction = (unique_crops / 12.0) * 0.30
-    cycle_time_hours = base_cycle_hours * (1.0 - gh_speed_reduction - unique_reduction)
+    gh_speed_reduction = (gh_speed_upgrade / GREENHOUSE_MAX_UPGRADE) * GREENHOUSE_SPEED_REDUCTION
+    unique_reduction = (unique_crops / UNIQUE_CROPS_MAX) * UNIQUE_SPEED_REDUCTION
+    cycle_time_hours = BASE_CYCLE_HOURS * (1.0 - gh_speed_reduction - unique_reduction)
     
     # Additive base yield is modeled as:
     # Base (1.0) + Evergreen Chip (up to +0.60) + Greenhouse Yield (up to +0.20)
     # + Unique Crops (up to +0.36).
     evergreen_buff = evergreen_chip_level * EVERGREEN_BONUS_PER_LEVEL[evergreen_chip_rarity]
-    gh_buff = (gh_yield_upgrade / 9.0) * 0.20
-    unique_buff = (unique_crops / 12.0) * 0.36
+    gh_buff = (gh_yield_upgrade / GREENHOUSE_MAX_UPGRADE) * GREENHOUSE_YIELD_BONUS
+    unique_buff = (unique_crops / UNIQUE_CROPS_MAX) * UNIQUE_YIELD_BONUS
     additive_base = 1.0 + evergreen_buff + gh_buff + unique_buff
     
     # Buff fortune model:
     # Harvest Harbinger (+50) is unaffected by Hypercharge.
     # InfiniVacuum (+200) is affected by Hypercharge.
     affected_multiplier = 1.0 + (hypercharge_level * HYPERCHARGE_BONUS_PER_LEVEL[hypercharge_rarity])
-    unaffected_bonus = 50.0 if harvest_harbinger else 0.0
-    affected_bonus_base = 200.0 if infini_vacuum else 0.0
+    unaffected_bonus = HARVEST_HARBINGER_FORTUNE if harvest_harbinger else 0.0
+    affected_bonus_base = INFINI_VACUUM_FORTUNE if infini_vacuum else 0.0
     total_bonus = unaffected_bonus + (affected_bonus_base * affected_multiplier)
     effective_fortune = fortune + total_bonus
     overdrive_bonus = overdrive_chip_level * OVERDRIVE_BONUS_PER_LEVEL[overdrive_chip_rarity]
 
     if improved_harvest_boost:
-        harvest_boost_multiplier = 1.3
+        harvest_boost_multiplier = IMPROVED_HARVEST_BOOST_MULTIPLIER
     elif harvest_boost:
-        harvest_boost_multiplier = 1.2
+        harvest_boost_multiplier = HARVEST_BOOST_MULTIPLIER
     else:
         harvest_boost_multiplier = 1.0
     base_yield_mult = additive_base * harvest_boost_multiplier
     
-    leaderboard_data = []
-    
-    def get_item_price(item: str, is_buying: bool, mode_str: str):
-        if item in NPC_PRICES:
-            return NPC_PRICES[item]
-        market = bazaar_data.get(item, {"buyPrice": 0, "sellPrice": 0})
-        if is_buying:
-            if mode_str == "insta_buy":
-                return market.get('buyPrice', market.get('sellPrice', 0))
-            else: # buy_order
-                return market.get('sellPrice', market.get('buyPrice', 0))
-        else:
-            if mode_str == "insta_sell":
-                return market.get('sellPrice', market.get('buyPrice', 0))
-            else: # sell_offer
-                return market.get('buyPrice', market.get('sellPrice', 0))
-
-    def finite_or_none(value: Any) -> float | None:
-        if isinstance(value, (int, float)) and math.isfinite(float(value)):
-            return float(value)
-        return None
-
-    def finite_or_zero(value: Any) -> float:
-        finite = finite_or_none(value)
-        return finite if finite is not None else 0.0
-                
-    for mutation in MUTATION_CATALOG:
-        mut_name = mutation["name"]
-        base_limit = mutation["base_limit"]
-        limit = base_limit * plots
-
-        # 1. Setup Cost
-        opt_cost = 0.0
-        ing_warning = False
-        ingredient_costs = []
-
-        for ing, qty_per_plot in mutation["ingredients"]:
-            total_qty = qty_per_plot * plots
-            cost_per_ing = get_item_price(ing, True, setup_mode)
-            total_cost = total_qty * cost_per_ing
-            opt_cost += total_cost
-            ingredient_costs.append({
-                "name": ing,
-                "amount": total_qty,
-                "unit_price": cost_per_ing,
-                "total_cost": total_cost,
-            })
-
-            ing_market = bazaar_data.get(ing, {"buyPrice": 0, "sellPrice": 0})
-            if has_wide_spread(ing_market.get("buyPrice", 0), ing_market.get("sellPrice", 0)):
-                ing_warning = True
-
-        mut_sell_price_value = 0.0 if is_ironman else get_item_price(mut_name, False, sell_mode)
-        market_data = bazaar_data.get(mut_name, {"buyPrice": 0, "sellPrice": 0})
-        mut_warning = has_wide_spread(market_data.get("buyPrice", 0), market_data.get("sellPrice", 0))
-
-        # 2. Return per Batch (One Harvest)
-        growth_stages = mutation["growth_stages"]
-        effective_special_mult = mutation["effective_special_multiplier"]
-        # Breakdown and profit-per-harvest values represent a full mature batch.
-        # Spawn probability is only applied in expected-cycle timing metrics.
-        effective_limit = float(limit)
-
-        # Lifecycle display is post-spawn only. Expected spawn wait is handled in expected-cycle metrics.
-        estimated_time = growth_stages * cycle_time_hours
-
-        expected_drops_value = 0.0
-        yields: List[Dict[str, Any]] = []
-        yield_by_name: Dict[str, Dict[str, Any]] = {}
-
-        for crop_drop in mutation["crop_drops"]:
-            crop_overdrive_bonus = overdrive_bonus if normalized_overdrive_crop and crop_drop["canonical_name"] == normalized_overdrive_crop else 0.0
-            crop_fortune_mult = (((effective_fortune + crop_overdrive_bonus) / 100) + 1)
-            full_drops = crop_drop["base_drop"] * effective_limit * base_yield_mult * crop_fortune_mult
-            expected_drops = full_drops * effective_special_mult
-            crop_price = crop_drop["price_override"] or get_item_price(crop_drop["source_name"], False, sell_mode)
-            total_value = expected_drops * crop_price
-            expected_drops_value += total_value
-
-            existing = yield_by_name.get(crop_drop["display_name"])
-            if existing:
-                existing["amount"] += expected_drops
-                existing["total_value"] += total_value
-                if existing.get("math"):
-                    existing["math"]["base"] += crop_drop["base_drop"]
-            else:
-                yield_item = {
-                    "name": crop_drop["display_name"],
-                    "amount": expected_drops,
-                    "unit_price": crop_price,
-                    "total_value": total_value,
-                    "math": {
-                        "base": crop_drop["base_drop"],
-                        "limit": effective_limit,
-                        "evergreen_buff": evergreen_buff,
-                        "gh_buff": gh_buff,
-                        "unique_buff": unique_buff,
-                        "harvest_boost": harvest_boost_multiplier,
-                        "wart_buff": harvest_boost_multiplier,
-                        "fortune": crop_fortune_mult,
-                        "overdrive_bonus": crop_overdrive_bonus,
-                        "special": effective_special_mult,
-                    },
-                }
-                yields.append(yield_item)
-                yield_by_name[crop_drop["display_name"]] = yield_item
-
-        expected_mut_drops = effective_limit
-        expected_mut_val = expected_mut_drops * mut_sell_price_value
-        total_cycle_revenue = expected_drops_value + expected_mut_val
-
-        if expected_mut_drops > 0:
-            yields.append({
-                "name": mut_name,
-                "amount": expected_mut_drops,
-                "unit_price": mut_sell_price_value,
-                "total_value": expected_mut_val,
-                "math": {
-                    "base": 1.0,
-                    "limit": effective_limit,
-                    "evergreen_buff": 0.0,
-                    "gh_buff": 0.0,
-                    "unique_buff": 0.0,
-                    "harvest_boost": 1.0,
-                    "wart_buff": 1.0,
-                    "fortune": 1.0,
-                    "special": 1.0,
-                },
-            })
-
-        crop_yields_by_name = {yld["name"]: yld["amount"] for yld in yields if yld["name"] in DEFAULT_REQS}
-        smart_progress = {}
-        for req_crop in missing_crops:
-            req_amt = DEFAULT_REQS.get(req_crop, 0)
-            if req_amt <= 0:
-                continue
-            progress_pct = (crop_yields_by_name.get(req_crop, 0) / req_amt) * 100.0
-            if progress_pct > 0:
-                smart_progress[req_crop] = progress_pct
-
-        # 3. Profit metrics
-        profit_batch = total_cycle_revenue - opt_cost
-
-        metric_spawn_chance = metric_spawn_chance_for_mutation(mut_name)
-        profit_models = build_expected_cycle_profit_model(
-            profit_per_harvest=profit_batch,
-            spawn_chance=metric_spawn_chance,
-            growth_stages=growth_stages,
+    context = {
+        "plots": plots,
+        "setup_mode": setup_mode,
+        "sell_mode": sell_mode,
+        "mode": mode,
+        "is_ironman": is_ironman,
+        "target_crop": normalized_target_crop,
+        "missing_crops": tuple(missing_crops),
+        "harvest_mode": harvest_mode,
+        "custom_time_hours": float(custom_time_hours) if harvest_mode == "custom_time" else None,
+        "mutation_chance": float(mutation_chance),
+        "per_harvest_cost": float(per_harvest_cost),
+        "cycle_time_hours": cycle_time_hours,
+        "effective_fortune": effective_fortune,
+        "overdrive_crop": normalized_overdrive_crop,
+        "overdrive_bonus": overdrive_bonus,
+        "base_yield_mult": base_yield_mult,
+        "evergreen_buff": evergreen_buff,
+        "gh_buff": gh_buff,
+        "unique_buff": unique_buff,
+        "harvest_boost_multiplier": harvest_boost_multiplier,
+        "optimize_harvest_stage": optimize_harvest_stage,
+        "optimize_layout": optimize_layout,
+        "apply_spread_risk": apply_spread_risk,
+        "mode_matrix": mode_matrix,
+    }
+    # Shallow copies: target mode re-scores rows below and cached rows must stay untouched.
+    leaderboard_data = [dict(row) for row in get_leaderboard_rows(context, bazaar_data, catalog)]
+    for row in leaderboard_data:
+        apply_price_risk(row, bazaar_data, risk_aversion)
+        if order_timing:
+            row["order_timing"] = plan_order_timing(row, setup_mode, sell_mode)
+
+    flow_allocations: Dict[str, float] = {}
+    if production_flow:
+        flow_allocations = parse_plot_allocation(plot_allocation, (mutation["name"] for mutation in catalog))
+        # Price-independent and a few milliseconds for the whole catalog, so solved per request.
+        flows = solve_catalog_flows(
+            catalog,
+            total_plots=plots,
             cycle_time_hours=cycle_time_hours,
-            batch_size=limit,
+            allocations=flow_allocations,
         )
-        profit_per_growth_cycle = finite_or_none(profit_models.get("profit_per_cycle"))
-        profit_per_hour = finite_or_zero(profit_models.get("profit_per_hour"))
-        hourly_profit_selected = finite_or_none(profit_models.get("profit_per_hour"))
-        warning_messages = build_warning_messages(mut_name, mut_warning)
-
-        payback_hours_ready = (opt_cost / hourly_profit_selected) if (hourly_profit_selected is not None and hourly_profit_selected > 0) else None
-
-        # 4. Scoring Logic
-        score = 0
-        if mode == "profit":
-            score = profit_batch
-        elif mode == "target" and normalized_target_crop:
-            score = next((item["amount"] for item in yields if item["name"] == normalized_target_crop), 0.0)
-        elif mode == "smart":
-            score = sum(smart_progress.values())
-            if score <= 0:
-                continue
-        elif mode == "hourly":
-            score = hourly_profit_selected if hourly_profit_selected is not None else float("-inf")
+        for row in leaderboard_data:
+            row["production_flow"] = flows.get(row["mutationName"])
+    if build_schedule:
+        builds = plan_catalog_builds(catalog, total_plots=plots, cycle_time_hours=cycle_time_hours)
+        for row in leaderboard_data:
+            row["build_plan"] = builds.get(row["mutationName"])
+    milestone_options: List[Dict[str, Any]] = []
+    if mode == "smart":
+        leaderboard_data = [row for row in leaderboard_data if row["score"] > 0]
+        milestone_options = [
+            {
+                "name": row["mutationName"],
+                "hours": _finite_or_none(row["hourly"]["expected_hours"]),
+                "yields": {
+                    crop: next((yld["amount"] for yld in row["breakdown"]["yields"] if yld["name"] == crop), 0.0)
+                    for crop in row["smart_progress"]
+                },
+            }
+            for row in leaderboard_data
+        ]
+
+    target_plan = None
+    if mode == "target" and normalized_target_crop and target_quantity > 0:
+        target_plan = plan_target_quantity(
+            [row["mutationName"] for row in leaderboard_data],
+            [row["score"] for row in leaderboard_data],
+            [row["hourly"]["expected_hours"] for row in leaderboard_data],
+            target_quantity,
+        )
+        for index, row in enumerate(leaderboard_data):
+            hours_to_target = target_plan["hours_to_target"][index]
+            row["target_plan"] = {
+                "target_quantity": target_quantity,
+                "amount_per_batch": row["score"],
+                "batches": target_plan["batches"][index],
+                "expected_hours": hours_to_target,
+            }
+            # Effective crop per hour including whole-batch rounding; ranks by fewest hours to target.
+            row["score"] = (target_quantity / hours_to_target) if hours_to_target else 0.0
+        leaderboard_data.sort(key=lambda x: x["score"], reverse=True)
+
+    pareto_metrics = parse_pareto_metrics(pareto)
+    pareto_frontier: List[str] = []
+    pareto_excluded: List[str] = []
+    if pareto_metrics:
+        # Rows missing a metric can't be compared on it, so they sit out instead of ranking worst.
+        scored = [(row, pareto_point(row, pareto_metrics)) for row in leaderboard_data]
+        comparable = [(row, point) for row, point in scored if point is not None]
+        frontier = set(pareto_front([point for _row, point in comparable]))
+        for index, (row, _point) in enumerate(comparable):
+            row["pareto_optimal"] = index in frontier
+        for row, point in scored:
+            if point is None:
+                row["pareto_optimal"] = None
+                pareto_excluded.append(row["mutationName"])
+            elif row["pareto_optimal"]:
+                pareto_frontier.append(row["mutationName"])
+
+    if stability_draws:
+        widths = price_noise_widths(bazaar_data, {item for row in leaderboard_data for item in row["price_exposure"]})
+        stability = rank_stability(leaderboard_data, widths, draws=stability_draws)
+        for row in leaderboard_data:
+            row["rank_stability"] = stability[row["mutationName"]]
+
+    metadata = {
+        "catalog_version": catalog_version,
+        "optimize_layout": optimize_layout,
+        "apply_spread_risk": apply_spread_risk,
+        "production_flow": {"total_plots": plots, "allocations": flow_allocations} if production_flow else None,
+        "build_schedule": build_schedule,
+        "stability_draws": stability_draws,
+        "risk_aversion": risk_aversion,
+        "order_timing": order_timing,
+        "pareto": {
+            "metrics": [{"name": name, "direction": direction} for name, direction in pareto_metrics],
+            "frontier": pareto_frontier,
+            "excluded": pareto_excluded,
+        } if pareto_metrics else None,
+        "cycle_time_hours": cycle_time_hours,
+        "missing_crops": missing_crops,
+        "fortune_breakdown": {
+            "base_fortune": fortune,
+            "effective_fortune": effective_fortune,
+            "bonus_total": total_bonus,
+            "harvest_harbinger": harvest_harbinger,
+            "infini_vacuum": infini_vacuum,
+            "hypercharge_level": hypercharge_level,
+            "hypercharge_rarity": hypercharge_rarity,
+            "affected_multiplier": affected_multiplier,
+        },
+        "yield_breakdown": {
+            "base_multiplier": 1.0,
+            "evergreen_chip_level": evergreen_chip_level,
+            "evergreen_chip_rarity": evergreen_chip_rarity,
+            "evergreen_bonus": evergreen_buff,
+            "greenhouse_yield_upgrade": gh_yield_upgrade,
+            "greenhouse_yield_bonus": gh_buff,
+            "unique_crops": unique_crops,
+            "unique_crop_bonus": unique_buff,
+            "harvest_boost": harvest_boost,
+            "improved_harvest_boost": improved_harvest_boost,
+            "harvest_boost_multiplier": harvest_boost_multiplier,
+            "wart_multiplier": harvest_boost_multiplier,
+            "overdrive_chip_level": overdrive_chip_level,
+            "overdrive_chip_rarity": overdrive_chip_rarity,
+            "overdrive_crop": normalized_overdrive_crop,
+            "overdrive_bonus": overdrive_bonus,
+        },
+        "speed_breakdown": {
+            "greenhouse_speed_upgrade": gh_speed_upgrade,
+            "greenhouse_speed_reduction": gh_speed_reduction,
+            "unique_speed_reduction": unique_reduction,
+        },
+    }
 
-        breakdown = {
-            "base_limit": base_limit,
-            "ingredients": ingredient_costs,
-            "yields": yields,
-            "total_setup_cost": opt_cost,
-            "total_revenue": total_cycle_revenue,
-            "growth_stages": growth_stages,
-            "estimated_time_hours": estimated_time,
+    if target_plan is not None:
+        metadata["target_plan"] = {
+            "target_crop": normalized_target_crop,
+            "target_quantity": target_quantity,
+            "best": target_plan["best"],
+            "mixed": target_plan["mixed"],
         }
-
-        leaderboard_data.append({
-            "mutationName": mut_name,
-            "score": score,
-            "profit": profit_batch,
-            "profit_per_growth_cycle": profit_per_growth_cycle,
-            "profit_per_hour": profit_per_hour,
-            "opt_cost": opt_cost,
-            "revenue": total_cycle_revenue,
-            "warning": len(warning_messages) > 0,
-            "warning_messages": warning_messages,
-            "mut_price": mut_sell_price_value,
-            "limit": limit,
-            "smart_progress": smart_progress,
-            "hourly": {
-                "mutation_chance": metric_spawn_chance,
-                "profit_per_hour_selected": hourly_profit_selected,
-                "tau_hours": profit_models.get("tau_hours"),
-                "p": profit_models.get("p"),
-                "g": profit_models.get("g"),
-                "N": profit_models.get("N"),
-                "expected_spawn_cycles": profit_models.get("expected_spawn_cycles"),
-                "expected_cycles": profit_models.get("expected_cycles"),
-                "expected_hours": profit_models.get("expected_hours"),
-                "cycles_per_harvest_per_spot": profit_models.get("cycles_per_harvest_per_spot"),
-                "hours_per_harvest_per_spot": profit_models.get("hours_per_harvest_per_spot"),
-                "harvests_per_cycle": profit_models.get("harvests_per_cycle"),
-                "harvests_per_hour": profit_models.get("harvests_per_hour"),
-                "profit_per_hour": profit_models.get("profit_per_hour"),
-                "warnings": profit_models.get("warnings", []),
-                "payback_hours_ready": payback_hours_ready,
-                # Legacy fields retained for backward compatibility:
+    if mode == "smart":
+        metadata["crop_progress"] = collected_by_crop
+        metadata["milestone_plan"] = plan_milestones(milestone_options, remaining_by_crop)
+
+    if response_format == "columns":
+        return build_columnar_leaderboard(
+            leaderboard_data,
+            metadata,
+            {
+                "tau_hours": cycle_time_hours,
+                "evergreen_buff": evergreen_buff,
+                "gh_buff": gh_buff,
+                "unique_buff": unique_buff,
+                "harvest_boost": harvest_boost_multiplier,
+                "wart_buff": harvest_boost_multiplier,
                 "harvest_mode": harvest_mode,
                 "custom_time_hours": custom_time_hours if harvest_mode == "custom_time" else None,
-                "harvest_time_hours": None,
-                "completed_cycles": None,
-                "expected_mutations": None,
-                "expected_revenue": None,
-                "expected_profit": None,
-                "expected_profit_per_hour": hourly_profit_selected,
             },
-            "profit_models": profit_models,
-            "breakdown": breakdown,
-        })
-
-    leaderboard_data.sort(key=lambda x: x["score"], reverse=True)
+        )
 
     return {
         "leaderboard": leaderboard_data,
-        "metadata": {
-            "cycle_time_hours": cycle_time_hours,
-            "missing_crops": missing_crops,
-            "fortune_breakdown": {
-                "base_fortune": fortune,
-                "effective_fortune": effective_fortune,
-                "bonus_total": total_bonus,
-                "harvest_harbinger": harvest_harbinger,
-                "infini_vacuum": infini_vacuum,
-                "hypercharge_level": hypercharge_level,
-                "hypercharge_rarity": hypercharge_rarity,
-                "affected_multiplier": affected_multiplier,
-            },
-            "yield_breakdown": {
-                "base_multiplier": 1.0,
-                "evergreen_chip_level": evergreen_chip_level,
-                "evergreen_chip_rarity": evergreen_chip_rarity,
-                "evergreen_bonus": evergreen_buff,
-                "greenhouse_yield_upgrade": gh_yield_upgrade,
-                "greenhouse_yield_bonus": gh_buff,
-                "unique_crops": unique_crops,
-                "unique_crop_bonus": unique_buff,
-                "harvest_boost": harvest_boost,
-                "improved_harvest_boost": improved_harvest_boost,
-                "harvest_boost_multiplier": harvest_boost_multiplier,
-                "wart_multiplier": harvest_boost_multiplier,
-                "overdrive_chip_level": overdrive_chip_level,
-                "overdrive_chip_rarity": overdrive_chip_rarity,
-                "overdrive_crop": normalized_overdrive_crop,
-                "overdrive_bonus": overdrive_bonus,
-            },
-            "speed_breakdown": {
-                "greenhouse_speed_upgrade": gh_speed_upgrade,
-                "greenhouse_speed_reduction": gh_speed_reduction,
-                "unique_speed_reduction": unique_reduction,
-            },
-        }
+        "metadata": metadata,
+    }
+
+
+@app.get("/api/upgrades")
+def get_upgrade_gains(
+    leaderboard: Dict[str, Any] = Depends(get_leaderboard),  # Takes every /api/leaderboard parameter
+    upgrade_costs: str = Query(""),  # Comma-separated "step:coins" pairs, e.g. "greenhouse_yield:5e6,fortune:2e6"
+):
+    """What the next step of each upgrade is worth per mutation, for the player described by the leaderboard params."""
+    if "leaderboard" not in leaderboard:
+        return JSONResponse(status_code=400, content={"detail": "Upgrade gains need format=rows."})
+    metadata = leaderboard["metadata"]
+    yields = metadata["yield_breakdown"]
+    steps = player_upgrade_steps(metadata)
+    costs = parse_upgrade_costs(upgrade_costs, steps)
+    mutations = compute_upgrade_gains(
+        leaderboard["leaderboard"],
+        steps,
+        additive_base=yields["base_multiplier"] + yields["evergreen_bonus"] + yields["greenhouse_yield_bonus"] + yields["unique_crop_bonus"],
+        overdrive_crop=yields["overdrive_crop"],
+        costs=costs,
+    )
+    return {
+        "steps": {name: {"deltas": deltas, "cost": costs.get(name)} for name, deltas in steps.items()},
+        "mutations": mutations,
+        "metadata": metadata,
     }
@@ -0,0 +1,363 @@
+import math
+import random
+import threading
+from functools import lru_cache, wraps
+from itertools import cycle, product
+from typing import Any, Dict, Mapping, NamedTuple, Tuple
+
+try:
+    from api.garden import AdjacencyRule, GardenGeometry, _shift, adjacency_rule, eligible_spots, garden_geometry, requirement_progress, simulate_spread
+except ImportError:
+    from garden import AdjacencyRule, GardenGeometry, _shift, adjacency_rule, eligible_spots, garden_geometry, requirement_progress, simulate_spread
+
+LAYOUT_ITERATIONS = 3000
+LAYOUT_START_TEMPERATURE = 1.0
+LAYOUT_END_TEMPERATURE = 0.02
+SPREAD_TRIALS = 512
+
+
+class LayoutPlan(NamedTuple):
+    grid: Tuple[Tuple[str | None, ...], ...]  # crop per cell, None = empty
+    spots: Tuple[Tuple[int, int], ...]  # top-left cell of each mutation spot
+    ingredients: Tuple[Tuple[str, int], ...]  # cells planted per crop, in rule order
+    cost: float
+
+
+def _computed_once(function):
+    """`lru_cache` whose concurrent misses on the same arguments wait for one computation.
+
+    The load-time warm thread and a cold request would otherwise both run the same search.
+    """
+    cached = lru_cache(maxsize=128)(function)
+    pending: Dict[Any, threading.Lock] = {}
+    pending_lock = threading.Lock()
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        with pending_lock:
+            lock = pending.setdefault(key, threading.Lock())
+        try:
+            with lock:
+                return cached(*args, **kwargs)
+        finally:
+            # Later callers go straight to the cache; waiters still hold this lock.
+            with pending_lock:
+                pending.pop(key, None)
+
+    wrapper.cache_clear = cached.cache_clear
+    wrapper.cache_info = cached.cache_info
+    return wrapper
+
+
+def _conflict_offsets(rule: AdjacencyRule) -> Tuple[Tuple[int, int], ...]:
+    """Anchor offsets that cannot both hold a mutation: overlapping footprints, and for neighbour
+    caps the whole ring too, since a grown mutation counts as a planted neighbour."""
+    reach = rule.footprint if rule.max_adjacent_crops is not None else rule.footprint - 1
+    return tuple((row, col) for row in range(-reach, reach + 1) for col in range(-reach, reach + 1))
+
+
+def select_spots(geometry: GardenGeometry, candidates: int, rule: AdjacencyRule) -> int:
+    """Greedy reading-order choice of anchors that can all hold a mutation at the same time."""
+    offsets = _conflict_offsets(rule)
+    if len(offsets) == 1:
+        return candidates
+    chosen = 0
+    while candidates:
+        anchor = candidates & -candidates
+        chosen |= anchor
+        for row, col in offsets:
+            candidates &= ~_shift(geometry, anchor, row, col)
+    return chosen
+
+
+def _score(
+    geometry: GardenGeometry,
+    crops: Dict[str, int],
+    rule: AdjacencyRule,
+    weights: Mapping[str, float],
+    cost_scale: float,
+    ring_cache: Dict[Tuple[str, int], Any],
+) -> Tuple[float, int, float]:
+    spots = select_spots(geometry, eligible_spots(geometry, crops, rule, ring_cache=ring_cache), rule)
+    cost = sum(weights.get(crop, 1.0) * mask.bit_count() for crop, mask in crops.items())
+    # Cost is scaled below one spot, so spots always win and cost only breaks ties.
+    return spots.bit_count() - (cost / cost_scale), spots, cost
+
+
+@_computed_once
+def optimize_layout(
+    rule: AdjacencyRule,
+    weights: Tuple[Tuple[str, float], ...] = (),
+    iterations: int = LAYOUT_ITERATIONS,
+    seed: int = 0,
+) -> LayoutPlan:
+    """Simulated annealing over one plot's crop grid: most mutation spots, then cheapest ingredients.
+
+    Each move replants one cell (with an ingredient or nothing) and is scored with the bitboard
+    rules. `weights` are per-cell ingredient costs (default 1, i.e. fewest planted cells). While
+    the search is hot, partially satisfied spots also earn a little, so rules that need many
+    crops around one spot (Godseed) have a gradient to climb; the bonus fades out with the
+    temperature, and the best layout is chosen on spots and cost alone.
+    """
+    geometry = garden_geometry(1)
+    crops_in_rule = [crop for crop, _minimum in rule.required]
+    choices = [None, *crops_in_rule]
+    weight_map = dict(weights)
+    cells = [(row, col) for row in range(geometry.height) for col in range(geometry.width)]
+    cost_scale = (len(cells) * max([1.0, *weight_map.values()])) + 1.0
+    progress_scale = float(geometry.width * geometry.height * max(len(crops_in_rule), 1))
+    rng = random.Random(seed)
+    # Each move changes at most two crops, so neighbour counts of the others are reused.
+    ring_cache: Dict[Tuple[str, int], Any] = {}
+
+    def shaped(value: float, temperature: float) -> float:
+        return value + (temperature / LAYOUT_START_TEMPERATURE) * requirement_progress(geometry, crops, rule, ring_cache) / progress_scale * 4.0
+
+    starts = []
+    for start in (_tiled_start(geometry, rule), _lattice_start(geometry, rule)):
+        if start is None:
+            continue
+        start_crops: Dict[str, int] = {crop: 0 for crop in crops_in_rule}
+        for (row, col), crop in start.items():
+            if crop:
+                start_crops[crop] |= 1 << (row * geometry.stride + col)
+        starts.append((_score(geometry, start_crops, rule, weight_map, cost_scale, ring_cache), start, start_crops))
+    (score, spots, cost), grid, crops = max(starts, key=lambda start: start[0][0])
+    current = shaped(score, LAYOUT_START_TEMPERATURE)
+    best = (score, dict(grid), spots, cost)
+    if not crops_in_rule:
+        # Nothing to plant: the best layout is the empty plot.
+        grid = {cell: None for cell in cells}
+        crops = {}
+        score, spots, cost = _score(geometry, crops, rule, weight_map, cost_scale, ring_cache)
+        best = (score, dict(grid), spots, cost)
+        iterations = 0
+
+    for step in range(iterations):
+        temperature = LAYOUT_START_TEMPERATURE * ((LAYOUT_END_TEMPERATURE / LAYOUT_START_TEMPERATURE) ** (step / iterations))
+        cell = rng.choice(cells)
+        old, new = grid[cell], rng.choice(choices)
+        if new == old:
+            continue
+        bit = 1 << (cell[0] * geometry.stride + cell[1])
+        if old:
+            crops[old] &= ~bit
+        if new:
+            crops[new] |= bit
+        candidate, candidate_spots, candidate_cost = _score(geometry, crops, rule, weight_map, cost_scale, ring_cache)
+        candidate_shaped = shaped(candidate, temperature)
+        if candidate_shaped >= current or rng.random() < math.exp((candidate_shaped - current) / temperature):
+            grid[cell] = new
+            score, spots, cost, current = candidate, candidate_spots, candidate_cost, candidate_shaped
+            if score > best[0]:
+                best = (score, dict(grid), spots, cost)
+        else:
+            if new:
+                crops[new] &= ~bit
+            if old:
+                crops[old] |= bit
+
+    _score_value, best_grid, best_spots, best_cost = best
+    # Cells that no chosen spot needs are left empty.
+    best_grid, best_cost = _prune_unused(geometry, best_grid, best_spots, rule, weight_map)
+    return LayoutPlan(
+        grid=tuple(tuple(best_grid[(row, col)] for col in range(geometry.width)) for row in range(geometry.height)),
+        spots=tuple(cell for cell in cells if best_spots >> (cell[0] * geometry.stride + cell[1]) & 1),
+        ingredients=tuple(
+            (crop, sum(1 for planted in best_grid.values() if planted == crop))
+            for crop in crops_in_rule
+        ),
+        cost=best_cost,
+    )
+
+
+def _tiled_start(geometry: GardenGeometry, rule: AdjacencyRule) -> Dict[Tuple[int, int], str | None]:
+    """Valid starting layout: spots tiled with private rings, each ring cycling through the requirements."""
+    grid: Dict[Tuple[int, int], str | None] = {
+        (row, col): None for row in range(geometry.height) for col in range(geometry.width)
+    }
+    # Each crop repeated to its minimum, so one private ring meets the whole rule.
+    ring_fill = [crop for crop, minimum in rule.required for _ in range(minimum)]
+    if not ring_fill:
+        return grid
+    period = rule.footprint + 2
+    for top in range(1, geometry.height - rule.footprint, period):
+        for left in range(1, geometry.width - rule.footprint, period):
+            ring = [
+                (top + row, left + col)
+                for row in range(-1, rule.footprint + 1)
+                for col in range(-1, rule.footprint + 1)
+                if not (0 <= row < rule.footprint and 0 <= col < rule.footprint)
+            ]
+            for cell, crop in zip(ring, cycle(ring_fill)):
+                if cell in grid:
+                    grid[cell] = crop
+    return grid
+
+
+LATTICE_SEARCH_LIMIT = 20000
+
+
+def _lattice_start(geometry: GardenGeometry, rule: AdjacencyRule) -> Dict[Tuple[int, int], str | None] | None:
+    """Densest regular layout: spots every `footprint + 1` cells so neighbouring spots share ring cells.
+
+    Ring cells fall into a few classes by position modulo the period; the cheapest assignment
+    of crops to classes that meets every minimum is found by enumeration. None when the rule
+    has no crops, the enumeration is too large, or no assignment works.
+    """
+    if not rule.required:
+        return None
+    period = rule.footprint + 1
+    class_counts: Dict[Tuple[int, int], int] = {}
+    for row in range(-1, rule.footprint + 1):
+        for col in range(-1, rule.footprint + 1):
+            if not (0 <= row < rule.footprint and 0 <= col < rule.footprint):
+                position = ((1 + row) % period, (1 + col) % period)
+                class_counts[position] = class_counts.get(position, 0) + 1
+    classes = sorted(class_counts)
+    options = [None, *(crop for crop, _minimum in rule.required)]
+    if len(options) ** len(classes) > LATTICE_SEARCH_LIMIT:
+        return None
+
+    best = None
+    for assignment in product(options, repeat=len(classes)):
+        around: Dict[str, int] = {}
+        for position, crop in zip(classes, assignment):
+            if crop:
+                around[crop] = around.get(crop, 0) + class_counts[position]
+        if all(around.get(crop, 0) >= minimum for crop, minimum in rule.required):
+            planted = sum(class_counts[position] for position, crop in zip(classes, assignment) if crop)
+            if best is None or planted < best[0]:
+                best = (planted, dict(zip(classes, assignment)))
+    if best is None:
+        return None
+    return {
+        (row, col): best[1].get((row % period, col % period))
+        for row in range(geometry.height)
+        for col in range(geometry.width)
+    }
+
+
+def _prune_unused(
+    geometry: GardenGeometry,
+    grid: Dict[Tuple[int, int], str | None],
+    spots: int,
+    rule: AdjacencyRule,
+    weights: Mapping[str, float],
+) -> Tuple[Dict[Tuple[int, int], str | None], float]:
+    grid = dict(grid)
+    crops: Dict[str, int] = {}
+    for (row, col), crop in grid.items():
+        if crop:
+            crops[crop] = crops.get(crop, 0) | (1 << (row * geometry.stride + col))
+    for cell, crop in sorted(grid.items(), key=lambda item: -weights.get(item[1], 1.0) if item[1] else 0.0):
+        if not crop:
+            continue
+        bit = 1 << (cell[0] * geometry.stride + cell[1])
+        crops[crop] &= ~bit
+        if eligible_spots(geometry, crops, rule) & spots == spots:
+            grid[cell] = None
+        else:
+            crops[crop] |= bit
+    cost = sum(weights.get(crop, 1.0) for crop in grid.values() if crop)
+    return grid, cost
+
+
+def optimized_layout_for(mutation: Mapping[str, Any]) -> LayoutPlan:
+    """Cached best single-plot layout for a compiled catalog entry; plots repeat it."""
+    return optimize_layout(adjacency_rule(mutation))
+
+
+@_computed_once
+def _layout_spread_risk(
+    plan: LayoutPlan,
+    rule: AdjacencyRule,
+    spawn_chance: float,
+    growth_stages: int,
+    spread_chance: float,
+) -> Dict[str, Any]:
+    return simulate_spread(
+        plan.grid,
+        plan.spots,
+        rule,
+        spawn_chance=spawn_chance,
+        growth_stages=growth_stages,
+        spread_chance=spread_chance,
+        trials=SPREAD_TRIALS,
+    )
+
+
+def _plan_from_grid(geometry: GardenGeometry, grid: Mapping[Tuple[int, int], str | None], rule: AdjacencyRule) -> LayoutPlan:
+    crops: Dict[str, int] = {}
+    for (row, col), crop in grid.items():
+        if crop:
+            crops[crop] = crops.get(crop, 0) | (1 << (row * geometry.stride + col))
+    spots = select_spots(geometry, eligible_spots(geometry, crops, rule), rule)
+    cells = [(row, col) for row in range(geometry.height) for col in range(geometry.width)]
+    return LayoutPlan(
+        grid=tuple(tuple(grid.get((row, col)) for col in range(geometry.width)) for row in range(geometry.height)),
+        spots=tuple(cell for cell in cells if spots >> (cell[0] * geometry.stride + cell[1]) & 1),
+        ingredients=tuple((crop, crops.get(crop, 0).bit_count()) for crop, _minimum in rule.required),
+        cost=float(sum(mask.bit_count() for mask in crops.values())),
+    )
+
+
+def isolation_layouts(mutation: Mapping[str, Any]) -> Dict[str, LayoutPlan]:
+    """Candidate single-plot layouts for a spreading mutation, by how much its spots share ring cells.
+
+    `searched` is the optimized layout, `shared_rings` the densest lattice where neighbouring spots
+    share ring cells (one eaten crop can stop several spots), and `private_rings` gives every spot
+    a ring of its own. Layouts that hold no spot are left out.
+    """
+    rule = adjacency_rule(mutation)
+    geometry = garden_geometry(1)
+    plans = {"searched": optimized_layout_for(mutation)}
+    for name, grid in (("shared_rings", _lattice_start(geometry, rule)), ("private_rings", _tiled_start(geometry, rule))):
+        if grid is not None:
+            plans[name] = _plan_from_grid(geometry, grid, rule)
+    return {name: plan for name, plan in plans.items() if plan.spots}
+
+
+def spread_risk_by_layout(mutation: Mapping[str, Any]) -> Dict[str, Dict[str, Any]] | None:
+    """Measured spread losses for one plot of a spreading mutation on each of its isolation layouts.
+
+    Seeded, so repeated calls (and workers) agree; cached per layout and mechanics. None when
+    the mutation does not spread, its recipe cannot be searched, or no layout holds it.
+    """
+    spread_chance = mutation.get("spread_chance", 0.0)
+    if spread_chance <= 0.0 or not mutation.get("layout_searchable"):
+        return None
+    rule = adjacency_rule(mutation)
+    measured = {
+        name: _layout_spread_risk(plan, rule, mutation.get("metric_spawn_chance", 0.25), mutation["growth_stages"], spread_chance)
+        for name, plan in isolation_layouts(mutation).items()
+    }
+    return measured if "searched" in measured else None
+
+
+def spread_risk_for(mutation: Mapping[str, Any]) -> Dict[str, Any] | None:
+    """Measured spread losses on the searched layout, the one the leaderboard's spot counts use."""
+    measured = spread_risk_by_layout(mutation)
+    return measured["searched"] if measured is not None else None
+
+
+def apply_optimized_layout(mutation: Dict[str, Any]) -> Dict[str, Any]:
+    """Catalog entry using the optimized layout's spots and ingredients when it beats the catalog's.
+
+    Better means more spots per plot, or as many spots from fewer planted cells. Entries whose
+    adjacency rule is not built from a placeable recipe are never searched.
+    """
+    if not mutation.get("layout_searchable"):
+        return mutation
+    plan = optimized_layout_for(mutation)
+    catalog_cells = sum(amount for _crop, amount in mutation["ingredients"])
+    optimized_cells = sum(amount for _crop, amount in plan.ingredients)
+    spots = len(plan.spots)
+    if spots < mutation["base_limit"] or (spots == mutation["base_limit"] and optimized_cells >= catalog_cells):
+        return mutation
+    return {
+        **mutation,
+        "base_limit": spots,
+        "ingredients": tuple((crop, amount) for crop, amount in plan.ingredients if amount > 0),
+    }
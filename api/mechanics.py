@@ -0,0 +1,156 @@
+from typing import Any, Callable, Dict, NamedTuple, Tuple
+
+try:
+    from api.harvest import calibrate_reset_chance, expected_multiplier_at_stage
+except ImportError:
+    from harvest import calibrate_reset_chance, expected_multiplier_at_stage
+
+DEFAULT_METRIC_SPAWN_CHANCE = 0.25
+LONELILY_METRIC_SPAWN_CHANCE = 0.0045
+DEFAULT_GROWTH_STAGES = 30
+# Assumed chance per cycle that a Devourer eats one given crop in its ring; tune as data comes in.
+DEVOURER_SPREAD_CHANCE = 0.01
+PLACEHOLDER_STAGE_CURVE_WARNING = "The optimized harvest stage for {name} uses a placeholder stage curve, not measured multipliers. Treat it as a rough estimate."
+MARKET_SPREAD_WARNING = "Market spreads are wide right now. Double check your buy and sell strategy before placing large orders."
+
+
+def flat_multiplier(stage: int) -> float:
+    return 1.0
+
+
+def linear_ramp(max_multiplier: float, stages: int) -> Callable[[int], float]:
+    """Multiplier that climbs evenly from 1x at spawn to `max_multiplier` at `stages`."""
+    def multiplier(stage: int) -> float:
+        progress = min(max(stage, 0), stages) / stages
+        return 1.0 + ((max_multiplier - 1.0) * progress)
+    return multiplier
+
+
+def geometric_ramp(max_multiplier: float, stages: int) -> Callable[[int], float]:
+    """Multiplier that grows by the same factor every stage, reaching `max_multiplier` at `stages`."""
+    def multiplier(stage: int) -> float:
+        return max_multiplier ** (min(max(stage, 0), stages) / stages)
+    return multiplier
+
+
+class MutationMechanics(NamedTuple):
+    """Special rules a mutation declares instead of being string-matched in the hot loop.
+
+    `stage_multiplier` is the raw harvest multiplier at a ramp index, and `reset_chance` the
+    per-stage chance that the ramp falls back to index 0. `expected_multiplier` turns (raw
+    multiplier at the harvest stage, harvest stage) into the multiplier the calculator uses.
+    `footprint` and `max_adjacent_crops` refine the garden adjacency rule (see api/garden.py), and
+    `spread_chance` is the per-cycle chance of eating each neighbouring crop.
+    `stage_curve_placeholder` marks a ramp shape that is assumed rather than measured; the
+    harvest-stage solver still runs on it, but the response flags its answer as an estimate.
+    Warning templates are formatted with the compiled catalog fields.
+    """
+    spawn_chance: float = DEFAULT_METRIC_SPAWN_CHANCE
+    growth_stages: int = DEFAULT_GROWTH_STAGES
+    stage_multiplier: Callable[[int], float] = flat_multiplier
+    reset_chance: float = 0.0
+    expected_multiplier: Callable[[float, int], float] | None = None
+    footprint: int = 1
+    max_adjacent_crops: int | None = None
+    spread_chance: float = 0.0
+    stage_curve_placeholder: bool = False
+    warnings: Tuple[str, ...] = ()
+
+
+DEFAULT_MECHANICS = MutationMechanics()
+
+ALOE_HARVEST_STAGE = 14
+# Placeholder shape: only the stage-14 average (9.37x) and the 60x cap are observed.
+ALOE_STAGE_MULTIPLIER = geometric_ramp(60.0, ALOE_HARVEST_STAGE)
+# Calibrated so that always harvesting at stage 14 averages the observed 9.37x.
+ALOE_RESET_CHANCE = calibrate_reset_chance(
+    [ALOE_STAGE_MULTIPLIER(stage) for stage in range(ALOE_HARVEST_STAGE + 1)],
+    ALOE_HARVEST_STAGE,
+    9.37,
+)
+
+
+def _reset_adjusted_multiplier(stage_multiplier: Callable[[int], float], reset_chance: float) -> Callable[[float, int], float]:
+    def expected(_raw_multiplier: float, stages: int) -> float:
+        return expected_multiplier_at_stage([stage_multiplier(stage) for stage in range(stages + 1)], reset_chance, stages)
+    return expected
+
+
+MUTATION_MECHANICS: Dict[str, MutationMechanics] = {
+    "Lonelily": MutationMechanics(spawn_chance=LONELILY_METRIC_SPAWN_CHANCE, max_adjacent_crops=0),
+    "Devourer": MutationMechanics(
+        spread_chance=DEVOURER_SPREAD_CHANCE,
+        warnings=("Devourer can spread into nearby crops and destroy them if you do not isolate it.",),
+    ),
+    # A 2x2 mutation: its 12-cell ring must hold all 12 ingredient crops.
+    "Godseed": MutationMechanics(footprint=2),
+    "Magic Jellybean": MutationMechanics(
+        growth_stages=120,
+        # Placeholder shape: the per-stage Jellybean multipliers have not been measured.
+        stage_multiplier=linear_ramp(10.0, 120),
+        stage_curve_placeholder=True,
+        warnings=(
+            "Magic Jellybean has {growth_stages} growth stages. It is best to harvest when its fully grown so you waste less time waiting for spawns.",
+        ),
+    ),
+    "All-in Aloe": MutationMechanics(
+        growth_stages=ALOE_HARVEST_STAGE,
+        stage_multiplier=ALOE_STAGE_MULTIPLIER,
+        reset_chance=ALOE_RESET_CHANCE,
+        expected_multiplier=_reset_adjusted_multiplier(ALOE_STAGE_MULTIPLIER, ALOE_RESET_CHANCE),
+        stage_curve_placeholder=True,
+        warnings=(
+            "All-in Aloe is evaluated at Stage {growth_stages}. Its raw multiplier there is {special_multiplier:g}x, but the calculator uses the reset-adjusted expected multiplier of {effective_special_multiplier:g}x.",
+        ),
+    ),
+}
+
+
+def register_mechanics(mutation_name: str, mechanics: MutationMechanics) -> None:
+    """Declare (or replace) a mutation's mechanics; takes effect on the next catalog compile."""
+    MUTATION_MECHANICS[mutation_name] = mechanics
+
+
+def mechanics_for(mutation_name: str) -> MutationMechanics:
+    return MUTATION_MECHANICS.get(mutation_name, DEFAULT_MECHANICS)
+
+
+def compile_mechanics(
+    mutation_name: str,
+    mutation_data: Dict[str, Any],
+    parse_float: Callable[[Any, float], float],
+    parse_count: Callable[[Any, int], int],
+) -> Dict[str, Any]:
+    """Resolve a mutation's mechanics against its JSON entry into flat catalog fields.
+
+    Explicit JSON values win over the declared mechanics, so balance patches stay data-only.
+    """
+    mechanics = mechanics_for(mutation_name)
+    growth_stages = parse_count(mutation_data.get("growth_stages", mechanics.growth_stages), DEFAULT_GROWTH_STAGES)
+    raw_multiplier = mechanics.stage_multiplier(growth_stages)
+    special_multiplier = parse_float(mutation_data.get("special_multiplier", raw_multiplier), raw_multiplier)
+    if mechanics.expected_multiplier is not None:
+        expected_multiplier = mechanics.expected_multiplier(special_multiplier, growth_stages)
+    else:
+        expected_multiplier = special_multiplier
+    effective_special_multiplier = parse_float(
+        mutation_data.get("effective_special_multiplier", expected_multiplier),
+        expected_multiplier,
+    )
+    stage_multipliers = tuple(mechanics.stage_multiplier(stage) for stage in range(growth_stages + 1))
+    fields = {
+        "growth_stages": growth_stages,
+        "special_multiplier": special_multiplier,
+        "effective_special_multiplier": effective_special_multiplier,
+        "metric_spawn_chance": mechanics.spawn_chance,
+        "stage_multipliers": stage_multipliers,
+        "reset_chance": mechanics.reset_chance,
+        # Only ramping multipliers give the harvest-stage solver something to trade off.
+        "harvest_stage_tunable": len(set(stage_multipliers)) > 1,
+        "stage_curve_placeholder": mechanics.stage_curve_placeholder,
+        "footprint": mechanics.footprint,
+        "max_adjacent_crops": mechanics.max_adjacent_crops,
+        "spread_chance": mechanics.spread_chance,
+    }
+    fields["warning_messages"] = tuple(template.format(**fields) for template in mechanics.warnings)
+    return fields
@@ -0,0 +1,90 @@
+from typing import List, NamedTuple, Sequence
+
+PIVOT_EPSILON = 1e-9
+MAX_SIMPLEX_ITERATIONS = 20_000
+
+
+class LinearProgramResult(NamedTuple):
+    status: str  # "optimal", "unbounded" or "iteration_limit"
+    objective: float
+    x: List[float]
+    duals: List[float]
+
+
+def maximize_linear_program(
+    c: Sequence[float],
+    a_ub: Sequence[Sequence[float]],
+    b_ub: Sequence[float],
+) -> LinearProgramResult:
+    """Maximize c.x subject to A x <= b and x >= 0 with a dense tableau simplex.
+
+    Every b must be non-negative so the origin is a feasible starting basis; that covers
+    both the dual of a covering problem and the production-balance models used here.
+    Bland's rule keeps degenerate problems from cycling. `duals` are the shadow prices
+    of the A x <= b rows, which for a covering dual are the primal variables.
+    """
+    row_count = len(a_ub)
+    column_count = len(c)
+    if len(b_ub) != row_count:
+        raise ValueError("a_ub and b_ub must have the same number of rows")
+    if any(value < 0 for value in b_ub):
+        raise ValueError("b_ub must be non-negative")
+
+    tableau: List[List[float]] = []
+    for row_index, row in enumerate(a_ub):
+        if len(row) != column_count:
+            raise ValueError("every a_ub row must have one coefficient per variable")
+        slack = [0.0] * row_count
+        slack[row_index] = 1.0
+        tableau.append([float(value) for value in row] + slack + [float(b_ub[row_index])])
+    objective_row = [-float(value) for value in c] + [0.0] * row_count + [0.0]
+    basis = [column_count + row_index for row_index in range(row_count)]
+    total_columns = column_count + row_count
+
+    status = "iteration_limit"
+    for _ in range(MAX_SIMPLEX_ITERATIONS):
+        entering = next((j for j in range(total_columns) if objective_row[j] < -PIVOT_EPSILON), None)
+        if entering is None:
+            status = "optimal"
+            break
+
+        leaving = None
+        best_ratio = 0.0
+        for row_index, row in enumerate(tableau):
+            coefficient = row[entering]
+            if coefficient <= PIVOT_EPSILON:
+                continue
+            ratio = row[-1] / coefficient
+            if (
+                leaving is None
+                or ratio < best_ratio - PIVOT_EPSILON
+                or (abs(ratio - best_ratio) <= PIVOT_EPSILON and basis[row_index] < basis[leaving])
+            ):
+                leaving = row_index
+                best_ratio = ratio
+        if leaving is None:
+            status = "unbounded"
+            break
+
+        pivot_row = tableau[leaving]
+        pivot = pivot_row[entering]
+        for j in range(total_columns + 1):
+            pivot_row[j] /= pivot
+        for row_index, row in enumerate(tableau):
+            if row_index == leaving:
+                continue
+            factor = row[entering]
+            if factor != 0.0:
+                for j in range(total_columns + 1):
+                    row[j] -= factor * pivot_row[j]
+        factor = objective_row[entering]
+        for j in range(total_columns + 1):
+            objective_row[j] -= factor * pivot_row[j]
+        basis[leaving] = entering
+
+    x = [0.0] * column_count
+    for row_index, basic_column in enumerate(basis):
+        if basic_column < column_count:
+            x[basic_column] = tableau[row_index][-1]
+    duals = objective_row[column_count:total_columns]
+    return LinearProgramResult(status, objective_row[-1], x, duals)
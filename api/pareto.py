@@ -0,0 +1,85 @@
+from bisect import bisect_left
+from itertools import groupby
+from typing import List, Mapping, Sequence
+
+
+def _dominates(a: Sequence[float], b: Sequence[float]) -> bool:
+    return all(x >= y for x, y in zip(a, b)) and any(x > y for x, y in zip(a, b))
+
+
+def _front_2d(points: Mapping[int, Sequence[float]] | Sequence[Sequence[float]], order: List[int]) -> List[int]:
+    """Sweep by x descending: a point survives if its y beats every point with a larger x."""
+    front: List[int] = []
+    best_y = None  # not -inf: a first group whose best y is -inf still survives
+    for _x, group in groupby(order, key=lambda index: points[index][0]):
+        group = list(group)
+        top_y = max(points[index][1] for index in group)
+        if best_y is None or top_y > best_y:
+            front.extend(index for index in group if points[index][1] == top_y)
+            best_y = top_y
+    return front
+
+
+def _front_3d(points: Sequence[Sequence[float]], order: List[int]) -> List[int]:
+    """Sweep by x descending over a (y, z) staircase of everything with a larger x.
+
+    The staircase keeps y ascending with z descending, so the best z among points at or above
+    a given y is the first entry at that y, found by binary search. Each point enters and
+    leaves the staircase at most once, but entries live in plain lists, so an insert also
+    shifts the tail: O(n log n) comparisons plus O(n^2) element moves in the worst case, which
+    are memmoves and negligible at leaderboard sizes.
+    """
+    stair_y: List[float] = []
+    stair_z: List[float] = []
+    front: List[int] = []
+    for _x, group in groupby(order, key=lambda index: points[index][0]):
+        group = list(group)
+        # Points sharing this x only dominate each other through (y, z).
+        for index in _front_2d({index: points[index][1:] for index in group}, group):
+            _x, y, z = points[index]
+            position = bisect_left(stair_y, y)
+            # Kept unless a point with a larger x is at least as good on y and z.
+            if position >= len(stair_y) or stair_z[position] < z:
+                front.append(index)
+        for index in group:
+            _x, y, z = points[index]
+            position = bisect_left(stair_y, y)
+            if position < len(stair_y) and stair_z[position] >= z:
+                continue
+            # Drop the entries this one covers: lower or equal y with lower or equal z, just left of it.
+            start = position
+            while start > 0 and stair_z[start - 1] <= z:
+                start -= 1
+            end = position + 1 if position < len(stair_y) and stair_y[position] == y else position
+            stair_y[start:end] = [y]
+            stair_z[start:end] = [z]
+    return front
+
+
+def pareto_front(points: Sequence[Sequence[float]]) -> List[int]:
+    """Indices of the non-dominated points, every coordinate maximized, in input order.
+
+    A point is dominated when another is at least as good everywhere and better somewhere;
+    exact duplicates keep each other. Any float works, including -inf, which ties like any
+    other value. One and two metrics take a sort and a sweep, O(n log n); three use a
+    binary-searched staircase (see `_front_3d`). Four or more fall back to sort-filter-skyline
+    in descending lexicographic order: a dominating point always sorts first, so only
+    already-kept points can dominate the next one, even when sums would tie at -inf.
+    """
+    if not points:
+        return []
+    dimensions = len(points[0])
+    order = sorted(range(len(points)), key=lambda index: tuple(-value for value in points[index]))
+    if dimensions == 1:
+        best = points[order[0]][0]
+        front = [index for index in order if points[index][0] == best]
+    elif dimensions == 2:
+        front = _front_2d(points, order)
+    elif dimensions == 3:
+        front = _front_3d(points, order)
+    else:
+        front = []
+        for index in order:
+            if not any(_dominates(points[kept], points[index]) for kept in front):
+                front.append(index)
+    return sorted(front)
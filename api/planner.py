@@ -0,0 +1,239 @@
+import math
+from typing import Any, Dict, List, Sequence
+
+try:
+    from api.optimize import maximize_linear_program
+except ImportError:
+    from optimize import maximize_linear_program
+
+PLAN_EPSILON = 1e-9
+
+
+def _covers(batches: Sequence[int], options: Sequence[Dict[str, Any]], requirements: Dict[str, float]) -> bool:
+    for crop, need in requirements.items():
+        produced = sum(count * option["yields"].get(crop, 0.0) for count, option in zip(batches, options))
+        if produced + PLAN_EPSILON < need:
+            return False
+    return True
+
+
+def _greedy_cover(
+    options: Sequence[Dict[str, Any]],
+    requirements: Dict[str, float],
+    batches: Sequence[int] | None = None,
+) -> List[int]:
+    """Complete a partial cover by repeatedly adding the batch with the most normalized progress per hour.
+
+    Batches go in bulk: the winner keeps the same progress per batch until one of its crops
+    needs less than a full batch, and every other option's progress can only fall meanwhile,
+    so taking floor(need / yield) of it at once picks the same batches as one at a time.
+    """
+    batches = list(batches) if batches is not None else [0] * len(options)
+    remaining = {
+        crop: max(0.0, need - sum(count * option["yields"].get(crop, 0.0) for count, option in zip(batches, options)))
+        for crop, need in requirements.items()
+    }
+    while any(need > PLAN_EPSILON for need in remaining.values()):
+        best_index = None
+        best_rate = 0.0
+        for index, option in enumerate(options):
+            progress = sum(
+                min(need, option["yields"].get(crop, 0.0)) / requirements[crop]
+                for crop, need in remaining.items()
+                if need > PLAN_EPSILON
+            )
+            rate = progress / option["hours"]
+            if rate > best_rate:
+                best_index = index
+                best_rate = rate
+        if best_index is None:
+            break
+        yields = options[best_index]["yields"]
+        steps = max(1, min(
+            math.floor(need / yields[crop])
+            for crop, need in remaining.items()
+            if need > PLAN_EPSILON and yields.get(crop, 0.0) > 0
+        ))
+        batches[best_index] += steps
+        for crop in remaining:
+            remaining[crop] = max(0.0, remaining[crop] - steps * yields.get(crop, 0.0))
+    return batches
+
+
+def _prune(batches: List[int], options: Sequence[Dict[str, Any]], requirements: Dict[str, float]) -> List[int]:
+    """Drop whole batches that the rest of the plan already covers, longest first.
+
+    Coverage only grows with a count, so each count's smallest covering value is binary searched.
+    """
+    for index in sorted(range(len(options)), key=lambda i: options[i]["hours"], reverse=True):
+        low, high = 0, batches[index]
+        while low < high:
+            batches[index] = (low + high) // 2
+            if _covers(batches, options, requirements):
+                high = batches[index]
+            else:
+                low = batches[index] + 1
+        batches[index] = high
+    return batches
+
+
+def plan_milestones(options: Sequence[Dict[str, Any]], requirements: Dict[str, float]) -> Dict[str, Any]:
+    """Schedule whole mutation batches that reach every remaining crop requirement in the fewest hours.
+
+    `options` are {"name", "hours", "yields": {crop: amount per batch}} and `requirements`
+    maps crop to the amount still missing. This is a covering program
+    (min sum(hours * batches) s.t. produced >= required); its LP relaxation is solved
+    through the dual with the simplex, rounded to whole batches, and pruned.
+    """
+    requirements = {crop: float(need) for crop, need in requirements.items() if need > 0}
+    if not requirements:
+        return {
+            "status": "nothing_missing",
+            "total_hours": 0.0,
+            "total_batches": 0,
+            "lower_bound_hours": 0.0,
+            "schedule": [],
+            "coverage": {},
+            "uncoverable_crops": [],
+        }
+
+    usable = [
+        option for option in options
+        if option.get("hours") and option["hours"] > 0
+        and any(option["yields"].get(crop, 0.0) > 0 for crop in requirements)
+    ]
+    uncoverable = sorted(
+        crop for crop in requirements
+        if not any(option["yields"].get(crop, 0.0) > 0 for option in usable)
+    )
+    coverable = {crop: need for crop, need in requirements.items() if crop not in uncoverable}
+    crops = list(coverable)
+
+    batches = [0] * len(usable)
+    lower_bound_hours = 0.0
+    if crops and usable:
+        # Dual of the covering LP, with each requirement normalized to 1 for conditioning.
+        result = maximize_linear_program(
+            [1.0] * len(crops),
+            [[option["yields"].get(crop, 0.0) / coverable[crop] for crop in crops] for option in usable],
+            [option["hours"] for option in usable],
+        )
+        candidates = [_greedy_cover(usable, coverable)]
+        if result.status == "optimal":
+            lower_bound_hours = result.objective
+            relaxed = result.duals
+            # Round the LP both ways: everything up, or the whole part plus a greedy top-up.
+            candidates.append([math.ceil(value - PLAN_EPSILON) if value > PLAN_EPSILON else 0 for value in relaxed])
+            candidates.append(_greedy_cover(usable, coverable, [math.floor(value + PLAN_EPSILON) for value in relaxed]))
+        feasible = [
+            _prune(candidate, usable, coverable)
+            for candidate in candidates
+            if _covers(candidate, usable, coverable)
+        ]
+        batches = min(
+            feasible,
+            key=lambda plan: sum(count * option["hours"] for count, option in zip(plan, usable)),
+        )
+
+    def progress_per_hour(index: int) -> float:
+        option = usable[index]
+        return sum(option["yields"].get(crop, 0.0) / coverable[crop] for crop in crops) / option["hours"]
+
+    schedule: List[Dict[str, Any]] = []
+    elapsed_hours = 0.0
+    # Most efficient batches first so milestones start landing as early as possible.
+    for index in sorted((i for i, count in enumerate(batches) if count > 0), key=progress_per_hour, reverse=True):
+        option = usable[index]
+        hours = option["hours"] * batches[index]
+        schedule.append({
+            "mutationName": option["name"],
+            "batches": batches[index],
+            "hours_per_batch": option["hours"],
+            "hours": hours,
+            "start_hours": elapsed_hours,
+            "end_hours": elapsed_hours + hours,
+            "crop_amounts": {
+                crop: option["yields"][crop] * batches[index]
+                for crop in crops
+                if option["yields"].get(crop, 0.0) > 0
+            },
+        })
+        elapsed_hours += hours
+
+    coverage = {
+        crop: {
+            "required": need,
+            "planned": sum(count * option["yields"].get(crop, 0.0) for count, option in zip(batches, usable)),
+        }
+        for crop, need in requirements.items()
+    }
+    return {
+        "status": "partial" if uncoverable else "complete",
+        "total_hours": elapsed_hours,
+        "total_batches": sum(batches),
+        "lower_bound_hours": lower_bound_hours,
+        "schedule": schedule,
+        "coverage": coverage,
+        "uncoverable_crops": uncoverable,
+    }
+
+
+def plan_target_quantity(
+    names: Sequence[str],
+    amounts_per_batch: Sequence[float],
+    hours_per_batch: Sequence[float | None],
+    target_quantity: float,
+) -> Dict[str, Any]:
+    """Batches and expected hours for every mutation to farm `target_quantity` of one crop.
+
+    Inputs are parallel arrays over the catalog. Besides the per-mutation answer this
+    also checks one mixed allocation: whole batches of the fastest producer, with the
+    leftover finished by whichever mutation covers it in the fewest hours.
+    """
+    batches: List[int | None] = []
+    hours_to_target: List[float | None] = []
+    for amount, hours in zip(amounts_per_batch, hours_per_batch):
+        if target_quantity <= 0 or amount <= 0 or not hours or hours <= 0:
+            batches.append(None)
+            hours_to_target.append(None)
+            continue
+        needed = math.ceil((target_quantity / amount) - PLAN_EPSILON)
+        batches.append(needed)
+        hours_to_target.append(needed * hours)
+
+    candidates = [index for index, hours in enumerate(hours_to_target) if hours is not None]
+    if not candidates:
+        return {"batches": batches, "hours_to_target": hours_to_target, "best": None, "mixed": None}
+
+    best_single = min(candidates, key=lambda index: hours_to_target[index])
+    fastest = max(candidates, key=lambda index: amounts_per_batch[index] / hours_per_batch[index])
+    base_batches = math.floor((target_quantity / amounts_per_batch[fastest]) + PLAN_EPSILON)
+    leftover = target_quantity - (base_batches * amounts_per_batch[fastest])
+
+    mixed = None
+    if base_batches > 0 and leftover > PLAN_EPSILON:
+        finisher = min(
+            candidates,
+            key=lambda index: math.ceil((leftover / amounts_per_batch[index]) - PLAN_EPSILON) * hours_per_batch[index],
+        )
+        finisher_batches = math.ceil((leftover / amounts_per_batch[finisher]) - PLAN_EPSILON)
+        mixed_hours = (base_batches * hours_per_batch[fastest]) + (finisher_batches * hours_per_batch[finisher])
+        if mixed_hours < hours_to_target[best_single] - PLAN_EPSILON:
+            mixed = {
+                "allocation": [
+                    {"mutationName": names[fastest], "batches": base_batches},
+                    {"mutationName": names[finisher], "batches": finisher_batches},
+                ],
+                "expected_hours": mixed_hours,
+            }
+
+    return {
+        "batches": batches,
+        "hours_to_target": hours_to_target,
+        "best": {
+            "mutationName": names[best_single],
+            "batches": batches[best_single],
+            "expected_hours": hours_to_target[best_single],
+        },
+        "mixed": mixed,
+    }
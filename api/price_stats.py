@@ -0,0 +1,146 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Tuple
+
+# Snapshots kept per item; at the default 30 s refresh this is the last hour of prices.
+PRICE_STATS_WINDOW = 120
+SECONDS_PER_HOUR = 3600.0
+
+
+class RollingPriceStats:
+    """Windowed mean, variance and drawdown of one item's mid price, O(1) amortized per update.
+
+    A ring buffer holds the last `window` prices and log returns with running sums, so adding
+    one sample and dropping the oldest is constant time. A monotonic deque of (sequence, price)
+    keeps the window's peak for the drawdown.
+    """
+
+    def __init__(self, window: int = PRICE_STATS_WINDOW) -> None:
+        self.window = max(2, window)
+        self.prices: Deque[float] = deque()
+        self.returns: Deque[float] = deque()
+        self.times: Deque[float] = deque()
+        self.price_sum = 0.0
+        self.price_square_sum = 0.0
+        self.return_sum = 0.0
+        self.return_square_sum = 0.0
+        self.peaks: Deque[Tuple[int, float]] = deque()
+        self.sequence = 0
+
+    def update(self, price: float, observed_at: float) -> None:
+        if self.prices and self.prices[-1] > 0 and price > 0:
+            log_return = math.log(price / self.prices[-1])
+            self.returns.append(log_return)
+            self.return_sum += log_return
+            self.return_square_sum += log_return * log_return
+            if len(self.returns) >= self.window:
+                dropped = self.returns.popleft()
+                self.return_sum -= dropped
+                self.return_square_sum -= dropped * dropped
+
+        self.prices.append(price)
+        self.times.append(observed_at)
+        self.price_sum += price
+        self.price_square_sum += price * price
+        if len(self.prices) > self.window:
+            dropped = self.prices.popleft()
+            self.times.popleft()
+            self.price_sum -= dropped
+            self.price_square_sum -= dropped * dropped
+
+        while self.peaks and self.peaks[-1][1] <= price:
+            self.peaks.pop()
+        self.peaks.append((self.sequence, price))
+        while self.peaks[0][0] <= self.sequence - self.window:
+            self.peaks.popleft()
+        self.sequence += 1
+
+    def summary(self) -> Dict[str, Any]:
+        samples = len(self.prices)
+        mean = self.price_sum / samples
+        variance = max(0.0, (self.price_square_sum / samples) - (mean * mean))
+        hourly_volatility = None
+        if len(self.returns) >= 2 and self.times[-1] > self.times[0]:
+            return_mean = self.return_sum / len(self.returns)
+            return_variance = max(0.0, (self.return_square_sum / len(self.returns)) - (return_mean * return_mean))
+            step_hours = (self.times[-1] - self.times[0]) / (samples - 1) / SECONDS_PER_HOUR
+            # Random-walk scaling: per-snapshot return variance spread over the snapshot interval.
+            hourly_volatility = math.sqrt(return_variance / step_hours)
+        peak = self.peaks[0][1]
+        return {
+            "samples": samples,
+            "mean": mean,
+            "std": math.sqrt(variance),
+            "hourly_volatility": hourly_volatility,
+            "drawdown": (1.0 - (self.prices[-1] / peak)) if peak > 0 else 0.0,
+        }
+
+
+def mid_prices(bazaar_data: Dict[str, Any]) -> Dict[str, float]:
+    """Mid of the positive quotes per item; items without any quote are left out."""
+    mids: Dict[str, float] = {}
+    for item, market in bazaar_data.items():
+        if not isinstance(market, dict):
+            continue
+        quotes = [price for price in (float(market.get("buyPrice") or 0.0), float(market.get("sellPrice") or 0.0)) if price > 0]
+        if quotes:
+            mids[item] = sum(quotes) / len(quotes)
+    return mids
+
+
+class PriceHistory:
+    """Rolling stats for every item, fed one Bazaar snapshot version at a time.
+
+    Each worker keeps its own copy, but the series is shared: installed versions record their
+    mid prices in the cache backend, and a worker about to install catches up on the versions
+    others installed first (`catch_up`). The summaries travel inside the snapshot (`priceStats`
+    on each market), so they cover the same series whichever worker fetched it.
+    """
+
+    def __init__(self, window: int = PRICE_STATS_WINDOW) -> None:
+        self.window = window
+        self.version = 0  # last snapshot version folded in
+        self._stats: Dict[str, RollingPriceStats] = {}
+        self._lock = threading.Lock()
+
+    def _update(self, mids: Dict[str, float], observed_at: float) -> None:
+        for item, price in mids.items():
+            stats = self._stats.get(item)
+            if stats is None:
+                stats = self._stats[item] = RollingPriceStats(self.window)
+            stats.update(price, observed_at)
+
+    def catch_up(self, samples: Iterable[Tuple[int, float, Dict[str, float]]]) -> None:
+        """Fold in recorded (version, observed_at, mids) samples newer than this copy, oldest first."""
+        with self._lock:
+            for version, observed_at, mids in samples:
+                if version <= self.version:
+                    continue
+                if version != self.version + 1:
+                    # Returns must not span a gap, so a copy that fell behind starts over.
+                    self._stats = {}
+                self._update(mids, observed_at)
+                self.version = version
+
+    def observe(
+        self,
+        bazaar_data: Dict[str, Any],
+        observed_at: float | None = None,
+        *,
+        version: int | None = None,
+    ) -> Dict[str, Any]:
+        """Record each item's mid price and return a copy of `bazaar_data` with `priceStats` attached."""
+        observed_at = time.time() if observed_at is None else observed_at
+        mids = mid_prices(bazaar_data)
+        version = self.version + 1 if version is None else version
+        with self._lock:
+            if version != self.version + 1:
+                self._stats = {}
+            self._update(mids, observed_at)
+            self.version = version
+            return {
+                item: {**market, "priceStats": self._stats[item].summary()} if item in mids else market
+                for item, market in bazaar_data.items()
+            }
@@ -0,0 +1,168 @@
+import threading
+import time
+from collections import deque
+from statistics import median
+from typing import Any, Deque, Dict, List, Mapping, Tuple
+
+try:
+    from api.cache_backend import MemoryCacheBackend
+except ImportError:
+    from cache_backend import MemoryCacheBackend
+
+HOUR_OF_WEEK_BUCKETS = 168
+# Hourly means kept per hour-of-week bucket, one per week observed.
+SEASONALITY_WEEKS = 8
+SECONDS_PER_HOUR = 3600
+# Readers pick up hours other workers finished at most this often; the installer syncs on every snapshot.
+SEASONALITY_SYNC_SECONDS = 30.0
+PRICE_FIELDS = ("buyPrice", "sellPrice")
+WEEKDAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def hour_of_week(timestamp: float) -> int:
+    """0 for Monday 00:00-01:00 UTC through 167 for Sunday 23:00-24:00 UTC."""
+    moment = time.gmtime(timestamp)
+    return (moment.tm_wday * 24) + moment.tm_hour
+
+
+def hour_of_week_label(bucket: int) -> str:
+    return f"{WEEKDAY_NAMES[bucket // 24]} {bucket % 24:02d}:00 UTC"
+
+
+class _ItemSeasonality:
+    """One item's hour-of-week buckets of finished hourly means, newest SEASONALITY_WEEKS kept."""
+
+    def __init__(self) -> None:
+        self.buckets: List[Deque[Tuple[float, float, float]]] = [deque(maxlen=SEASONALITY_WEEKS) for _ in range(HOUR_OF_WEEK_BUCKETS)]
+        self.factors: Dict[str, Dict[int, float]] = {}
+
+    def add(self, hour: int, sample: Tuple[float, float, float]) -> None:
+        self.buckets[hour_of_week(hour * SECONDS_PER_HOUR)].append(sample)
+        self.factors = {}
+
+    def profile(self) -> List[Dict[str, Any] | None]:
+        hours: List[Dict[str, Any] | None] = []
+        for bucket in self.buckets:
+            if not bucket:
+                hours.append(None)
+                continue
+            buy_price = median(sample[0] for sample in bucket)
+            sell_price = median(sample[1] for sample in bucket)
+            hours.append({
+                "buyPrice": buy_price,
+                "sellPrice": sell_price,
+                "spread": buy_price - sell_price,
+                "volume": median(sample[2] for sample in bucket),
+                "weeks": len(bucket),
+            })
+        return hours
+
+    def price_factors(self, field: str) -> Dict[int, float]:
+        """Median `field` per observed bucket relative to the median across those buckets."""
+        if field not in self.factors:
+            medians = {
+                position: median(sample[PRICE_FIELDS.index(field)] for sample in bucket)
+                for position, bucket in enumerate(self.buckets)
+                if bucket
+            }
+            typical = median(medians.values()) if medians else 0.0
+            self.factors[field] = {position: value / typical for position, value in medians.items()} if typical > 0 else {}
+        return self.factors[field]
+
+
+class SeasonalityIndex:
+    """Hour-of-week median price, spread and resting volume per item, fed one snapshot at a time.
+
+    Each snapshot costs O(1) per item: it adds to the current clock hour's running sums, and a
+    finished hour becomes one sample in its bucket. Both live in the cache backend (SQLite under
+    CACHE_BACKEND=shared), so every worker reads the same index and it survives restarts; each
+    worker folds the finished hours into its own buckets by row id. Buckets keep the last
+    SEASONALITY_WEEKS weeks, so the index stays compact however long it runs.
+    """
+
+    def __init__(self, backend: Any = None) -> None:
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self._items: Dict[str, _ItemSeasonality] = {}
+        self._synced_id = 0
+        self._synced_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def _sync(self, *, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._synced_at < SEASONALITY_SYNC_SECONDS:
+            return
+        self._synced_at = now
+        for row_id, item, hour, buy_price, sell_price, volume in self.backend.hourly_samples_after(self._synced_id):
+            seasonality = self._items.get(item)
+            if seasonality is None:
+                seasonality = self._items[item] = _ItemSeasonality()
+            seasonality.add(hour, (buy_price, sell_price, volume))
+            self._synced_id = row_id
+
+    def observe(self, bazaar_data: Mapping[str, Any], observed_at: float | None = None) -> None:
+        observed_at = time.time() if observed_at is None else observed_at
+        observations: Dict[str, Tuple[float, float, float]] = {}
+        for item, market in bazaar_data.items():
+            if not isinstance(market, dict):
+                continue
+            buy_price = float(market.get("buyPrice") or 0.0)
+            sell_price = float(market.get("sellPrice") or 0.0)
+            if buy_price <= 0 or sell_price <= 0:
+                continue
+            volume = float(market.get("buyVolume") or 0.0) + float(market.get("sellVolume") or 0.0)
+            observations[item] = (buy_price, sell_price, volume)
+        with self._lock:
+            self.backend.accumulate_seasonality(
+                int(observed_at // SECONDS_PER_HOUR),
+                observations,
+                keep_hours=SEASONALITY_WEEKS * HOUR_OF_WEEK_BUCKETS,
+            )
+            self._sync(force=True)
+            for item in observations:
+                if item not in self._items:
+                    self._items[item] = _ItemSeasonality()
+
+    def profile(self, item: str) -> List[Dict[str, Any] | None] | None:
+        """168 hour-of-week entries for `item` (None where no full hour was seen), or None if unknown."""
+        with self._lock:
+            self._sync()
+            seasonality = self._items.get(item)
+            return seasonality.profile() if seasonality is not None else None
+
+    def best_window(
+        self,
+        values_by_item: Mapping[str, float],
+        field: str,
+        *,
+        buying: bool,
+        now: float | None = None,
+    ) -> Dict[str, Any] | None:
+        """Hour of week that minimizes (buying) or maximizes (selling) the total of `values_by_item` at seasonal prices.
+
+        `values_by_item` are current totals at the `field` price; only buckets seen for every
+        item count. Each item's factors are taken relative to the current hour-of-week bucket
+        (the typical hour where that bucket has no sample yet), so `change` is how much the total
+        moves from now to the chosen hour, and 0 when now is already the best hour.
+        """
+        current = hour_of_week(time.time() if now is None else now)
+        with self._lock:
+            self._sync()
+            factors = []
+            for item, value in values_by_item.items():
+                seasonality = self._items.get(item)
+                item_factors = seasonality.price_factors(field) if seasonality is not None else {}
+                if not item_factors:
+                    return None
+                factors.append((value / item_factors.get(current, 1.0), item_factors))
+        if not factors:
+            return None
+        shared = set.intersection(*(set(item_factors) for _value, item_factors in factors))
+        if not shared:
+            return None
+        totals = {position: sum(value * item_factors[position] for value, item_factors in factors) for position in shared}
+        best = (min if buying else max)(sorted(totals), key=totals.get)
+        return {
+            "hour_of_week": best,
+            "label": hour_of_week_label(best),
+            "change": totals[best] - sum(value for value in values_by_item.values()),
+        }
@@ -1,5 +1,10 @@
+import os
+
 import requests
 
+# Overridable so load tests can point the API at a local Bazaar stand-in.
+BAZAAR_API_URL = os.getenv("BAZAAR_API_URL", "").strip() or "https://api.hypixel.net/v2/skyblock/bazaar"
+
 MUSHROOM_KEY = 'Mushroom'
 
 MUTATION_IDS = {'All-in Aloe': 'ALL_IN_ALOE', 'Ashwreath': 'ASHWREATH', 'Blastberry': 'BLASTBERRY', 'Cheesebite': 'CHEESEBITE', 'Chloronite': 'CHLORONITE', 'Chocoberry': 'CHOCOBERRY', 'Choconut': 'CHOCONUT', 'Chorus Fruit': 'CHORUS_FRUIT', 'Cindershade': 'CINDERSHADE', 'Coalroot': 'COALROOT', 'Creambloom': 'CREAMBLOOM', 'Devourer': 'DEVOURER', 'Do-not-eat-shroom': 'DO_NOT_EAT_SHROOM', 'Duskbloom': 'DUSKBLOOM', 'Dustgrain': 'DUSTGRAIN', 'Fleshtrap': 'FLESHTRAP', 'Glasscorn': 'GLASSCORN', 'Gloomgourd': 'GLOOMGOURD', 'Godseed': 'GODSEED', 'Jerryflower': 'JERRYFLOWER', 'Lonelily': 'LONELILY', 'Magic Jellybean': 'MAGIC_JELLYBEAN', 'Noctilume': 'NOCTILUME', 'Phantomleaf': 'PHANTOMLEAF', 'Plant Boy Advance': 'PLANTBOY_ADVANCE', 'Puffercloud': 'PUFFERCLOUD', 'Scourroot': 'SCOURROOT', 'Shadevine': 'SHADEVINE', 'Shellfruit': 'SHELLFRUIT', 'Snoozling': 'SNOOZLING', 'Soggybud': 'SOGGYBUD', 'Startlevine': 'STARTLEVINE', 'Stoplight Petal': 'STOPLIGHT_PETAL', 'Thornshade': 'THORNSHADE', 'Thunderling': 'THUNDERLING', 'Timestalk': 'TIMESTALK', 'Turtellini': 'TURTELLINI', 'Veilshroom': 'VEILSHROOM', 'Witherbloom': 'WITHERBLOOM', 'Zombud': 'ZOMBUD', 'Fermento': 'FERMENTO', 'Dead Bush': 'DEAD_BUSH', 'Fire': 'FIRE'}
@@ -60,10 +65,22 @@ Phantomleaf,0.0,3500.0,3000.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0
 Timestalk,0.0,0.0,0.0,0.0,3600.0,0.0,2700.0,0.0,0.0,0.0,0.0,0.0,0.0,0.0
 """
 
+def _compact_depth(levels):
+    depth = []
+    for level in levels or []:
+        try:
+            price = float(level.get("pricePerUnit", 0))
+            amount = float(level.get("amount", 0))
+        except (AttributeError, TypeError, ValueError):
+            continue
+        if price > 0 and amount > 0:
+            depth.append([price, amount])
+    return depth
+
+
 def get_bazaar_prices():
     try:
-        url = "https://api.hypixel.net/v2/skyblock/bazaar"
-        response = requests.get(url, timeout=5)
+        response = requests.get(BAZAAR_API_URL, timeout=5)
         if response.status_code == 200:
             data = response.json()
             if data.get('success'):
@@ -75,7 +92,14 @@ def get_bazaar_prices():
                         if qs:
                             prices[name] = {
                                 "buyPrice": qs.get("buyPrice", 0), 
-                                "sellPrice": qs.get("sellPrice", 0) 
+                                "sellPrice": qs.get("sellPrice", 0),
+                                "buyVolume": qs.get("buyVolume", 0),
+                                "sellVolume": qs.get("sellVolume", 0),
+                                "buyMovingWeek": qs.get("buyMovingWeek", 0),
+                                "sellMovingWeek": qs.get("sellMovingWeek", 0),
+                                # buy_summary holds sell offers (consumed by insta-buys), sell_summary holds buy orders.
+                                "buySummary": _compact_depth(products[pid].get("buy_summary")),
+                                "sellSummary": _compact_depth(products[pid].get("sell_summary")),
                             }
                         else:
                              prices[name] = {"buyPrice": 0, "sellPrice": 0}
@@ -0,0 +1,82 @@
+import random
+from typing import Any, Dict, Iterable, List, Mapping, Sequence
+
+DEFAULT_STABILITY_DRAWS = 1000
+STABILITY_TOP_K = 5
+# Rank interval reported per mutation: the 5th to 95th percentile over the draws.
+STABILITY_INTERVAL = (0.05, 0.95)
+
+
+def price_noise_widths(bazaar_data: Mapping[str, Mapping[str, Any]], items: Iterable[str]) -> Dict[str, float]:
+    """Relative half-spread of each item, used as the width of its price shock.
+
+    An item quoted at 90 / 110 moves by up to +-10% in a draw. Items without a two-sided quote
+    (NPC-priced, missing, or zero) are held fixed.
+    """
+    widths: Dict[str, float] = {}
+    for item in items:
+        market = bazaar_data.get(item) or {}
+        buy_price = float(market.get("buyPrice") or 0.0)
+        sell_price = float(market.get("sellPrice") or 0.0)
+        if buy_price > 0 and sell_price > 0:
+            widths[item] = min(1.0, abs(buy_price - sell_price) / (buy_price + sell_price))
+    return widths
+
+
+def _percentile_rank(histogram: Sequence[int], draws: int, fraction: float) -> int:
+    threshold = fraction * draws
+    seen = 0
+    for rank, count in enumerate(histogram, start=1):
+        seen += count
+        if seen >= threshold and seen > 0:
+            return rank
+    return len(histogram)
+
+
+def rank_stability(
+    rows: Sequence[Mapping[str, Any]],
+    widths: Mapping[str, float],
+    *,
+    draws: int = DEFAULT_STABILITY_DRAWS,
+    seed: int = 0,
+) -> Dict[str, Dict[str, Any]]:
+    """Re-rank `rows` under `draws` joint price shocks and summarize where each one lands.
+
+    Each row's `price_exposure` maps an item to the score change if that item's price doubled,
+    which is exact because every price-driven score is linear in prices. A draw shocks each item by
+    a uniform fraction of its width, shared by every row that touches it, so mutations that share
+    ingredients move together.
+    """
+    names = [row["mutationName"] for row in rows]
+    base_scores = [float(row["score"]) for row in rows]
+    items = sorted({item for row in rows for item in (row.get("price_exposure") or {}) if widths.get(item, 0.0) > 0})
+    item_index = {item: position for position, item in enumerate(items)}
+    item_widths = [widths[item] for item in items]
+    exposures = [
+        [(item_index[item], weight) for item, weight in (row.get("price_exposure") or {}).items() if item in item_index]
+        for row in rows
+    ]
+
+    rng = random.Random(seed)
+    histograms: List[List[int]] = [[0] * len(rows) for _ in rows]
+    row_indices = range(len(rows))
+    for _draw in range(draws):
+        shocks = [width * (2.0 * rng.random() - 1.0) for width in item_widths]
+        scores = [
+            base + sum(weight * shocks[item] for item, weight in exposure)
+            for base, exposure in zip(base_scores, exposures)
+        ]
+        for rank, row in enumerate(sorted(row_indices, key=scores.__getitem__, reverse=True)):
+            histograms[row][rank] += 1
+
+    low, high = STABILITY_INTERVAL
+    return {
+        name: {
+            "p_top1": histogram[0] / draws if draws else 0.0,
+            "p_top5": sum(histogram[:STABILITY_TOP_K]) / draws if draws else 0.0,
+            "median_rank": _percentile_rank(histogram, draws, 0.5),
+            "rank_low": _percentile_rank(histogram, draws, low),
+            "rank_high": _percentile_rank(histogram, draws, high),
+        }
+        for name, histogram in zip(names, histograms)
+    }
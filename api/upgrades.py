@@ -0,0 +1,130 @@
+from typing import Any, Dict, Iterable, List, Mapping, Sequence
+
+# Fortune is bought in chunks; the report prices this many points as one step.
+FORTUNE_STEP = 100.0
+# The four model inputs an upgrade step can move.
+UPGRADE_INPUTS = ("fortune", "overdrive_bonus", "additive_base", "cycle_time_hours")
+
+
+def parse_upgrade_costs(value: Any, step_names: Iterable[str]) -> Dict[str, float]:
+    """Parse "greenhouse_yield:5e6,fortune:2000000" into coins per upgrade step (unknown steps are skipped)."""
+    costs: Dict[str, float] = {}
+    if not isinstance(value, str):
+        return costs
+    valid = set(step_names)
+    for entry in value.split(","):
+        name, separator, coins = entry.partition(":")
+        name = name.strip()
+        if not separator or name not in valid:
+            continue
+        try:
+            cost = float(coins.strip())
+        except ValueError:
+            continue
+        if cost > 0 and cost != float("inf"):
+            costs[name] = cost
+    return costs
+
+
+def _crop_slopes(row: Mapping[str, Any]) -> tuple[float, float, Dict[str, float]]:
+    """Crop revenue, its slope per fortune point, and that slope per crop for one row.
+
+    Every crop yield is linear in the additive base and in its fortune multiplier
+    1 + (fortune + overdrive) / 100, so d value / d fortune is value / multiplier / 100.
+    The mutation's own sale scales with neither and is skipped.
+    """
+    crop_value = 0.0
+    per_crop: Dict[str, float] = {}
+    for yld in row["breakdown"]["yields"]:
+        if yld["name"] == row["mutationName"]:
+            continue
+        crop_value += yld["total_value"]
+        fortune_multiplier = yld["math"]["fortune"]
+        if fortune_multiplier > 0:
+            per_crop[yld["name"]] = per_crop.get(yld["name"], 0.0) + (yld["total_value"] / fortune_multiplier / 100.0)
+    return crop_value, sum(per_crop.values()), per_crop
+
+
+def compute_upgrade_gains(
+    rows: Sequence[Mapping[str, Any]],
+    steps: Mapping[str, Mapping[str, Any]],
+    *,
+    additive_base: float,
+    overdrive_crop: str | None,
+    costs: Mapping[str, float],
+) -> List[Dict[str, Any]]:
+    """Marginal value of each upgrade step for every leaderboard row, in one pass.
+
+    `steps` maps a step name to the change it makes to UPGRADE_INPUTS. Per row, the continuous
+    derivatives come straight from the yield formula, and each step's gain is the exact
+    difference: crop revenue scales by (A + dA) / A and by (f + dF / 100) / f, and expected
+    hours scale with the cycle time. With no `overdrive_crop` set, an Overdrive step is valued
+    on the row's best crop. Gains are also divided by the step's cost in `costs` when known.
+    """
+    results: List[Dict[str, Any]] = []
+    for row in rows:
+        crop_value, fortune_slope, per_crop = _crop_slopes(row)
+        profit = row["profit"]
+        hours = row["hourly"]["expected_hours"]
+        cycle_time_hours = row["hourly"]["tau_hours"]
+        profit_per_hour = (profit / hours) if hours else None
+        if overdrive_crop is not None:
+            overdrive_target = overdrive_crop if overdrive_crop in per_crop else None
+        else:
+            overdrive_target = max(sorted(per_crop), key=per_crop.get, default=None)
+        overdrive_slope = per_crop.get(overdrive_target, 0.0) if overdrive_target is not None else 0.0
+
+        derivatives = {
+            "profit": {
+                "fortune": fortune_slope,
+                "overdrive_bonus": overdrive_slope,
+                "additive_base": (crop_value / additive_base) if additive_base > 0 else 0.0,
+                "cycle_time_hours": 0.0,
+            },
+            "profit_per_hour": None,
+        }
+        if hours:
+            derivatives["profit_per_hour"] = {
+                **{name: slope / hours for name, slope in derivatives["profit"].items()},
+                "cycle_time_hours": -(profit_per_hour / cycle_time_hours) if cycle_time_hours else 0.0,
+            }
+
+        gains: Dict[str, Dict[str, Any]] = {}
+        for name, deltas in steps.items():
+            base_scale = (1.0 + (deltas.get("additive_base", 0.0) / additive_base)) if additive_base > 0 else 1.0
+            new_crop_value = base_scale * (
+                crop_value
+                + (deltas.get("fortune", 0.0) * fortune_slope)
+                + (deltas.get("overdrive_bonus", 0.0) * overdrive_slope)
+            )
+            profit_gain = new_crop_value - crop_value
+            profit_per_hour_gain = None
+            if hours and cycle_time_hours:
+                new_cycle_time = cycle_time_hours + deltas.get("cycle_time_hours", 0.0)
+                if new_cycle_time > 0:
+                    profit_per_hour_gain = ((profit + profit_gain) / (hours * new_cycle_time / cycle_time_hours)) - profit_per_hour
+            cost = costs.get(name)
+            gains[name] = {
+                "profit": profit_gain,
+                "profit_per_hour": profit_per_hour_gain,
+                "cost": cost,
+                "profit_per_coin": (profit_gain / cost) if cost else None,
+                "profit_per_hour_per_coin": (profit_per_hour_gain / cost) if cost and profit_per_hour_gain is not None else None,
+                "payback_hours": (cost / profit_per_hour_gain) if cost and profit_per_hour_gain and profit_per_hour_gain > 0 else None,
+            }
+            if deltas.get("overdrive_bonus"):
+                gains[name]["overdrive_crop"] = overdrive_target
+
+        priced = {name: gain["profit_per_hour_per_coin"] for name, gain in gains.items() if gain["profit_per_hour_per_coin"] is not None}
+        if not priced:
+            priced = {name: gain["profit_per_hour"] for name, gain in gains.items() if gain["profit_per_hour"] is not None}
+        best_step = max(priced, key=priced.get) if priced and max(priced.values()) > 0 else None
+        results.append({
+            "mutationName": row["mutationName"],
+            "profit": profit,
+            "profit_per_hour": profit_per_hour,
+            "derivatives": derivatives,
+            "gains": gains,
+            "best_step": best_step,
+        })
+    return results
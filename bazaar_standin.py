@@ -0,0 +1,218 @@
+"""Local stand-in for the Hypixel Bazaar endpoint.
+
+Replays recorded or synthetic payloads with configurable latency, errors and price
+drift so the API can be load-tested offline. Point the API at it with
+BAZAAR_API_URL=http://127.0.0.1:8765/v2/skyblock/bazaar.
+"""
+
+import argparse
+import copy
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+from api.shared_data import BAZAAR_API_URL, MUTATION_IDS
+
+BAZAAR_PATH = "/v2/skyblock/bazaar"
+SUMMARY_LEVELS = 10
+
+
+def _summary(price: float, step: float, rng: random.Random) -> List[Dict[str, Any]]:
+    levels = []
+    for level in range(SUMMARY_LEVELS):
+        levels.append({
+            "amount": rng.randint(1, 400),
+            "pricePerUnit": round(max(0.1, price + (step * level)), 1),
+            "orders": rng.randint(1, 12),
+        })
+    return levels
+
+
+def synthetic_payload(seed: int = 0) -> Dict[str, Any]:
+    """Build a Hypixel-shaped Bazaar payload covering every tracked product."""
+    rng = random.Random(seed)
+    products: Dict[str, Any] = {}
+    for product_id in sorted(MUTATION_IDS.values()):
+        sell_price = round(10 ** rng.uniform(1.0, 6.0), 1)
+        buy_price = round(sell_price * rng.uniform(1.01, 1.6), 1)
+        step = max(0.1, sell_price * 0.01)
+        sell_summary = _summary(sell_price, -step, rng)
+        buy_summary = _summary(buy_price, step, rng)
+        products[product_id] = {
+            "product_id": product_id,
+            "sell_summary": sell_summary,
+            "buy_summary": buy_summary,
+            "quick_status": {
+                "productId": product_id,
+                "sellPrice": sell_price,
+                "sellVolume": sum(level["amount"] for level in sell_summary),
+                "sellMovingWeek": rng.randint(1_000, 5_000_000),
+                "sellOrders": sum(level["orders"] for level in sell_summary),
+                "buyPrice": buy_price,
+                "buyVolume": sum(level["amount"] for level in buy_summary),
+                "buyMovingWeek": rng.randint(1_000, 5_000_000),
+                "buyOrders": sum(level["orders"] for level in buy_summary),
+            },
+        }
+    return {"success": True, "lastUpdated": int(time.time() * 1000), "products": products}
+
+
+def load_payloads(path: str) -> List[Dict[str, Any]]:
+    """Load recorded payloads from a JSON file, a JSON-lines file or a directory of JSON files."""
+    if os.path.isdir(path):
+        file_paths = sorted(
+            os.path.join(path, name) for name in os.listdir(path) if name.endswith((".json", ".jsonl"))
+        )
+    else:
+        file_paths = [path]
+
+    payloads: List[Dict[str, Any]] = []
+    for file_path in file_paths:
+        with open(file_path, "r", encoding="utf-8") as file_handle:
+            if file_path.endswith(".jsonl"):
+                payloads.extend(json.loads(line) for line in file_handle if line.strip())
+            else:
+                payloads.append(json.load(file_handle))
+    return [payload for payload in payloads if isinstance(payload, dict) and payload.get("products")]
+
+
+def record_payload(path: str, url: str = BAZAAR_API_URL) -> None:
+    """Append one live Bazaar response to a JSON-lines recording."""
+    import requests
+
+    response = requests.get(url, timeout=10)
+    response.raise_for_status()
+    with open(path, "a", encoding="utf-8") as file_handle:
+        file_handle.write(json.dumps(response.json(), separators=(",", ":")) + "\n")
+
+
+class BazaarStandIn:
+    """Serves payloads in rotation, applying latency, failures and a price random walk."""
+
+    def __init__(
+        self,
+        payloads: List[Dict[str, Any]],
+        *,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        drift: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        if not payloads:
+            raise ValueError("at least one payload is required")
+        self.payloads = [copy.deepcopy(payload) for payload in payloads]
+        self.latency_ms = max(0.0, latency_ms)
+        self.jitter_ms = max(0.0, jitter_ms)
+        self.error_rate = min(1.0, max(0.0, error_rate))
+        self.drift = max(0.0, drift)
+        self.requests_served = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _apply_drift(self, payload: Dict[str, Any]) -> None:
+        for product in payload["products"].values():
+            quick_status = product.get("quick_status") or {}
+            factor = max(0.01, 1.0 + self._rng.gauss(0.0, self.drift))
+            for key in ("buyPrice", "sellPrice"):
+                if key in quick_status:
+                    quick_status[key] = round(quick_status[key] * factor, 1)
+            for summary_key in ("buy_summary", "sell_summary"):
+                for level in product.get(summary_key, []):
+                    level["pricePerUnit"] = round(level["pricePerUnit"] * factor, 1)
+
+    def next_response(self) -> tuple[int, Dict[str, Any]]:
+        """Return (status_code, body) for the next request and advance the replay state."""
+        with self._lock:
+            index = self.requests_served % len(self.payloads)
+            self.requests_served += 1
+            if self.error_rate and self._rng.random() < self.error_rate:
+                if self._rng.random() < 0.5:
+                    return 503, {"success": False, "cause": "Stand-in injected outage"}
+                return 200, {"success": False, "cause": "Stand-in injected failure"}
+            payload = self.payloads[index]
+            if self.drift:
+                self._apply_drift(payload)
+            body = copy.deepcopy(payload)
+            delay_ms = self.latency_ms + (self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0)
+        body["lastUpdated"] = int(time.time() * 1000)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000.0)
+        return 200, body
+
+
+def _handler_for(standin: BazaarStandIn):
+    class BazaarHandler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802 - BaseHTTPRequestHandler naming
+            if self.path.split("?", 1)[0] != BAZAAR_PATH:
+                status_code, body = 404, {"success": False, "cause": "Not found"}
+            else:
+                status_code, body = standin.next_response()
+            encoded = json.dumps(body, separators=(",", ":")).encode("utf-8")
+            self.send_response(status_code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(encoded)))
+            self.end_headers()
+            self.wfile.write(encoded)
+
+        def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler signature
+            pass
+
+    return BazaarHandler
+
+
+def start_standin(standin: BazaarStandIn, host: str = "127.0.0.1", port: int = 0) -> tuple[ThreadingHTTPServer, str]:
+    """Serve the stand-in on a daemon thread and return (server, bazaar_url)."""
+    server = ThreadingHTTPServer((host, port), _handler_for(standin))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    bound_host, bound_port = server.server_address[:2]
+    return server, f"http://{bound_host}:{bound_port}{BAZAAR_PATH}"
+
+
+def _parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--payloads", help="Recorded payload file or directory. Defaults to a synthetic payload.")
+    parser.add_argument("--record", help="Append one live Bazaar response to this JSON-lines file and exit.")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drift", type=float, default=0.0, help="Std-dev of the per-request relative price move.")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> None:
+    args = _parse_args(argv)
+    if args.record:
+        record_payload(args.record)
+        return
+
+    payloads = load_payloads(args.payloads) if args.payloads else [synthetic_payload(args.seed)]
+    standin = BazaarStandIn(
+        payloads,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        drift=args.drift,
+        seed=args.seed,
+    )
+    server = ThreadingHTTPServer((args.host, args.port), _handler_for(standin))
+    print(f"Bazaar stand-in serving {len(payloads)} payload(s) on http://{args.host}:{args.port}{BAZAAR_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
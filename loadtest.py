@@ -0,0 +1,179 @@
+"""Load generator that drives the full ASGI app in-process.
+
+Runs the real middleware stack (rate limiting, response cache, security headers)
+against a Bazaar stand-in and reports throughput, latency percentiles and 429 rate.
+
+    python loadtest.py --requests 2000 --concurrency 32 --latency-ms 80 --error-rate 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Sequence
+from urllib.parse import urlencode
+
+DEFAULT_QUERIES: Sequence[Dict[str, Any]] = (
+    {"plots": 3, "mode": "profit"},
+    {"plots": 3, "mode": "hourly"},
+    {"plots": 1, "mode": "profit", "setup_mode": "buy_order"},
+    {"plots": 2, "mode": "smart", "maxed_crops": "Wheat,Carrot"},
+    {"plots": 3, "mode": "target", "target_crop": "Wild Rose"},
+    {"plots": 3, "mode": "profit", "format": "columns"},
+)
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float | None:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def _asgi_get(app, path: str, query_string: str, client_ip: str) -> tuple[int, int]:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("ascii"),
+        "query_string": query_string.encode("ascii"),
+        "root_path": "",
+        "headers": [(b"host", b"loadtest"), (b"x-forwarded-for", client_ip.encode("ascii"))],
+        "client": (client_ip, 50000),
+        "server": ("loadtest", 80),
+    }
+    status_code = 0
+    body_size = 0
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status_code, body_size
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body":
+            body_size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status_code, body_size
+
+
+async def run_load(
+    app,
+    *,
+    total_requests: int,
+    concurrency: int,
+    path: str = "/api/leaderboard",
+    query_factory: Callable[[int], Dict[str, Any]] | None = None,
+    clients: int = 1,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Issue total_requests GETs at the given concurrency and summarize the results."""
+    rng = random.Random(seed)
+    if query_factory is None:
+        query_factory = lambda _index: rng.choice(DEFAULT_QUERIES)  # noqa: E731
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    total_bytes = 0
+
+    async def one_request(index: int) -> None:
+        nonlocal total_bytes
+        query_string = urlencode(query_factory(index))
+        client_ip = f"10.0.{(index % max(1, clients)) // 256}.{(index % max(1, clients)) % 256}"
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                status_code, body_size = await _asgi_get(app, path, query_string, client_ip)
+            except Exception:
+                status_code, body_size = 599, 0
+            latencies.append(time.perf_counter() - started)
+        statuses[status_code] += 1
+        total_bytes += body_size
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_request(index) for index in range(total_requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total_requests,
+        "concurrency": concurrency,
+        "clients": clients,
+        "elapsed_seconds": elapsed,
+        "throughput_rps": (total_requests / elapsed) if elapsed > 0 else None,
+        "latency_p50_ms": _ms(percentile(latencies, 0.50)),
+        "latency_p99_ms": _ms(percentile(latencies, 0.99)),
+        "latency_max_ms": _ms(latencies[-1] if latencies else None),
+        "status_counts": dict(sorted(statuses.items())),
+        "rate_429": (statuses[429] / total_requests) if total_requests else 0.0,
+        "mean_response_bytes": (total_bytes / total_requests) if total_requests else 0.0,
+    }
+
+
+def _ms(seconds: float | None) -> float | None:
+    return seconds * 1000.0 if seconds is not None else None
+
+
+def _parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--clients", type=int, default=1, help="Distinct simulated client IPs.")
+    parser.add_argument("--payloads", help="Recorded payload file or directory. Defaults to a synthetic payload.")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drift", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> None:
+    args = _parse_args(argv)
+
+    from bazaar_standin import BazaarStandIn, load_payloads, start_standin, synthetic_payload
+    from api import shared_data
+    from api.index import app
+
+    payloads = load_payloads(args.payloads) if args.payloads else [synthetic_payload(args.seed)]
+    standin = BazaarStandIn(
+        payloads,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        drift=args.drift,
+        seed=args.seed,
+    )
+    server, url = start_standin(standin)
+    shared_data.BAZAAR_API_URL = url
+    try:
+        report = asyncio.run(run_load(
+            app,
+            total_requests=args.requests,
+            concurrency=args.concurrency,
+            clients=args.clients,
+            seed=args.seed,
+        ))
+    finally:
+        server.shutdown()
+    report["upstream_requests"] = standin.requests_served
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
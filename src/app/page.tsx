@@ -4,6 +4,7 @@ import { Fragment, useState, useEffect, useMemo, useRef } from "react";
 import { ModeToggle } from "@/components/mode-toggle";
 import { Coins, Sprout, Clock, Calculator, Loader2, ArrowUpRight, AlertTriangle, X, Info, Sparkles, ChevronDown, ArrowUpDown, ArrowUp, ArrowDown } from "lucide-react";
 import Image from "next/image";
+import { evaluateLeaderboard, fetchLeaderboardBundle, type LeaderboardBundle } from "@/lib/leaderboard";
 
 type OptimizationMode = "profit" | "smart" | "target";
 type SetupMode = "buy_order" | "insta_buy";
@@ -287,12 +288,10 @@ export default function Home() {
     { key: "Mushroom", label: "Mushroom" },
   ];
   const tableScrollRef = useRef<HTMLDivElement | null>(null);
-  const activeLeaderboardRequestRef = useRef(0);
 
-  const [data, setData] = useState<LeaderboardResponse | null>(null);
+  const [bundle, setBundle] = useState<LeaderboardBundle | null>(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
-  const maxedCropsQuery = useMemo(() => maxedCrops.join(","), [maxedCrops]);
 
   useEffect(() => {
     try {
@@ -433,71 +432,76 @@ export default function Home() {
     }
   }, [mode, sortKey]);
 
+  // Prices and catalog arrive as one bundle; it is only refetched once its Bazaar snapshot expires.
   useEffect(() => {
-    const controller = new AbortController();
-    const requestId = activeLeaderboardRequestRef.current + 1;
-    activeLeaderboardRequestRef.current = requestId;
-    const timeoutHandle = window.setTimeout(() => controller.abort(), 15000);
-
-    const query = new URLSearchParams({
-      plots: plots.toString(),
-      fortune: fortune.toString(),
-      harvest_boost: useHarvestBoost ? "true" : "false",
-      improved_harvest_boost: useImprovedHarvestBoost ? "true" : "false",
-      harvest_harbinger: useHarvestHarbinger ? "true" : "false",
-      infini_vacuum: useInfiniVacuum ? "true" : "false",
-      hypercharge_level: hyperchargeLevel.toString(),
-      hypercharge_rarity: hyperchargeRarity,
-      gh_yield_upgrade: ghYieldUpgrade.toString(),
-      gh_speed_upgrade: ghSpeedUpgrade.toString(),
-      unique_crops: uniqueCrops.toString(),
-      evergreen_chip_level: evergreenChipLevel.toString(),
-      evergreen_chip_rarity: evergreenChipRarity,
-      overdrive_chip_level: overdriveChipLevel.toString(),
-      overdrive_chip_rarity: overdriveChipRarity,
-      is_ironman: isIronman ? "true" : "false",
-      mode: mode,
-      setup_mode: setupMode,
-      sell_mode: sellMode,
-      maxed_crops: maxedCropsQuery,
-      ...(overdriveCrop && { overdrive_crop: overdriveCrop }),
-      ...(mode === "target" && { target_crop: targetCrop })
-    });
-    const queryString = query.toString();
-
-    setLoading(true);
-    setError("");
-
-    (async () => {
+    let cancelled = false;
+    let activeController: AbortController | null = null;
+    let refreshHandle: number | undefined;
+
+    const loadBundle = async () => {
+      const controller = new AbortController();
+      activeController = controller;
+      const timeoutHandle = window.setTimeout(() => controller.abort(), 15000);
+      setLoading(true);
       try {
-        const res = await fetch(`/api/leaderboard?${queryString}&t=${Date.now()}`, {
-          cache: "no-store",
-          signal: controller.signal,
-        });
-        if (!res.ok) throw new Error("Failed to fetch leaderboard data.");
-        const json: LeaderboardResponse = await res.json();
-        if (requestId !== activeLeaderboardRequestRef.current) return;
-        setData(json);
+        const next = await fetchLeaderboardBundle(controller.signal);
+        if (cancelled) return;
+        setBundle((current) => (current?.version === next.version ? current : next));
+        setError("");
+        refreshHandle = window.setTimeout(loadBundle, Math.max(5000, next.expires_at * 1000 - Date.now()));
       } catch (err: unknown) {
-        if (requestId !== activeLeaderboardRequestRef.current) return;
-        if ((err as Error)?.name === "AbortError") {
-          setError("Leaderboard request timed out. Check backend connectivity.");
-          return;
-        }
-        setError(err instanceof Error ? err.message : "Unexpected error while fetching leaderboard data.");
+        if (cancelled) return;
+        setError(
+          controller.signal.aborted
+            ? "Leaderboard request timed out. Check backend connectivity."
+            : err instanceof Error ? err.message : "Unexpected error while fetching leaderboard data."
+        );
+        refreshHandle = window.setTimeout(loadBundle, 15000);
       } finally {
         window.clearTimeout(timeoutHandle);
-        if (requestId === activeLeaderboardRequestRef.current) {
-          setLoading(false);
-        }
+        if (!cancelled) setLoading(false);
       }
-    })();
+    };
+    loadBundle();
 
     return () => {
-      controller.abort();
-      window.clearTimeout(timeoutHandle);
+      cancelled = true;
+      activeController?.abort();
+      window.clearTimeout(refreshHandle);
     };
+  }, []);
+
+  // Control changes recompute locally from the bundle instead of calling /api/leaderboard.
+  // These rows carry no server-only blocks (liquidity, renewal, price risk, ...); a control
+  // that needs one has to query /api/leaderboard for it.
+  const data: LeaderboardResponse | null = useMemo(() => {
+    if (!bundle) return null;
+    return evaluateLeaderboard(bundle, {
+      plots,
+      fortune,
+      harvest_boost: useHarvestBoost,
+      improved_harvest_boost: useImprovedHarvestBoost,
+      harvest_harbinger: useHarvestHarbinger,
+      infini_vacuum: useInfiniVacuum,
+      hypercharge_level: hyperchargeLevel,
+      hypercharge_rarity: hyperchargeRarity,
+      gh_yield_upgrade: ghYieldUpgrade,
+      gh_speed_upgrade: ghSpeedUpgrade,
+      unique_crops: uniqueCrops,
+      evergreen_chip_level: evergreenChipLevel,
+      evergreen_chip_rarity: evergreenChipRarity,
+      overdrive_chip_level: overdriveChipLevel,
+      overdrive_chip_rarity: overdriveChipRarity,
+      overdrive_crop: overdriveCrop || null,
+      is_ironman: isIronman,
+      mode,
+      setup_mode: setupMode,
+      sell_mode: sellMode,
+      maxed_crops: maxedCrops,
+      target_crop: mode === "target" ? targetCrop : null,
+    });
   }, [
+    bundle,
     plots,
     fortune,
     useHarvestBoost,
@@ -519,7 +523,7 @@ export default function Home() {
     setupMode,
     sellMode,
     targetCrop,
-    maxedCropsQuery,
+    maxedCrops,
   ]);
 
   const toggleMaxedCrop = (crop: string) => {
@@ -0,0 +1,553 @@
+// Client-side port of get_leaderboard's core rows (api/index.py), evaluated over the /api/bundle
+// payload so control changes recompute locally. Arithmetic follows compute_leaderboard_row
+// step for step, in the same order, so results match the server to the last bit;
+// tests/test_bundle.py runs this file under Node and diffs it against the server's rows.
+//
+// Covered: every input the page sends, in the profit, hourly, smart and target modes, plus
+// apply_spread_risk. Server-only extras (liquidity, renewal, layouts, harvest-stage search,
+// price risk, planners) are not in these rows; anything that shows them must call
+// /api/leaderboard.
+
+export type ChipRarity = "rare" | "epic" | "legendary";
+export type BundleMode = "profit" | "hourly" | "smart" | "target";
+export type SetupMode = "insta_buy" | "buy_order";
+export type SellMode = "insta_sell" | "sell_offer";
+
+// [source name, display name, canonical name, base drop, price override]
+type BundleCropDrop = [string, string, string, number, number | null];
+// [prices, cumulative quantity, cumulative cost], best price first.
+type BundleDepthCurve = [number[], number[], number[]];
+
+export type BundleMutation = {
+  name: string;
+  base_limit: number;
+  ingredients: [string, number][];
+  growth_stages: number;
+  special_multiplier: number;
+  spawn_chance: number;
+  warning_messages: string[];
+  crop_drops: BundleCropDrop[];
+  spread: { survival_rate: number; destroyed: Record<string, number> } | null;
+};
+
+export type LeaderboardBundle = {
+  version: string;
+  catalog_version: string;
+  snapshot_version: number;
+  expires_at: number;
+  constants: {
+    base_cycle_hours: number;
+    greenhouse_max_upgrade: number;
+    greenhouse_speed_reduction: number;
+    greenhouse_yield_bonus: number;
+    unique_crops_max: number;
+    unique_speed_reduction: number;
+    unique_yield_bonus: number;
+    harvest_harbinger_fortune: number;
+    infini_vacuum_fortune: number;
+    improved_harvest_boost_multiplier: number;
+    harvest_boost_multiplier: number;
+    chip_level_cap: Record<ChipRarity, number>;
+    hypercharge_bonus_per_level: Record<ChipRarity, number>;
+    evergreen_bonus_per_level: Record<ChipRarity, number>;
+    overdrive_bonus_per_level: Record<ChipRarity, number>;
+    market_spread_warning: string;
+  };
+  required_crops: Record<string, number>;
+  target_crops: string[];
+  mutations: BundleMutation[];
+  npc_prices: Record<string, number>;
+  // Item -> [buy price, sell price, wide spread]
+  prices: Record<string, [number, number, boolean]>;
+  depth: Record<string, Partial<Record<"insta_buy" | "insta_sell", BundleDepthCurve>>>;
+};
+
+export type LeaderboardParams = {
+  plots: number;
+  fortune: number;
+  gh_yield_upgrade: number;
+  gh_speed_upgrade: number;
+  unique_crops: number;
+  mode: BundleMode;
+  setup_mode: SetupMode;
+  sell_mode: SellMode;
+  target_crop?: string | null;
+  maxed_crops?: string[];
+  harvest_harbinger: boolean;
+  infini_vacuum: boolean;
+  harvest_boost: boolean;
+  improved_harvest_boost: boolean;
+  hypercharge_level: number;
+  hypercharge_rarity: ChipRarity;
+  evergreen_chip_level: number;
+  evergreen_chip_rarity: ChipRarity;
+  overdrive_chip_level: number;
+  overdrive_chip_rarity: ChipRarity;
+  overdrive_crop?: string | null;
+  is_ironman: boolean;
+  apply_spread_risk?: boolean;
+};
+
+export type YieldMath = {
+  base: number;
+  limit: number;
+  evergreen_buff: number;
+  gh_buff: number;
+  unique_buff: number;
+  harvest_boost: number;
+  wart_buff: number;
+  fortune: number;
+  overdrive_bonus?: number;
+  special: number;
+};
+
+export type IngredientRow = {
+  name: string;
+  amount: number;
+  unit_price: number;
+  total_cost: number;
+  top_of_book_price: number;
+  slippage_cost: number;
+  depth_exhausted: boolean;
+};
+
+export type YieldRow = {
+  name: string;
+  amount: number;
+  unit_price: number;
+  total_value: number;
+  math: YieldMath;
+};
+
+export type HourlyModel = {
+  mutation_chance: number;
+  profit_per_hour_selected: number | null;
+  tau_hours: number;
+  p: number;
+  g: number;
+  N: number;
+  expected_spawn_cycles: number | null;
+  expected_cycles: number | null;
+  expected_hours: number | null;
+  harvests_per_cycle: number | null;
+  harvests_per_hour: number | null;
+  profit_per_hour: number | null;
+  warnings: string[];
+  payback_hours_ready: number | null;
+};
+
+export type LeaderboardRow = {
+  mutationName: string;
+  score: number;
+  profit: number;
+  profit_per_growth_cycle: number | null;
+  profit_per_hour: number;
+  opt_cost: number;
+  revenue: number;
+  warning: boolean;
+  warning_messages: string[];
+  mut_price: number;
+  limit: number;
+  smart_progress: Record<string, number>;
+  hourly: HourlyModel;
+  breakdown: {
+    base_limit: number;
+    ingredients: IngredientRow[];
+    yields: YieldRow[];
+    total_setup_cost: number;
+    total_revenue: number;
+    growth_stages: number;
+    estimated_time_hours: number;
+  };
+};
+
+export type LeaderboardResult = {
+  leaderboard: LeaderboardRow[];
+  metadata: {
+    catalog_version: string;
+    snapshot_version: number;
+    cycle_time_hours: number;
+    missing_crops: string[];
+    fortune_breakdown: {
+      base_fortune: number;
+      effective_fortune: number;
+      bonus_total: number;
+      harvest_harbinger: boolean;
+      infini_vacuum: boolean;
+      hypercharge_level: number;
+      hypercharge_rarity: ChipRarity;
+      affected_multiplier: number;
+    };
+    yield_breakdown: {
+      base_multiplier: number;
+      evergreen_chip_level: number;
+      evergreen_chip_rarity: ChipRarity;
+      evergreen_bonus: number;
+      greenhouse_yield_upgrade: number;
+      greenhouse_yield_bonus: number;
+      unique_crops: number;
+      unique_crop_bonus: number;
+      harvest_boost: boolean;
+      improved_harvest_boost: boolean;
+      harvest_boost_multiplier: number;
+      wart_multiplier: number;
+      overdrive_chip_level: number;
+      overdrive_chip_rarity: ChipRarity;
+      overdrive_crop: string | null;
+      overdrive_bonus: number;
+    };
+    speed_breakdown: {
+      greenhouse_speed_upgrade: number;
+      greenhouse_speed_reduction: number;
+      unique_speed_reduction: number;
+    };
+  };
+};
+
+export const fetchLeaderboardBundle = async (signal?: AbortSignal): Promise<LeaderboardBundle> => {
+  const res = await fetch("/api/bundle", { signal });
+  if (!res.ok) throw new Error("Failed to fetch leaderboard data.");
+  return (await res.json()) as LeaderboardBundle;
+};
+
+const clampInt = (value: number, minimum: number, maximum: number, fallback: number) =>
+  Number.isInteger(value) ? Math.max(minimum, Math.min(maximum, value)) : fallback;
+
+const canonicalCropName = (name: string) => {
+  const cleaned = name.trim();
+  return cleaned === "Red Mushroom" || cleaned === "Brown Mushroom" || cleaned === "Mushroom" ? "Mushroom" : cleaned;
+};
+
+const finiteOrNull = (value: number | null) => (value !== null && Number.isFinite(value) ? value : null);
+
+// bisect_left over an ascending array.
+const lowerBound = (values: number[], target: number) => {
+  let lo = 0;
+  let hi = values.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (values[mid] < target) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+};
+
+// cost_at_size: [total cost, unfilled quantity] for walking `quantity` through the book.
+const costAtSize = ([prices, cumulativeQuantity, cumulativeCost]: BundleDepthCurve, quantity: number): [number, number] => {
+  if (quantity <= 0) return [0, 0];
+  const index = lowerBound(cumulativeQuantity, quantity);
+  if (index >= prices.length) {
+    const unfilled = quantity - cumulativeQuantity[cumulativeQuantity.length - 1];
+    return [cumulativeCost[cumulativeCost.length - 1] + (unfilled * prices[prices.length - 1]), unfilled];
+  }
+  const filledBefore = index > 0 ? cumulativeQuantity[index - 1] : 0;
+  const costBefore = index > 0 ? cumulativeCost[index - 1] : 0;
+  return [costBefore + ((quantity - filledBefore) * prices[index]), 0];
+};
+
+const buildExpectedCycleModel = (profitPerHarvest: number, spawnChance: number, growthStages: number, cycleTimeHours: number, batchSize: number) => {
+  const warnings: string[] = [];
+  if (!Number.isFinite(profitPerHarvest)) {
+    profitPerHarvest = 0;
+    warnings.push("Non-finite profit detected; expected-cycle profit metrics were reset to 0.");
+  }
+  if (!Number.isFinite(spawnChance) || spawnChance <= 0) {
+    warnings.push("Non-positive spawn chance; expected-cycle metrics were reset to 0.");
+    return {
+      tau_hours: Math.max(0, Number.isFinite(cycleTimeHours) ? cycleTimeHours : 0),
+      p: 0,
+      g: growthStages,
+      N: Math.max(0, batchSize),
+      expected_spawn_cycles: null,
+      expected_cycles: null,
+      expected_hours: null,
+      harvests_per_cycle: null,
+      harvests_per_hour: null,
+      profit_per_cycle: null,
+      profit_per_hour: null,
+      warnings,
+    };
+  }
+  const safeCycleTime = Number.isFinite(cycleTimeHours) && cycleTimeHours > 0 ? cycleTimeHours : 0;
+  if (safeCycleTime === 0) warnings.push("Non-positive cycle time; hourly metrics were reset to 0.");
+  const expectedSpawnCycles = 1 / spawnChance;
+  const expectedCycles = expectedSpawnCycles + Math.max(0, growthStages);
+  const expectedHours = safeCycleTime > 0 ? expectedCycles * safeCycleTime : null;
+  return {
+    tau_hours: safeCycleTime,
+    p: spawnChance,
+    g: growthStages,
+    N: Math.max(0, batchSize),
+    expected_spawn_cycles: expectedSpawnCycles,
+    expected_cycles: expectedCycles,
+    expected_hours: expectedHours,
+    harvests_per_cycle: expectedCycles > 0 ? 1 / expectedCycles : null,
+    harvests_per_hour: expectedHours && expectedHours > 0 ? 1 / expectedHours : null,
+    profit_per_cycle: expectedCycles > 0 ? profitPerHarvest / expectedCycles : null,
+    profit_per_hour: expectedHours && expectedHours > 0 ? profitPerHarvest / expectedHours : null,
+    warnings,
+  };
+};
+
+export const evaluateLeaderboard = (bundle: LeaderboardBundle, params: LeaderboardParams): LeaderboardResult => {
+  const constants = bundle.constants;
+  const plots = clampInt(params.plots, 1, 3, 1);
+  const fortune = clampInt(params.fortune, 0, 10000, 2500);
+  const ghYieldUpgrade = clampInt(params.gh_yield_upgrade, 0, constants.greenhouse_max_upgrade, constants.greenhouse_max_upgrade);
+  const ghSpeedUpgrade = clampInt(params.gh_speed_upgrade, 0, constants.greenhouse_max_upgrade, constants.greenhouse_max_upgrade);
+  const uniqueCrops = clampInt(params.unique_crops, 0, constants.unique_crops_max, constants.unique_crops_max);
+  const chipLevel = (level: number, rarity: ChipRarity, fallback: number) =>
+    clampInt(level, 0, constants.chip_level_cap[rarity], Math.max(0, Math.min(constants.chip_level_cap[rarity], fallback)));
+  const hyperchargeLevel = chipLevel(params.hypercharge_level, params.hypercharge_rarity, 0);
+  const evergreenChipLevel = chipLevel(params.evergreen_chip_level, params.evergreen_chip_rarity, 20);
+  const overdriveChipLevel = chipLevel(params.overdrive_chip_level, params.overdrive_chip_rarity, 0);
+  const { mode, setup_mode: setupMode, sell_mode: sellMode, is_ironman: isIronman } = params;
+
+  const validTargetCrops = new Set(bundle.target_crops);
+  const asTargetCrop = (value: string | null | undefined) => {
+    const crop = value && value.trim() ? canonicalCropName(value) : null;
+    return crop !== null && validTargetCrops.has(crop) ? crop : null;
+  };
+  const targetCrop = asTargetCrop(params.target_crop);
+  const overdriveCrop = asTargetCrop(params.overdrive_crop);
+
+  const maxed: string[] = [];
+  for (const crop of params.maxed_crops ?? []) {
+    const cleaned = canonicalCropName(crop);
+    if (cleaned in bundle.required_crops && !maxed.includes(cleaned)) maxed.push(cleaned);
+  }
+  const missingCrops = Object.keys(bundle.required_crops).filter((crop) => !maxed.includes(crop));
+
+  const ghSpeedReduction = (ghSpeedUpgrade / constants.greenhouse_max_upgrade) * constants.greenhouse_speed_reduction;
+  const uniqueReduction = (uniqueCrops / constants.unique_crops_max) * constants.unique_speed_reduction;
+  const cycleTimeHours = constants.base_cycle_hours * (1 - ghSpeedReduction - uniqueReduction);
+
+  const evergreenBuff = evergreenChipLevel * constants.evergreen_bonus_per_level[params.evergreen_chip_rarity];
+  const ghBuff = (ghYieldUpgrade / constants.greenhouse_max_upgrade) * constants.greenhouse_yield_bonus;
+  const uniqueBuff = (uniqueCrops / constants.unique_crops_max) * constants.unique_yield_bonus;
+  const additiveBase = 1 + evergreenBuff + ghBuff + uniqueBuff;
+
+  const affectedMultiplier = 1 + (hyperchargeLevel * constants.hypercharge_bonus_per_level[params.hypercharge_rarity]);
+  const unaffectedBonus = params.harvest_harbinger ? constants.harvest_harbinger_fortune : 0;
+  const affectedBonusBase = params.infini_vacuum ? constants.infini_vacuum_fortune : 0;
+  const totalBonus = unaffectedBonus + (affectedBonusBase * affectedMultiplier);
+  const effectiveFortune = fortune + totalBonus;
+  const overdriveBonus = overdriveChipLevel * constants.overdrive_bonus_per_level[params.overdrive_chip_rarity];
+
+  let harvestBoostMultiplier = 1;
+  if (params.improved_harvest_boost) harvestBoostMultiplier = constants.improved_harvest_boost_multiplier;
+  else if (params.harvest_boost) harvestBoostMultiplier = constants.harvest_boost_multiplier;
+  const baseYieldMult = additiveBase * harvestBoostMultiplier;
+
+  const getItemPrice = (item: string, isBuying: boolean, modeStr: string) => {
+    if (item in bundle.npc_prices) return bundle.npc_prices[item];
+    const [buyPrice, sellPrice] = bundle.prices[item] ?? [0, 0];
+    if (isBuying) return modeStr === "insta_buy" ? buyPrice : sellPrice;
+    return modeStr === "insta_sell" ? sellPrice : buyPrice;
+  };
+
+  // [average unit price, top-of-book unit price, unfilled quantity] for an instant order at size.
+  const getPriceAtSize = (item: string, quantity: number, isBuying: boolean, modeStr: string): [number, number, number] => {
+    const topPrice = getItemPrice(item, isBuying, modeStr);
+    const curve = item in bundle.npc_prices ? undefined : bundle.depth[item]?.[modeStr as "insta_buy" | "insta_sell"];
+    if (curve === undefined || quantity <= 0) return [topPrice, topPrice, 0];
+    const [totalCost, unfilled] = costAtSize(curve, quantity);
+    return [totalCost / quantity, topPrice, unfilled];
+  };
+
+  const rows = bundle.mutations.map((mutation): LeaderboardRow => {
+    const mutName = mutation.name;
+    const baseLimit = mutation.base_limit;
+    const limit = baseLimit * plots;
+
+    let optCost = 0;
+    const ingredientCosts: IngredientRow[] = [];
+    for (const [ingredient, qtyPerPlot] of mutation.ingredients) {
+      const totalQty = qtyPerPlot * plots;
+      const [costPerIngredient, topOfBookPrice, unfilledQty] = getPriceAtSize(ingredient, totalQty, true, setupMode);
+      const totalCost = totalQty * costPerIngredient;
+      optCost += totalCost;
+      ingredientCosts.push({
+        name: ingredient,
+        amount: totalQty,
+        unit_price: costPerIngredient,
+        total_cost: totalCost,
+        top_of_book_price: topOfBookPrice,
+        slippage_cost: totalCost - (totalQty * topOfBookPrice),
+        depth_exhausted: unfilledQty > 0,
+      });
+    }
+
+    const mutWarning = bundle.prices[mutName]?.[2] ?? false;
+
+    const growthStages = mutation.growth_stages;
+    const effectiveSpecialMult = mutation.special_multiplier;
+    let effectiveLimit = limit;
+    if (params.apply_spread_risk && mutation.spread !== null) {
+      let replantCost = 0;
+      for (const [crop, destroyed] of Object.entries(mutation.spread.destroyed)) {
+        replantCost += destroyed * plots * getItemPrice(crop, true, setupMode);
+      }
+      effectiveLimit *= mutation.spread.survival_rate;
+      optCost += replantCost;
+    }
+    // Only the surviving spots are sold, so that's the size the sale is priced at.
+    const mutSellPriceValue = isIronman ? 0 : getPriceAtSize(mutName, effectiveLimit, false, sellMode)[0];
+
+    const estimatedTime = growthStages * cycleTimeHours;
+    let expectedDropsValue = 0;
+    const yields: YieldRow[] = [];
+    const yieldByName = new Map<string, YieldRow>();
+    for (const [sourceName, displayName, canonicalName, baseDrop, priceOverride] of mutation.crop_drops) {
+      const cropOverdriveBonus = overdriveCrop && canonicalName === overdriveCrop ? overdriveBonus : 0;
+      const cropFortuneMult = ((effectiveFortune + cropOverdriveBonus) / 100) + 1;
+      const fullDrops = baseDrop * effectiveLimit * baseYieldMult * cropFortuneMult;
+      const cropPrice = priceOverride || getItemPrice(sourceName, false, sellMode);
+      const expectedDrops = fullDrops * effectiveSpecialMult;
+      const totalValue = expectedDrops * cropPrice;
+      expectedDropsValue += totalValue;
+
+      const existing = yieldByName.get(displayName);
+      if (existing) {
+        existing.amount += expectedDrops;
+        existing.total_value += totalValue;
+        existing.math.base += baseDrop;
+      } else {
+        const yieldItem: YieldRow = {
+          name: displayName,
+          amount: expectedDrops,
+          unit_price: cropPrice,
+          total_value: totalValue,
+          math: {
+            base: baseDrop,
+            limit: effectiveLimit,
+            evergreen_buff: evergreenBuff,
+            gh_buff: ghBuff,
+            unique_buff: uniqueBuff,
+            harvest_boost: harvestBoostMultiplier,
+            wart_buff: harvestBoostMultiplier,
+            fortune: cropFortuneMult,
+            overdrive_bonus: cropOverdriveBonus,
+            special: effectiveSpecialMult,
+          },
+        };
+        yields.push(yieldItem);
+        yieldByName.set(displayName, yieldItem);
+      }
+    }
+
+    const expectedMutDrops = effectiveLimit;
+    const expectedMutVal = expectedMutDrops * mutSellPriceValue;
+    const totalCycleRevenue = expectedDropsValue + expectedMutVal;
+    if (expectedMutDrops > 0) {
+      yields.push({
+        name: mutName,
+        amount: expectedMutDrops,
+        unit_price: mutSellPriceValue,
+        total_value: expectedMutVal,
+        math: { base: 1, limit: effectiveLimit, evergreen_buff: 0, gh_buff: 0, unique_buff: 0, harvest_boost: 1, wart_buff: 1, fortune: 1, special: 1 },
+      });
+    }
+
+    const cropYieldsByName = new Map<string, number>();
+    for (const yld of yields) {
+      if (yld.name in bundle.required_crops) cropYieldsByName.set(yld.name, yld.amount);
+    }
+    const smartProgress: Record<string, number> = {};
+    for (const crop of missingCrops) {
+      const required = bundle.required_crops[crop] ?? 0;
+      if (required <= 0) continue;
+      const progressPct = ((cropYieldsByName.get(crop) ?? 0) / required) * 100;
+      if (progressPct > 0) smartProgress[crop] = progressPct;
+    }
+
+    const profitBatch = totalCycleRevenue - optCost;
+    // The server reports profit per cycle on the row, not inside the hourly block.
+    const { profit_per_cycle: profitPerCycle, ...model } = buildExpectedCycleModel(profitBatch, mutation.spawn_chance, growthStages, cycleTimeHours, limit);
+    const hourlyProfitSelected = finiteOrNull(model.profit_per_hour);
+    const warningMessages = mutWarning ? [constants.market_spread_warning, ...mutation.warning_messages] : [...mutation.warning_messages];
+
+    let score = 0;
+    if (mode === "profit") score = profitBatch;
+    else if (mode === "target" && targetCrop) score = yields.find((yld) => yld.name === targetCrop)?.amount ?? 0;
+    else if (mode === "smart") score = Object.values(smartProgress).reduce((total, value) => total + value, 0);
+    else if (mode === "hourly") score = hourlyProfitSelected ?? -Infinity;
+
+    return {
+      mutationName: mutName,
+      score,
+      profit: profitBatch,
+      profit_per_growth_cycle: finiteOrNull(profitPerCycle),
+      profit_per_hour: hourlyProfitSelected ?? 0,
+      opt_cost: optCost,
+      revenue: totalCycleRevenue,
+      warning: warningMessages.length > 0,
+      warning_messages: warningMessages,
+      mut_price: mutSellPriceValue,
+      limit,
+      smart_progress: smartProgress,
+      hourly: {
+        mutation_chance: mutation.spawn_chance,
+        profit_per_hour_selected: hourlyProfitSelected,
+        ...model,
+        payback_hours_ready: hourlyProfitSelected !== null && hourlyProfitSelected > 0 ? optCost / hourlyProfitSelected : null,
+      },
+      breakdown: {
+        base_limit: baseLimit,
+        ingredients: ingredientCosts,
+        yields,
+        total_setup_cost: optCost,
+        total_revenue: totalCycleRevenue,
+        growth_stages: growthStages,
+        estimated_time_hours: estimatedTime,
+      },
+    };
+  });
+
+  // Same order as the server: score descending, ties in catalog order (Array.prototype.sort is stable).
+  let leaderboard = [...rows].sort((a, b) => (a.score > b.score ? -1 : a.score < b.score ? 1 : 0));
+  if (mode === "smart") leaderboard = leaderboard.filter((row) => row.score > 0);
+
+  return {
+    leaderboard,
+    metadata: {
+      catalog_version: bundle.catalog_version,
+      snapshot_version: bundle.snapshot_version,
+      cycle_time_hours: cycleTimeHours,
+      missing_crops: missingCrops,
+      fortune_breakdown: {
+        base_fortune: fortune,
+        effective_fortune: effectiveFortune,
+        bonus_total: totalBonus,
+        harvest_harbinger: params.harvest_harbinger,
+        infini_vacuum: params.infini_vacuum,
+        hypercharge_level: hyperchargeLevel,
+        hypercharge_rarity: params.hypercharge_rarity,
+        affected_multiplier: affectedMultiplier,
+      },
+      yield_breakdown: {
+        base_multiplier: 1,
+        evergreen_chip_level: evergreenChipLevel,
+        evergreen_chip_rarity: params.evergreen_chip_rarity,
+        evergreen_bonus: evergreenBuff,
+        greenhouse_yield_upgrade: ghYieldUpgrade,
+        greenhouse_yield_bonus: ghBuff,
+        unique_crops: uniqueCrops,
+        unique_crop_bonus: uniqueBuff,
+        harvest_boost: params.harvest_boost,
+        improved_harvest_boost: params.improved_harvest_boost,
+        harvest_boost_multiplier: harvestBoostMultiplier,
+        wart_multiplier: harvestBoostMultiplier,
+        overdrive_chip_level: overdriveChipLevel,
+        overdrive_chip_rarity: params.overdrive_chip_rarity,
+        overdrive_crop: overdriveCrop,
+        overdrive_bonus: overdriveBonus,
+      },
+      speed_breakdown: {
+        greenhouse_speed_upgrade: ghSpeedUpgrade,
+        greenhouse_speed_reduction: ghSpeedReduction,
+        unique_speed_reduction: uniqueReduction,
+      },
+    },
+  };
+};
@@ -0,0 +1,21 @@
+from collections import OrderedDict
+from unittest.mock import patch
+
+import pytest
+
+from api import index as api_index
+from api.cache_backend import MemoryCacheBackend
+from api.price_stats import PriceHistory
+from api.seasonality import SeasonalityIndex
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache_backend():
+    # Snapshots, failure backoffs, cached responses and rows, price history and seasonality
+    # buckets must not leak between tests.
+    backend = MemoryCacheBackend()
+    with patch.object(api_index, "_cache_backend", backend), \
+            patch.object(api_index, "_seasonality_index", SeasonalityIndex(backend)), \
+            patch.object(api_index, "_price_history", PriceHistory()), \
+            patch.object(api_index, "_leaderboard_row_cache", OrderedDict()):
+        yield
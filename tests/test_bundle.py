@@ -0,0 +1,175 @@
+import itertools
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import index as api_index
+from api.index import CATALOG_VERSION, MUTATION_CATALOG, get_bundle, get_leaderboard
+
+ROOT = Path(__file__).resolve().parent.parent
+# A recorded Bazaar response: one-sided quotes, missing items and partial order books included.
+SAVED_SNAPSHOT = json.loads((ROOT / "tests" / "fixtures" / "bazaar_snapshot.json").read_text())
+# Evaluates src/lib/leaderboard.ts over the bundle for each case. Uses the typescript package
+# when it's installed, otherwise Node's own type stripping (22.6+).
+PORT_RUNNER = """
+import { copyFileSync, readFileSync, writeFileSync } from "node:fs";
+import { createRequire } from "node:module";
+import { join } from "node:path";
+import { pathToFileURL } from "node:url";
+
+const [root, inputPath, workDir] = process.argv.slice(2);
+const source = join(root, "src", "lib", "leaderboard.ts");
+let modulePath = join(workDir, "leaderboard.mts");
+try {
+  const ts = createRequire(join(root, "package.json"))("typescript");
+  const { outputText } = ts.transpileModule(readFileSync(source, "utf8"), {
+    compilerOptions: { module: ts.ModuleKind.ESNext, target: ts.ScriptTarget.ES2022 },
+  });
+  modulePath = join(workDir, "leaderboard.mjs");
+  writeFileSync(modulePath, outputText);
+} catch {
+  copyFileSync(source, modulePath);
+}
+const { evaluateLeaderboard } = await import(pathToFileURL(modulePath).href);
+const { bundle, cases } = JSON.parse(readFileSync(inputPath, "utf8"));
+process.stdout.write(JSON.stringify(cases.map((params) => evaluateLeaderboard(bundle, params))));
+"""
+PLAYERS = [
+    {"plots": 1, "fortune": 0, "gh_yield_upgrade": 0, "gh_speed_upgrade": 0, "unique_crops": 0},
+    {
+        "plots": 3, "fortune": 2600, "gh_yield_upgrade": 9, "gh_speed_upgrade": 9, "unique_crops": 12,
+        "harvest_harbinger": True, "infini_vacuum": True, "harvest_boost": True, "improved_harvest_boost": True,
+        "hypercharge_level": 20, "hypercharge_rarity": "legendary",
+        "evergreen_chip_level": 15, "evergreen_chip_rarity": "legendary",
+        "overdrive_chip_level": 20, "overdrive_chip_rarity": "epic", "overdrive_crop": "Wheat",
+        "maxed_crops": ["Wheat", "Carrot", "Mushroom"],
+    },
+    {
+        "plots": 2, "fortune": 1450, "gh_yield_upgrade": 4, "gh_speed_upgrade": 6, "unique_crops": 7,
+        "harvest_boost": True, "evergreen_chip_level": 7, "evergreen_chip_rarity": "rare",
+        "overdrive_chip_level": 11, "overdrive_chip_rarity": "rare", "overdrive_crop": "Brown Mushroom",
+        "is_ironman": True, "target_crop": "Wild Rose",
+    },
+]
+PORT_DEFAULTS = {
+    "target_crop": None, "maxed_crops": [], "harvest_harbinger": False, "infini_vacuum": False,
+    "harvest_boost": False, "improved_harvest_boost": False,
+    "hypercharge_level": 0, "hypercharge_rarity": "rare", "evergreen_chip_level": 0, "evergreen_chip_rarity": "rare",
+    "overdrive_chip_level": 0, "overdrive_chip_rarity": "rare", "overdrive_crop": None, "is_ironman": False,
+}
+
+SNAPSHOT = {
+    "Magic Jellybean": {"buyPrice": 1000, "sellPrice": 600},
+    "All-in Aloe": {"buyPrice": 90000},
+    "Devourer": {
+        "buyPrice": 40000,
+        "sellPrice": 39000,
+        "buySummary": [[40000, 10], [41000, 5]],
+        "sellSummary": [[39000, 8]],
+    },
+}
+
+
+def test_bundle_carries_catalog_prices_and_depth():
+    with patch("api.index.get_bazaar_prices", return_value=SNAPSHOT):
+        bundle = get_bundle()
+
+    assert bundle["version"] == f"{CATALOG_VERSION}:{bundle['snapshot_version']}"
+    assert [mutation["name"] for mutation in bundle["mutations"]] == [mutation["name"] for mutation in MUTATION_CATALOG]
+    assert bundle["constants"]["base_cycle_hours"] == api_index.BASE_CYCLE_HOURS
+    # One-sided quotes fall back the same way get_item_price does.
+    assert bundle["prices"]["All-in Aloe"] == [90000, 90000, False]
+    assert bundle["prices"]["Magic Jellybean"] == [1000, 600, True]
+    assert bundle["prices"]["Lonelily"] == [0, 0, False]
+    assert bundle["depth"]["Devourer"]["insta_buy"] == [[40000.0, 41000.0], [10.0, 15.0], [400000.0, 605000.0]]
+    assert "Wheat" not in bundle["prices"] and bundle["npc_prices"]["Wheat"] > 0
+    devourer = next(mutation for mutation in bundle["mutations"] if mutation["name"] == "Devourer")
+    assert 0 < devourer["spread"]["survival_rate"] < 1
+
+
+def test_bundle_response_is_cached_per_snapshot():
+    with patch("api.index.get_bazaar_prices", return_value=SNAPSHOT):
+        client = TestClient(api_index.app)
+        first = client.get("/api/bundle")  # Cold start installs the snapshot.
+        second = client.get("/api/bundle")
+        third = client.get("/api/bundle")
+        revalidated = client.get("/api/bundle", headers={"If-None-Match": second.headers["etag"]})
+
+    assert first.status_code == 200
+    assert (second.headers["x-cache"], third.headers["x-cache"]) == ("MISS", "HIT")
+    assert third.json()["version"] == first.json()["version"]
+    assert revalidated.status_code == 304
+    assert "x-ratelimit-limit" not in first.headers
+
+
+def _node_command():
+    node = os.environ.get("NODE") or shutil.which("node")
+    if node is None:
+        return None
+    if subprocess.run([node, "--experimental-strip-types", "-e", ""], capture_output=True).returncode == 0:
+        return [node, "--experimental-strip-types", "--no-warnings"]
+    if subprocess.run([node, "-e", "require('typescript')"], cwd=ROOT, capture_output=True).returncode == 0:
+        return [node]
+    return None
+
+
+def _assert_same(path, port, server):
+    """Every field the port returns must equal the server's, bit for bit (JSON turns inf into null)."""
+    if isinstance(port, dict):
+        assert isinstance(server, dict), path
+        for key, value in port.items():
+            assert key in server, f"{path}.{key}"
+            _assert_same(f"{path}.{key}", value, server[key])
+    elif isinstance(port, list):
+        assert isinstance(server, list) and len(port) == len(server), path
+        for index, (port_value, server_value) in enumerate(zip(port, server)):
+            _assert_same(f"{path}[{index}]", port_value, server_value)
+    elif port is None and isinstance(server, float):
+        assert server != server or server in (float("inf"), float("-inf")), path
+    else:
+        assert port == server and isinstance(port, bool) == isinstance(server, bool), (path, port, server)
+
+
+def test_client_port_matches_the_server_rows(tmp_path):
+    command = _node_command()
+    if command is None:
+        pytest.skip("needs Node 22.6+ or the typescript package to run src/lib/leaderboard.ts")
+
+    cases = []
+    combinations = itertools.product(["profit", "hourly", "smart", "target"], ["insta_buy", "buy_order"], ["insta_sell", "sell_offer"])
+    for index, (mode, setup_mode, sell_mode) in enumerate(combinations):
+        cases.append({
+            **PORT_DEFAULTS,
+            **PLAYERS[index % len(PLAYERS)],
+            "mode": mode,
+            "setup_mode": setup_mode,
+            "sell_mode": sell_mode,
+            "apply_spread_risk": index % 2 == 1,
+        })
+    with patch("api.index.get_bazaar_prices", return_value=SAVED_SNAPSHOT):
+        bundle = json.loads(json.dumps(get_bundle()))
+        server = [
+            json.loads(json.dumps(get_leaderboard(**{**params, "maxed_crops": ",".join(params["maxed_crops"])})))
+            for params in cases
+        ]
+
+    (tmp_path / "input.json").write_text(json.dumps({"bundle": bundle, "cases": cases}))
+    (tmp_path / "runner.mjs").write_text(PORT_RUNNER)
+    completed = subprocess.run(
+        [*command, str(tmp_path / "runner.mjs"), str(ROOT), str(tmp_path / "input.json"), str(tmp_path)],
+        capture_output=True, text=True, timeout=120,
+    )
+    assert completed.returncode == 0, completed.stderr
+    port = json.loads(completed.stdout)
+
+    for index, (port_result, server_result) in enumerate(zip(port, server, strict=True)):
+        # Only the bundle knows which snapshot it was built from.
+        assert port_result["metadata"].pop("snapshot_version") == bundle["snapshot_version"]
+        assert [row["mutationName"] for row in port_result["leaderboard"]] == [row["mutationName"] for row in server_result["leaderboard"]]
+        _assert_same(f"case{index}", port_result, server_result)
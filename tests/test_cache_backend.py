@@ -0,0 +1,110 @@
+import multiprocessing
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from api import index as api_index
+from api.cache_backend import MemoryCacheBackend, SharedFileCacheBackend
+
+
+def _install_from_other_process(directory, prices):
+    SharedFileCacheBackend(directory).install_snapshot(prices, 60.0)
+
+
+def test_shared_snapshot_is_versioned_and_visible_to_other_workers(tmp_path):
+    reader = SharedFileCacheBackend(str(tmp_path))
+    assert reader.read_snapshot().data == {}
+
+    writer = SharedFileCacheBackend(str(tmp_path))
+    first = writer.install_snapshot({"Ashwreath": {"buyPrice": 10, "sellPrice": 9}}, 60.0)
+    assert first.version == 1
+    assert reader.read_snapshot().data["Ashwreath"]["buyPrice"] == 10
+
+    process = multiprocessing.get_context("spawn").Process(
+        target=_install_from_other_process,
+        args=(str(tmp_path), {"Ashwreath": {"buyPrice": 20, "sellPrice": 19}}),
+    )
+    process.start()
+    process.join(30)
+    assert process.exitcode == 0
+
+    # The reader's copy is still fresh; it only remaps once it expires.
+    assert reader.read_snapshot().data["Ashwreath"]["buyPrice"] == 10
+    reader._snapshot = reader._snapshot._replace(expires_at=0.0)
+    refreshed = reader.read_snapshot()
+    assert refreshed.version == 2
+    assert refreshed.data["Ashwreath"]["buyPrice"] == 20
+
+
+def test_shared_refresh_lease_has_a_single_holder(tmp_path):
+    leader = SharedFileCacheBackend(str(tmp_path))
+    follower = SharedFileCacheBackend(str(tmp_path))
+
+    assert leader.acquire_refresh_lease()
+    assert not follower.acquire_refresh_lease()
+    leader.release_refresh_lease()
+    assert follower.acquire_refresh_lease()
+    follower.release_refresh_lease()
+
+
+def test_shared_rate_limit_counts_across_backends(tmp_path):
+    first = SharedFileCacheBackend(str(tmp_path))
+    second = SharedFileCacheBackend(str(tmp_path))
+
+    assert first.hit_rate_limit("1.2.3.4", window_seconds=60, max_requests=2, now=100.0)
+    assert second.hit_rate_limit("1.2.3.4", window_seconds=60, max_requests=2, now=101.0)
+    assert not first.hit_rate_limit("1.2.3.4", window_seconds=60, max_requests=2, now=102.0)
+    assert second.hit_rate_limit("1.2.3.4", window_seconds=60, max_requests=2, now=161.0)
+
+
+def test_leaderboard_responses_are_cached_per_snapshot_version():
+    backend = MemoryCacheBackend()
+    prices = {"Ashwreath": {"buyPrice": 500.0, "sellPrice": 450.0}}
+    with patch.object(api_index, "_cache_backend", backend), \
+            patch("api.index.get_bazaar_prices", return_value=prices) as mock_prices:
+        client = TestClient(api_index.app)
+        first = client.get("/api/leaderboard?plots=2&t=1")
+        second = client.get("/api/leaderboard?plots=2&t=2")
+
+        assert first.status_code == 200
+        assert first.headers["X-Cache"] == "BYPASS"
+        assert mock_prices.call_count == 1
+
+        third = client.get("/api/leaderboard?plots=2&t=3")
+        assert second.headers["X-Cache"] == "MISS"
+        assert third.headers["X-Cache"] == "HIT"
+        assert third.json() == second.json()
+
+        backend.install_snapshot({"Ashwreath": {"buyPrice": 900.0, "sellPrice": 850.0}}, 60.0)
+        fourth = client.get("/api/leaderboard?plots=2&t=4")
+        assert fourth.headers["X-Cache"] == "MISS"
+
+
+def test_shared_rate_limit_sweeps_keys_that_stop_calling(tmp_path):
+    backend = SharedFileCacheBackend(str(tmp_path))
+    for index in range(5):
+        assert backend.hit_rate_limit(f"10.0.0.{index}", window_seconds=60, max_requests=2, now=100.0)
+
+    assert backend.hit_rate_limit("10.0.0.9", window_seconds=60, max_requests=2, now=200.0)
+    (remaining,) = backend._connection().execute("SELECT COUNT(*) FROM rate_limit_hits").fetchone()
+    assert remaining == 1
+
+
+def test_failed_cold_start_backs_off_for_every_worker(tmp_path):
+    leader = SharedFileCacheBackend(str(tmp_path))
+    follower = SharedFileCacheBackend(str(tmp_path))
+    with patch("api.index.get_bazaar_prices", return_value={}) as mock_prices:
+        with patch.object(api_index, "_cache_backend", leader):
+            assert api_index.get_cached_bazaar_prices() == {}
+            assert api_index.get_cached_bazaar_prices() == {}
+        with patch.object(api_index, "_cache_backend", follower):
+            assert api_index.get_cached_bazaar_prices() == {}
+
+    assert mock_prices.call_count == 1
+    assert follower.backoff_until(api_index.BAZAAR_BACKOFF_NAME) > 0
+
+    prices = {"Ashwreath": {"buyPrice": 500.0, "sellPrice": 450.0}}
+    follower.set_backoff(api_index.BAZAAR_BACKOFF_NAME, 0.0)
+    with patch("api.index.get_bazaar_prices", return_value=prices), \
+            patch.object(api_index, "_cache_backend", follower):
+        assert api_index.get_cached_bazaar_prices()["Ashwreath"]["buyPrice"] == 500.0
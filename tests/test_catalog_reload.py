@@ -0,0 +1,100 @@
+import json
+import shutil
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from api import index as api_index
+from api.cache_backend import MemoryCacheBackend
+
+
+@contextmanager
+def _isolated_catalog(json_path):
+    with patch.object(api_index, "MUTATION_DATA_PATH", str(json_path)), \
+            patch.object(api_index, "MANUAL_DATA", api_index.MANUAL_DATA), \
+            patch.object(api_index, "MUTATION_CATALOG", api_index.MUTATION_CATALOG), \
+            patch.object(api_index, "VALID_TARGET_CROPS", api_index.VALID_TARGET_CROPS), \
+            patch.object(api_index, "CATALOG_VERSION", api_index.CATALOG_VERSION), \
+            patch.dict(api_index._catalog_watch_state, {"stamp": None, "next_check": 0.0}):
+        yield
+
+
+def _copy_catalog(tmp_path):
+    json_path = tmp_path / "mutation_ingredient_list.json"
+    shutil.copyfile(api_index.MUTATION_DATA_PATH, json_path)
+    return json_path
+
+
+def test_catalog_reload_swaps_in_a_new_version_when_files_change(tmp_path):
+    json_path = _copy_catalog(tmp_path)
+    with _isolated_catalog(json_path):
+        original_version = api_index.CATALOG_VERSION
+        # An unchanged copy compiles to the same content version, so nothing is swapped.
+        assert not api_index.reload_mutation_catalog()
+        assert not api_index.reload_mutation_catalog()
+
+        data = json.loads(json_path.read_text(encoding="utf-8"))
+        data["Devourer"]["growth_stages"] = 7
+        json_path.write_text(json.dumps(data), encoding="utf-8")
+
+        assert api_index.reload_mutation_catalog()
+        assert api_index.CATALOG_VERSION != original_version
+        devourer = next(m for m in api_index.MUTATION_CATALOG if m["name"] == "Devourer")
+        assert devourer["growth_stages"] == 7
+
+        result = api_index.get_leaderboard(plots=1)
+        assert result["metadata"]["catalog_version"] == api_index.CATALOG_VERSION
+        row = next(m for m in result["leaderboard"] if m["mutationName"] == "Devourer")
+        assert row["breakdown"]["growth_stages"] == 7
+
+
+def test_invalid_catalog_edit_keeps_serving_the_current_version(tmp_path):
+    json_path = _copy_catalog(tmp_path)
+    with _isolated_catalog(json_path):
+        catalog = api_index.MUTATION_CATALOG
+        version = api_index.CATALOG_VERSION
+
+        json_path.write_text('{"Devourer": ', encoding="utf-8")
+        assert not api_index.reload_mutation_catalog()
+        json_path.write_text('{"Devourer": {"ingredients": []}}', encoding="utf-8")
+        assert not api_index.reload_mutation_catalog()
+
+        assert api_index.MUTATION_CATALOG is catalog
+        assert api_index.CATALOG_VERSION == version
+
+
+def test_leaderboard_etag_tracks_snapshot_and_catalog_versions(tmp_path):
+    backend = MemoryCacheBackend()
+    backend.install_snapshot({"Ashwreath": {"buyPrice": 500.0, "sellPrice": 450.0}}, 60.0)
+    with _isolated_catalog(_copy_catalog(tmp_path)), \
+            patch.object(api_index, "_cache_backend", backend), \
+            patch.object(api_index, "CATALOG_RELOAD_INTERVAL_SECONDS", 0):
+        client = TestClient(api_index.app)
+        first = client.get("/api/leaderboard?plots=2&t=1")
+        etag = first.headers["ETag"]
+
+        not_modified = client.get("/api/leaderboard?plots=2&t=2", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.headers["ETag"] == etag
+
+        with patch.object(api_index, "CATALOG_VERSION", "next-version"):
+            changed = client.get("/api/leaderboard?plots=2&t=3", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["X-Cache"] == "MISS"
+        assert changed.headers["ETag"] != etag
+
+        backend.install_snapshot({"Ashwreath": {"buyPrice": 900.0, "sellPrice": 850.0}}, 60.0)
+        refreshed = client.get("/api/leaderboard?plots=2&t=4", headers={"If-None-Match": etag})
+        assert refreshed.status_code == 200
+        assert refreshed.headers["ETag"] != etag
+
+
+def test_every_endpoint_polls_for_catalog_changes():
+    client = TestClient(api_index.app)
+    with patch.object(api_index, "maybe_reload_mutation_catalog") as poll, \
+            patch("api.index.get_bazaar_prices", return_value={}):
+        for path in ("/api/upgrades", "/api/seasonality", "/api/bundle"):
+            client.get(path)
+            assert poll.call_count == 1, path
+            poll.reset_mock()
@@ -0,0 +1,105 @@
+import pytest
+
+from api import flow
+from api.index import MUTATION_CATALOG, get_leaderboard, parse_plot_allocation
+
+CATALOG_BY_NAME = {mutation["name"]: mutation for mutation in MUTATION_CATALOG}
+
+
+def _flow(name, allocations=None, plots=3):
+    return flow.solve_production_flow(CATALOG_BY_NAME, name, total_plots=plots, cycle_time_hours=0.5, allocations=allocations)
+
+
+def test_recipe_closure_lists_upstream_mutations_first():
+    closure = flow.recipe_closure(CATALOG_BY_NAME, "Blastberry")
+
+    assert closure[-1] == "Blastberry"
+    assert closure.index("Choconut") < closure.index("Chocoberry")
+    assert closure.index("Gloomgourd") < closure.index("Chocoberry")
+    assert flow.recipe_closure(CATALOG_BY_NAME, "Ashwreath") == ["Ashwreath"]
+    assert _flow("Ashwreath") is None
+
+
+def test_every_intermediate_is_produced_as_fast_as_it_is_consumed():
+    result = _flow("Chloronite")
+    stages = {stage["name"]: stage for stage in result["stages"]}
+
+    assert result["throughput_per_hour"] > 0
+    assert sum(stage["plots"] for stage in stages.values()) == pytest.approx(3.0)
+    for name, stage in stages.items():
+        if name != "Chloronite":
+            assert stage["output_per_hour"] >= stage["consumed_per_hour"] - 1e-9
+    assert result["bottleneck_kind"] == "plots"
+    assert result["marginal_output_per_plot"] == pytest.approx(result["throughput_per_hour"] / 3.0)
+
+
+def test_pinned_lonelily_plots_bind_as_the_bottleneck():
+    result = _flow("Noctilume", allocations={"Lonelily": 0.5, "Ashwreath": 1.0})
+
+    assert result["bottleneck"] == "Lonelily"
+    assert result["bottleneck_kind"] == "allocation"
+    assert "Ashwreath" not in result["marginal_output_per_allocated_plot"]
+    assert result["marginal_output_per_allocated_plot"]["Lonelily"] > 0
+    more = _flow("Noctilume", allocations={"Lonelily": 1.0})
+    assert more["throughput_per_hour"] > result["throughput_per_hour"]
+
+
+def test_plot_allocation_parsing_matches_catalog_names():
+    parsed = parse_plot_allocation("lonelily:2, Noctilume:0.5,Bogus:3,Ashwreath", CATALOG_BY_NAME)
+
+    assert parsed == {"Lonelily": 2.0, "Noctilume": 0.5}
+
+
+def test_ironman_always_reports_production_flow():
+    response = get_leaderboard(plots=3, is_ironman=True, plot_allocation="Lonelily:1")
+    rows = {row["mutationName"]: row for row in response["leaderboard"]}
+
+    assert response["metadata"]["production_flow"]["allocations"] == {"Lonelily": 1.0}
+    assert rows["Noctilume"]["production_flow"]["bottleneck"] in {"Lonelily", "Shadevine", "Duskbloom", "Noctilume"}
+    assert rows["Ashwreath"].get("production_flow") is None
+    assert "production_flow" not in get_leaderboard(plots=3)["leaderboard"][0]
+
+
+def _build(name, plots=3, batches=None):
+    return flow.plan_build(CATALOG_BY_NAME, name, total_plots=plots, cycle_time_hours=0.5, batches=batches)
+
+
+def test_critical_path_adds_every_upstream_spawn_and_growth():
+    memo = {}
+    chorus = flow.critical_path_hours(CATALOG_BY_NAME, "Chorus Fruit", 0.5, memo)
+    jellybean = flow.critical_path_hours(CATALOG_BY_NAME, "Magic Jellybean", 0.5, memo)
+
+    assert "Duskbloom" in memo and "Chloronite" in memo
+    assert chorus == pytest.approx(flow.batch_hours(CATALOG_BY_NAME["Chorus Fruit"], 0.5) + max(jellybean, memo["Chloronite"]))
+    assert _build("Chorus Fruit")["critical_path"] == ["Shadevine", "Duskbloom", "Magic Jellybean", "Chorus Fruit"]
+
+
+def test_build_order_respects_recipes_and_stays_near_the_lower_bound():
+    plan = _build("Chorus Fruit")
+    stages = {stage["name"]: stage for stage in plan["build_order"]}
+
+    assert plan["build_order"][-1]["name"] == "Chorus Fruit"
+    assert stages["Chorus Fruit"]["batches"] == 3
+    for name, stage in stages.items():
+        for ingredient, amount in CATALOG_BY_NAME[name]["ingredients"]:
+            if ingredient in stages:
+                assert stages[ingredient]["end_hours"] <= stage["start_hours"] + 1e-9
+                assert stages[ingredient]["batches"] * CATALOG_BY_NAME[ingredient]["base_limit"] >= amount
+    assert plan["lower_bound_hours"] <= plan["lead_time_hours"] <= plan["lower_bound_hours"] * 1.01
+    assert plan["lead_time_hours"] == pytest.approx(plan["work_hours"] / 3, rel=0.01)
+
+
+def test_unlimited_plots_reach_the_critical_path():
+    plan = _build("Noctilume", plots=200, batches=1)
+
+    assert plan["lead_time_hours"] == pytest.approx(plan["critical_path_hours"])
+    assert _build("Noctilume", plots=1, batches=1)["lead_time_hours"] == pytest.approx(plan["work_hours"])
+
+
+def test_build_schedule_is_opt_in_and_on_for_ironman():
+    rows = {row["mutationName"]: row for row in get_leaderboard(plots=2, build_schedule=True)["leaderboard"]}
+
+    assert rows["Chorus Fruit"]["build_plan"]["build_order"][-1]["batches"] == 2
+    assert rows["Ashwreath"]["build_plan"] is None
+    assert get_leaderboard(plots=2, is_ironman=True)["metadata"]["build_schedule"] is True
+    assert "build_plan" not in get_leaderboard(plots=2)["leaderboard"][0]
@@ -0,0 +1,99 @@
+import pytest
+
+from api import garden
+from api.index import MUTATION_CATALOG
+
+BY_NAME = {mutation["name"]: mutation for mutation in MUTATION_CATALOG}
+
+
+def _empty():
+    return [[None] * garden.GREENHOUSE_SIZE for _ in range(garden.GREENHOUSE_SIZE)]
+
+
+def _spots(layout, rule):
+    geometry, crops = garden.pack_layouts([layout])
+    spots = garden.eligible_spots(geometry, crops, rule)
+    return {
+        (row, col)
+        for row in range(geometry.height)
+        for col in range(geometry.width)
+        if spots >> (row * geometry.stride + col) & 1
+    }
+
+
+def test_adjacency_never_wraps_across_rows_or_packed_boards():
+    layout = _empty()
+    layout[0][9] = "Wheat"
+    rule = garden.AdjacencyRule(required=(("Wheat", 1),))
+    assert _spots(layout, rule) == {(0, 8), (1, 8), (1, 9)}
+
+    geometry, crops = garden.pack_layouts([layout, _empty()])
+    spots = garden.eligible_spots(geometry, crops, rule)
+    assert (spots >> geometry.board_bits) == 0
+
+
+def test_tiling_one_board_matches_packing_every_copy():
+    layout = garden.parse_layout("\n".join(["WC" * 5, "." * 10] * 5), {"W": "Wheat", "C": "Carrot"})
+    _geometry, single = garden.pack_layouts([layout])
+    for boards in (1, 2, 5, 64):
+        geometry, packed = garden.pack_layouts([layout] * boards)
+        assert {crop: garden.tile_boards(geometry, mask) for crop, mask in single.items()} == packed
+        # Only board 3 stays planted once the others are cleared.
+        lone = packed["Wheat"] & (geometry.board_mask << (3 * geometry.board_bits))
+        assert garden._nonempty_boards(geometry, packed["Wheat"]) == boards
+        assert garden._nonempty_boards(geometry, lone) == (1 if boards > 3 else 0)
+
+
+def test_catalog_rules_encode_isolation_and_large_footprints():
+    lonelily = garden.adjacency_rule(BY_NAME["Lonelily"])
+    crowded = garden.parse_layout("\n".join(["W" * 10] * 4 + ["." * 10] + ["W" * 10] * 5), {"W": "Wheat"})
+    assert len(_spots(_empty(), lonelily)) == 100
+    assert _spots(crowded, lonelily) == set()
+
+    godseed = garden.adjacency_rule(BY_NAME["Godseed"])
+    assert godseed.footprint == 2
+    layout = _empty()
+    ring = [(-1, -1), (-1, 0), (-1, 1), (-1, 2), (0, -1), (0, 2), (1, -1), (1, 2), (2, -1), (2, 0), (2, 1), (2, 2)]
+    for (row, col), (crop, _minimum) in zip(ring, godseed.required):
+        layout[3 + row][3 + col] = crop
+    assert _spots(layout, godseed) == {(3, 3)}
+
+    layout[5][5] = None  # one ingredient missing from the ring
+    assert _spots(layout, godseed) == set()
+
+
+def test_catalog_rules_follow_recipe_neighbour_counts():
+    assert BY_NAME["Devourer"]["adjacent_requirements"] == (("Puffercloud", 4), ("Zombud", 4))
+    assert BY_NAME["Gloomgourd"]["adjacent_requirements"] == (("Pumpkin Seeds", 1), ("Melon Seeds", 1))
+    assert BY_NAME["Witherbloom"]["adjacent_requirements"] == (("Dead Plants", 8),)
+    # Sixteen neighbours do not fit around one cell, so Snoozling grows to a 3x3 footprint.
+    assert BY_NAME["Snoozling"]["footprint"] == 3
+
+    rule = garden.adjacency_rule(BY_NAME["Ashwreath"])
+    layout = garden.parse_layout("\n".join(["NFN", "N.F", "FFN"] + ["..."] * 7), {"N": "Nether Wart", "F": "Fire"})
+    layout = [row + [None] * 7 for row in layout]
+    assert _spots(layout, rule) == {(1, 1)}
+    layout[0][0] = layout[0][2] = layout[1][0] = None  # one Nether Wart left
+    assert _spots(layout, rule) == set()
+
+    assert garden.recipe_adjacency(["Blastberry", "Cheesebite"], {"Blastberry": 42, "Cheesebite": 23}) == (None, 1)
+
+
+def test_unconstrained_layout_matches_the_flat_spawn_model():
+    results = garden.simulate_garden([_empty()] * 4, garden.AdjacencyRule(), spawn_chance=0.25, growth_stages=3, cycles=3000, seed=7)
+    for result in results:
+        assert result["qualifying_spots"] == 100
+        assert result["effective_spawn_chance"] == pytest.approx(0.25, rel=0.03)
+        assert result["harvests_per_cycle"] == pytest.approx(100 / (4 + 3), rel=0.03)
+
+
+def test_isolation_rules_lower_the_real_spawn_rate():
+    rule = garden.AdjacencyRule(max_adjacent_crops=0)
+    checkerboard = garden.parse_layout("\n".join([".X" * 5, "XX" * 5] * 5), {"X": "Wheat"})
+    empty, planted = garden.simulate_garden([_empty(), checkerboard], rule, spawn_chance=0.25, growth_stages=2, cycles=600, seed=3)
+
+    # Every empty spot qualifies at first, but each spawn blocks its neighbours until harvested.
+    assert empty["qualifying_spots"] == 100
+    assert empty["effective_spawn_chance"] < 0.15
+    assert planted["qualifying_spots"] == 0
+    assert planted["spawns"] == 0
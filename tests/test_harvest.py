@@ -0,0 +1,68 @@
+import pytest
+
+from api import harvest, mechanics
+from api.index import get_leaderboard
+
+
+def _aloe_multipliers():
+    return tuple(mechanics.ALOE_STAGE_MULTIPLIER(stage) for stage in range(mechanics.ALOE_HARVEST_STAGE + 1))
+
+
+def _rate(spawn_chance, expected_stage, expected_multiplier, fixed_ratio):
+    return (expected_multiplier + fixed_ratio) / ((1.0 / spawn_chance) + expected_stage)
+
+
+def test_reset_chance_is_calibrated_to_the_observed_aloe_average():
+    multipliers = _aloe_multipliers()
+    expected = harvest.expected_multiplier_at_stage(multipliers, mechanics.ALOE_RESET_CHANCE, 14)
+    assert expected == pytest.approx(9.37)
+    assert harvest.expected_multiplier_at_stage(multipliers, 0.0, 14) == pytest.approx(60.0)
+
+
+def test_linear_ramp_trades_replanting_cost_against_growth_time():
+    multipliers = tuple(mechanics.linear_ramp(10.0, 120)(stage) for stage in range(121))
+    plan = harvest.plan_harvest_stage(
+        stage_multipliers=multipliers,
+        reset_chance=0.0,
+        spawn_chance=0.25,
+        crop_value=1_000_000.0,
+        fixed_value=-5_000_000.0,
+    )
+    # Replanting costs 5x the 1x crop value, so only a fully grown batch pays for it.
+    assert plan["expected_stage"] == pytest.approx(120.0)
+    assert plan["expected_multiplier"] == pytest.approx(10.0)
+    assert plan["harvest_from_ramp_index"][119] is None
+
+    # Free replanting favours quick harvests over the slow ramp.
+    cheap = harvest.plan_harvest_stage(
+        stage_multipliers=multipliers,
+        reset_chance=0.0,
+        spawn_chance=0.25,
+        crop_value=1_000_000.0,
+        fixed_value=0.0,
+    )
+    assert cheap["expected_stage"] == pytest.approx(1.0)
+
+
+def test_adaptive_aloe_policy_beats_always_harvesting_at_stage_14():
+    multipliers = _aloe_multipliers()
+    for fixed_ratio in (0.0, 5.0, 50.0):
+        policy = harvest.solve_harvest_policy(multipliers, mechanics.ALOE_RESET_CHANCE, 0.25, fixed_ratio)
+        fixed_rate = _rate(0.25, 14, 9.37, fixed_ratio)
+        assert _rate(0.25, policy.expected_stage, policy.expected_multiplier, fixed_ratio) >= fixed_rate - 1e-6
+
+
+def test_leaderboard_reports_optimized_harvest_stage():
+    baseline = {row["mutationName"]: row for row in get_leaderboard(plots=3)["leaderboard"]}
+    optimized = {row["mutationName"]: row for row in get_leaderboard(plots=3, optimize_harvest_stage=True)["leaderboard"]}
+
+    assert baseline["All-in Aloe"]["harvest_stage"] is None
+    assert optimized["Ashwreath"]["harvest_stage"] is None
+    for name in ("Magic Jellybean", "All-in Aloe"):
+        plan = optimized[name]["harvest_stage"]
+        assert plan["default_stage"] == baseline[name]["breakdown"]["growth_stages"]
+        # Both ramps are assumed shapes, so the answer is flagged rather than presented as measured.
+        assert plan["curve_placeholder"] is True
+        assert any("placeholder stage curve" in message for message in optimized[name]["warning_messages"])
+        assert not any("placeholder stage curve" in message for message in baseline[name]["warning_messages"])
+        assert optimized[name]["profit_per_hour"] >= baseline[name]["profit_per_hour"] - 1e-6
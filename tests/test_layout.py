@@ -0,0 +1,97 @@
+import threading
+import time
+from unittest.mock import patch
+
+from api import garden, layout
+from api import index as api_index
+
+BY_NAME = {mutation["name"]: mutation for mutation in api_index.MUTATION_CATALOG}
+
+
+def _check_plan(plan, rule):
+    geometry, crops = garden.pack_layouts([plan.grid])
+    eligible = garden.eligible_spots(geometry, crops, rule)
+    spots = 0
+    for row, col in plan.spots:
+        spots |= 1 << (row * geometry.stride + col)
+    assert eligible & spots == spots
+    assert layout.select_spots(geometry, spots, rule) == spots
+    planted = {crop: sum(cell == crop for line in plan.grid for cell in line) for crop, _minimum in rule.required}
+    assert dict(plan.ingredients) == planted
+
+
+def test_isolated_mutations_pack_on_every_other_cell():
+    plan = layout.optimized_layout_for(BY_NAME["Lonelily"])
+    assert len(plan.spots) == 25
+    assert plan.ingredients == ()
+    _check_plan(plan, garden.adjacency_rule(BY_NAME["Lonelily"]))
+
+
+def test_search_finds_valid_layouts_for_small_and_large_footprints():
+    for name in ("Devourer", "Glasscorn", "Godseed"):
+        rule = garden.adjacency_rule(BY_NAME[name])
+        plan = layout.optimized_layout_for(BY_NAME[name])
+        _check_plan(plan, rule)
+        assert len(plan.spots) >= BY_NAME[name]["base_limit"]
+
+
+def test_layout_cost_uses_ingredient_weights():
+    rule = garden.AdjacencyRule(required=(("Wheat", 1), ("Carrot", 1)))
+    plan = layout.optimize_layout(rule, (("Wheat", 1.0), ("Carrot", 50.0)), iterations=1500)
+    counts = dict(plan.ingredients)
+    _check_plan(plan, rule)
+    assert plan.cost == counts["Wheat"] + (50.0 * counts["Carrot"])
+
+
+def test_leaderboard_uses_optimized_layouts_only_when_they_beat_the_catalog():
+    catalog = (BY_NAME["Veilshroom"], BY_NAME["Godseed"])
+    with patch.object(api_index, "MUTATION_CATALOG", catalog):
+        baseline = {row["mutationName"]: row for row in api_index.get_leaderboard(plots=2)["leaderboard"]}
+        result = api_index.get_leaderboard(plots=2, optimize_layout=True)
+    optimized = {row["mutationName"]: row for row in result["leaderboard"]}
+
+    assert result["metadata"]["optimize_layout"] is True
+    veilshroom = layout.optimized_layout_for(BY_NAME["Veilshroom"])
+    assert len(veilshroom.spots) > BY_NAME["Veilshroom"]["base_limit"]
+    assert optimized["Veilshroom"]["breakdown"]["base_limit"] == len(veilshroom.spots)
+    assert {ing["name"]: ing["amount"] for ing in optimized["Veilshroom"]["breakdown"]["ingredients"]} == {
+        crop: amount * 2 for crop, amount in veilshroom.ingredients
+    }
+    # Same spot count as the catalog but more planted cells, so the catalog layout stays.
+    assert optimized["Godseed"]["breakdown"] == baseline["Godseed"]["breakdown"]
+
+
+def test_unplaceable_recipes_keep_their_catalog_counts():
+    # Startlevine's recipe overflows every ring; Stoplight Petal needs multi-cell neighbours.
+    assert BY_NAME["Startlevine"]["adjacent_requirements"] is None
+    assert not BY_NAME["Startlevine"]["layout_searchable"]
+    assert not BY_NAME["Stoplight Petal"]["layout_searchable"]
+    assert BY_NAME["Veilshroom"]["layout_searchable"]
+
+    catalog = (BY_NAME["Startlevine"], BY_NAME["Stoplight Petal"])
+    with patch.object(api_index, "MUTATION_CATALOG", catalog):
+        optimized = {row["mutationName"]: row for row in api_index.get_leaderboard(plots=1, optimize_layout=True)["leaderboard"]}
+
+    assert optimized["Startlevine"]["breakdown"]["base_limit"] == 16
+    assert optimized["Stoplight Petal"]["breakdown"]["base_limit"] == 4
+
+
+def test_concurrent_misses_share_one_search():
+    calls = []
+
+    @layout._computed_once
+    def search(key):
+        calls.append(key)
+        time.sleep(0.05)
+        return key * 2
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(search(21))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [42] * 8
+    assert calls == [21]
+    assert search(21) == 42 and calls == [21]
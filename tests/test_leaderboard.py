@@ -697,6 +697,301 @@ class LeaderboardTests(unittest.TestCase):
         self.assertGreater(normal_mut_yield["total_value"], 0)
         self.assertEqual(ironman_mut_yield["total_value"], 0.0)
 
+    @patch("api.index.get_bazaar_prices", return_value={})
+    def test_columnar_format_matches_row_format(self, _mock_prices):
+        params = dict(
+            plots=3,
+            fortune=2500,
+            gh_upgrade=9,
+            unique_crops=12,
+            mode="profit",
+            setup_mode="buy_order",
+            sell_mode="sell_offer",
+            target_crop=None,
+            maxed_crops="",
+        )
+        rows = get_leaderboard(**params)
+        columnar = get_leaderboard(**params, response_format="columns")
+
+        self.assertEqual(columnar["format"], "columns")
+        self.assertEqual(columnar["length"], len(rows["leaderboard"]))
+        self.assertEqual(columnar["columns"]["mutationName"], [m["mutationName"] for m in rows["leaderboard"]])
+        self.assertEqual(columnar["columns"]["profit_per_hour"], [m["profit_per_hour"] for m in rows["leaderboard"]])
+        self.assertEqual(columnar["hourly"]["expected_hours"], [m["hourly"]["expected_hours"] for m in rows["leaderboard"]])
+        self.assertEqual(columnar["constants"]["evergreen_buff"], rows["metadata"]["yield_breakdown"]["evergreen_bonus"])
+        self.assertEqual(columnar["constants"]["tau_hours"], rows["metadata"]["cycle_time_hours"])
+
+        devourer_index = columnar["columns"]["mutationName"].index("Devourer")
+        yield_fields = columnar["breakdown"]["yields"]["fields"]
+        devourer_yields = [dict(zip(yield_fields, y)) for y in columnar["breakdown"]["yields"]["rows"][devourer_index]]
+        pumpkin = next(y for y in devourer_yields if y["name"] == "Pumpkin")
+        devourer_self = next(y for y in devourer_yields if y["name"] == "Devourer")
+        self.assertEqual(pumpkin["kind"], "crop")
+        self.assertEqual(devourer_self["kind"], "mutation")
+        row_pumpkin = next(
+            y for m in rows["leaderboard"] if m["mutationName"] == "Devourer"
+            for y in m["breakdown"]["yields"] if y["name"] == "Pumpkin"
+        )
+        self.assertEqual(pumpkin["amount"], row_pumpkin["amount"])
+        self.assertEqual(pumpkin["fortune"], row_pumpkin["math"]["fortune"])
+
+    @patch("api.index.get_bazaar_prices", return_value={})
+    def test_unknown_response_format_falls_back_to_rows(self, _mock_prices):
+        result = get_leaderboard(plots=1, response_format="xml")
+        self.assertIn("leaderboard", result)
+
+    @patch("api.index.get_bazaar_prices", return_value={
+        "Magic Jellybean": {
+            "buyPrice": 1000, "sellPrice": 900,
+            "buyVolume": 100, "sellVolume": 50,
+            "buyMovingWeek": 16_800, "sellMovingWeek": 1_680,
+        },
+        "Plant Boy Advance": {
+            "buyPrice": 5000, "sellPrice": 4000,
+            "buyMovingWeek": 168 * 27, "sellMovingWeek": 168 * 27,
+        },
+        "All-in Aloe": {
+            "buyPrice": 1_250_000, "sellPrice": 1_000_000,
+            "buyVolume": 0, "sellVolume": 0,
+            "buyMovingWeek": 168, "sellMovingWeek": 168,
+        },
+    })
+    def test_liquidity_mode_uses_fill_times_as_throughput_bottleneck(self, _mock_prices):
+        result = get_leaderboard(
+            plots=3,
+            mode="liquidity",
+            setup_mode="buy_order",
+            sell_mode="sell_offer",
+        )
+
+        aloe = next(m for m in result["leaderboard"] if m["mutationName"] == "All-in Aloe")
+        jellybean = next(i for i in aloe["breakdown"]["ingredients"] if i["name"] == "Magic Jellybean")
+        # 44 per plot x 3 plots filled by buy orders at 1_680 / 168 = 10 insta-sells per hour.
+        self.assertAlmostEqual(jellybean["fill_hours"], 13.2, places=6)
+        # 48 mutations sold by sell offer at 168 / 168 = 1 insta-buy per hour.
+        self.assertAlmostEqual(aloe["liquidity"]["sell_fill_hours"], 48.0, places=6)
+        self.assertEqual(aloe["liquidity"]["bottleneck"], "sell")
+        self.assertAlmostEqual(aloe["liquidity_adjusted_profit_per_hour"], aloe["profit"] / 48.0, places=6)
+        self.assertEqual(aloe["liquidity"]["illiquid_items"], [])
+
+        scores = [m["score"] for m in result["leaderboard"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_unfillable_markets_rank_last_in_liquidity_mode(self):
+        flowing = {"buyPrice": 1000, "sellPrice": 900, "buyMovingWeek": 168_000, "sellMovingWeek": 168_000}
+        snapshot = {
+            "Chloronite": dict(flowing),
+            "Startlevine": dict(flowing),
+            "Glasscorn": {**flowing, "buyPrice": 5_000_000, "sellPrice": 4_000_000},
+        }
+
+        def run(prices):
+            from api import index as api_index
+            from api.cache_backend import MemoryCacheBackend
+
+            # A fresh backend per run so each snapshot is fetched rather than served from cache.
+            with patch("api.index.get_bazaar_prices", return_value=prices), \
+                    patch.object(api_index, "_cache_backend", MemoryCacheBackend()):
+                result = get_leaderboard(plots=3, mode="liquidity", setup_mode="buy_order", sell_mode="sell_offer", mode_matrix=True)
+            return result["leaderboard"], next(m for m in result["leaderboard"] if m["mutationName"] == "Glasscorn")
+
+        rows, glasscorn = run(snapshot)
+        self.assertIsNotNone(glasscorn["liquidity_adjusted_profit_per_hour"])
+        self.assertEqual(rows[0]["mutationName"], "Glasscorn")
+
+        # Nobody buys it: the sale never fills, however profitable the batch looks.
+        rows, glasscorn = run({**snapshot, "Glasscorn": {**snapshot["Glasscorn"], "buyMovingWeek": 0, "sellMovingWeek": 0}})
+        self.assertIsNone(glasscorn["liquidity_adjusted_profit_per_hour"])
+        self.assertEqual(glasscorn["score"], float("-inf"))
+        self.assertEqual(glasscorn["liquidity"]["bottleneck"], "sell")
+        self.assertIsNone(glasscorn["liquidity"]["sell_fill_hours"])
+        self.assertIsNone(glasscorn["liquidity"]["bottleneck_hours"])
+        self.assertIn("Glasscorn", glasscorn["liquidity"]["illiquid_items"])
+        self.assertNotIn(glasscorn, [m for m in rows if m["score"] > float("-inf")])
+        # Sell offers wait on insta-buys, insta-sells on the (empty) resting book: neither fills.
+        self.assertEqual(glasscorn["mode_matrix"]["liquidity_adjusted_profit_per_hour"], [[None, None], [None, None]])
+
+        # An ingredient nobody sells holds up the setup the same way.
+        rows, glasscorn = run({**snapshot, "Chloronite": {**flowing, "sellMovingWeek": 0}})
+        self.assertIsNone(glasscorn["liquidity_adjusted_profit_per_hour"])
+        self.assertEqual(glasscorn["liquidity"]["bottleneck"], "setup")
+        self.assertIsNone(glasscorn["liquidity"]["setup_fill_hours"])
+        # Insta-buying still fills from the flow of sell offers, so only the buy-order row is unbounded.
+        self.assertEqual(glasscorn["mode_matrix"]["liquidity_adjusted_profit_per_hour"][1], [None, None])
+        self.assertTrue(all(value is not None for value in glasscorn["mode_matrix"]["liquidity_adjusted_profit_per_hour"][0]))
+
+    def test_insta_modes_fill_resting_volume_immediately(self):
+        from api.index import estimate_fill_hours
+
+        market = {"buyVolume": 100, "sellVolume": 10, "buyMovingWeek": 1_680, "sellMovingWeek": 168}
+        self.assertEqual(estimate_fill_hours(market, 80, is_buying=True, mode_str="insta_buy"), 0.0)
+        self.assertAlmostEqual(estimate_fill_hours(market, 120, is_buying=True, mode_str="insta_buy"), 2.0)
+        self.assertAlmostEqual(estimate_fill_hours(market, 12, is_buying=False, mode_str="insta_sell"), 2.0)
+        self.assertIsNone(estimate_fill_hours({"buyPrice": 5}, 12, is_buying=False, mode_str="sell_offer"))
+
+    @patch("api.index.get_bazaar_prices", return_value={
+        "Magic Jellybean": {
+            "buyPrice": 1000, "sellPrice": 900,
+            "buySummary": [[1000, 100], [1100, 20], [1500, 10]],
+            "sellSummary": [[900, 5], [800, 100]],
+        },
+    })
+    def test_insta_buy_setup_cost_walks_order_book_depth(self, _mock_prices):
+        result = get_leaderboard(plots=3, setup_mode="insta_buy", sell_mode="insta_sell")
+
+        aloe = next(m for m in result["leaderboard"] if m["mutationName"] == "All-in Aloe")
+        jellybean = next(i for i in aloe["breakdown"]["ingredients"] if i["name"] == "Magic Jellybean")
+        # 132 needed: 100 @ 1000, 20 @ 1100, 10 @ 1500, and 2 beyond visible depth priced at 1500.
+        expected_cost = (100 * 1000) + (20 * 1100) + (12 * 1500)
+        self.assertAlmostEqual(jellybean["total_cost"], expected_cost, places=6)
+        self.assertAlmostEqual(jellybean["unit_price"], expected_cost / 132, places=6)
+        self.assertEqual(jellybean["top_of_book_price"], 1000)
+        self.assertAlmostEqual(jellybean["slippage_cost"], expected_cost - 132 * 1000, places=6)
+        self.assertTrue(jellybean["depth_exhausted"])
+
+        magic = next(m for m in result["leaderboard"] if m["mutationName"] == "Magic Jellybean")
+        # 48 sold into buy orders: 5 @ 900, 43 @ 800.
+        self.assertAlmostEqual(magic["mut_price"], ((5 * 900) + (43 * 800)) / 48, places=6)
+
+    def test_cost_at_size_binary_search_matches_linear_walk(self):
+        from api.index import build_depth_curve, cost_at_size
+
+        curve = build_depth_curve([[10, 3], [11, 4], [12, 5]])
+        self.assertEqual(cost_at_size(curve, 3), (30.0, 0.0))
+        self.assertEqual(cost_at_size(curve, 5), (30.0 + 22.0, 0.0))
+        self.assertEqual(cost_at_size(curve, 12), (30.0 + 44.0 + 60.0, 0.0))
+        self.assertEqual(cost_at_size(curve, 14), (30.0 + 44.0 + 60.0 + 24.0, 2.0))
+        self.assertIsNone(build_depth_curve([]))
+
+    @patch("api.index.get_bazaar_prices", return_value={})
+    def test_smart_mode_plans_batches_for_remaining_milestones(self, _mock_prices):
+        all_but_two = ",".join(crop for crop in ("Wheat", "Carrot", "Potato", "Pumpkin", "Sugar cane", "Melon", "Cactus", "Cocoa Beans", "Nether Wart", "Sunflower", "Moonflower"))
+        result = get_leaderboard(
+            plots=3,
+            mode="smart",
+            maxed_crops=all_but_two,
+            crop_progress="Wild Rose:40000000,Mushroom:nope",
+        )
+
+        plan = result["metadata"]["milestone_plan"]
+        self.assertEqual(result["metadata"]["crop_progress"], {"Wild Rose": 40_000_000.0, "Mushroom": 0.0})
+        self.assertEqual(plan["status"], "complete")
+        self.assertEqual(plan["coverage"]["Wild Rose"]["required"], 400_000.0)
+        self.assertGreaterEqual(plan["coverage"]["Wild Rose"]["planned"], 400_000.0)
+        self.assertGreaterEqual(plan["coverage"]["Mushroom"]["planned"], 20_200_000.0)
+        self.assertLessEqual(plan["lower_bound_hours"], plan["total_hours"] + 1e-6)
+        self.assertAlmostEqual(sum(step["hours"] for step in plan["schedule"]), plan["total_hours"], places=6)
+
+    @patch("api.index.get_bazaar_prices", return_value={})
+    def test_target_quantity_ranks_by_expected_hours_to_target(self, _mock_prices):
+        result = get_leaderboard(plots=3, mode="target", target_crop="Wild Rose", target_quantity=40_000_000)
+
+        reachable = [m for m in result["leaderboard"] if m["target_plan"]["expected_hours"] is not None]
+        self.assertGreater(len(reachable), 0)
+        hours = [m["target_plan"]["expected_hours"] for m in reachable]
+        self.assertEqual(hours, sorted(hours))
+        for mutation in reachable:
+            plan = mutation["target_plan"]
+            self.assertGreaterEqual(plan["batches"] * plan["amount_per_batch"], 40_000_000)
+            self.assertLess((plan["batches"] - 1) * plan["amount_per_batch"], 40_000_000)
+            self.assertAlmostEqual(plan["expected_hours"], plan["batches"] * mutation["hourly"]["expected_hours"], places=6)
+        self.assertEqual(result["metadata"]["target_plan"]["best"]["mutationName"], reachable[0]["mutationName"])
+
+    def test_finite_horizon_spot_expectations_follow_spawn_and_growth_timing(self):
+        from api.index import _finite_horizon_spot_expectations
+
+        self.assertEqual(_finite_horizon_spot_expectations(0.25, 0, 8), (2.0, 2.0))
+        spawned, matured = _finite_horizon_spot_expectations(0.25, 1, 2)
+        self.assertAlmostEqual(spawned, 0.25 + 0.75 * 0.25, places=12)
+        self.assertAlmostEqual(matured, 0.25, places=12)
+        # Long horizons converge to the renewal rate of one harvest per 1/p + g cycles.
+        _spawned, matured = _finite_horizon_spot_expectations(0.25, 6, 10_000)
+        self.assertAlmostEqual(matured / 10_000, 1.0 / (4.0 + 6.0), places=3)
+
+    @patch("api.index.get_bazaar_prices", return_value={})
+    def test_custom_time_harvest_mode_fills_finite_horizon_fields(self, _mock_prices):
+        result = get_leaderboard(
+            plots=3,
+            mode="hourly",
+            harvest_mode="custom_time",
+            custom_time_hours=48.0,
+        )
+
+        cycle_time = result["metadata"]["cycle_time_hours"]
+        for mutation in result["leaderboard"]:
+            hourly = mutation["hourly"]
+            self.assertEqual(hourly["harvest_mode"], "custom_time")
+            self.assertEqual(hourly["harvest_time_hours"], 48.0)
+            self.assertEqual(hourly["completed_cycles"], int(48.0 // cycle_time))
+            self.assertLessEqual(hourly["expected_mutations"], hourly["expected_spawned"] + 1e-9)
+            self.assertLessEqual(hourly["expected_spawned"], mutation["limit"] * hourly["completed_cycles"])
+            self.assertAlmostEqual(hourly["expected_profit"], hourly["expected_revenue"] - mutation["opt_cost"], places=6)
+            self.assertAlmostEqual(hourly["expected_profit_per_hour"], hourly["expected_profit"] / 48.0, places=6)
+            self.assertAlmostEqual(mutation["score"], hourly["expected_profit_per_hour"], places=6)
+
+        magic = next(m for m in result["leaderboard"] if m["mutationName"] == "Magic Jellybean")
+        self.assertEqual(magic["hourly"]["expected_mutations"], 0.0)
+
+    @patch("api.index.get_bazaar_prices", return_value={"Ashwreath": {"buyPrice": 500.0, "sellPrice": 450.0}})
+    def test_renewal_mode_uses_caller_spawn_chance_and_per_harvest_cost(self, _mock_prices):
+        result = get_leaderboard(plots=2, mode="renewal", mutation_chance=0.1, per_harvest_cost=50.0)
+
+        cycle_time = result["metadata"]["cycle_time_hours"]
+        scores = [m["score"] for m in result["leaderboard"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        for mutation in result["leaderboard"]:
+            renewal = mutation["renewal"]
+            spots = mutation["limit"]
+            growth_stages = mutation["breakdown"]["growth_stages"]
+            p = 0.02 if mutation["mutationName"] == "Lonelily" else 0.1
+            v_net = (mutation["revenue"] / spots) - 50.0
+            expected_per_hour = spots / (cycle_time * ((1.0 / p) + growth_stages)) * v_net
+            self.assertAlmostEqual(renewal["p"], p, places=12)
+            self.assertEqual(renewal["N"], float(spots))
+            self.assertAlmostEqual(renewal["v_net"], v_net, places=6)
+            self.assertAlmostEqual(renewal["profit_per_hour"], expected_per_hour, places=6)
+            self.assertAlmostEqual(mutation["score"], expected_per_hour, places=6)
+
+    def test_price_dependency_index_maps_items_to_dependent_mutations(self):
+        from api.index import MUTATION_CATALOG, build_price_dependency_index
+
+        index = build_price_dependency_index(MUTATION_CATALOG)
+        for mutation in MUTATION_CATALOG:
+            self.assertIn(mutation["name"], index[mutation["name"]])
+            for ingredient, _qty in mutation["ingredients"]:
+                self.assertIn(mutation["name"], index[ingredient])
+        self.assertIs(build_price_dependency_index(MUTATION_CATALOG), index)
+
+    def test_snapshot_install_recomputes_only_rows_that_depend_on_changed_prices(self):
+        from collections import OrderedDict
+
+        import api.index as api_index
+
+        old_prices = {
+            "Wheat": {"buyPrice": 10.0, "sellPrice": 8.0},
+            "Ashwreath": {"buyPrice": 500.0, "sellPrice": 450.0},
+        }
+        new_prices = {**old_prices, "Ashwreath": {"buyPrice": 90_000.0, "sellPrice": 85_000.0}}
+        backend = api_index._cache_backend
+        with patch("api.index.get_bazaar_prices", return_value=old_prices):
+            get_leaderboard(plots=2, mode="hourly")
+
+        backend._snapshot = backend._snapshot._replace(expires_at=0.0)
+        with patch("api.index.get_bazaar_prices", return_value=new_prices), \
+                patch("api.index.compute_leaderboard_row", wraps=api_index.compute_leaderboard_row) as compute_row:
+            api_index.get_cached_bazaar_prices()
+            self.assertEqual(compute_row.call_count, len(api_index.build_price_dependency_index(api_index.MUTATION_CATALOG)["Ashwreath"]))
+            incremental = get_leaderboard(plots=2, mode="hourly")
+            self.assertEqual(compute_row.call_count, len(api_index.build_price_dependency_index(api_index.MUTATION_CATALOG)["Ashwreath"]))
+
+        with patch.object(api_index, "_leaderboard_row_cache", OrderedDict()):
+            rebuilt = get_leaderboard(plots=2, mode="hourly")
+
+        self.assertEqual(
+            [(m["mutationName"], m["score"]) for m in incremental["leaderboard"]],
+            [(m["mutationName"], m["score"]) for m in rebuilt["leaderboard"]],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
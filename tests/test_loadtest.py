@@ -0,0 +1,60 @@
+import asyncio
+from unittest.mock import patch
+
+from api import index as api_index
+from api import shared_data
+from bazaar_standin import BazaarStandIn, start_standin, synthetic_payload
+from loadtest import percentile, run_load
+
+
+def test_standin_replays_payload_through_get_bazaar_prices():
+    payload = synthetic_payload(seed=3)
+    server, url = start_standin(BazaarStandIn([payload]))
+    try:
+        with patch.object(shared_data, "BAZAAR_API_URL", url):
+            prices = shared_data.get_bazaar_prices()
+    finally:
+        server.shutdown()
+
+    quick_status = payload["products"]["ASHWREATH"]["quick_status"]
+    assert prices["Ashwreath"]["buyPrice"] == quick_status["buyPrice"]
+    assert prices["Ashwreath"]["sellPrice"] == quick_status["sellPrice"]
+
+
+def test_standin_injects_errors_and_drift():
+    payload = synthetic_payload(seed=1)
+    always_failing = BazaarStandIn([payload], error_rate=1.0)
+    status_code, body = always_failing.next_response()
+    assert status_code == 503 or body["success"] is False
+
+    drifting = BazaarStandIn([payload], drift=0.2, seed=4)
+    first = drifting.next_response()[1]["products"]["ASHWREATH"]["quick_status"]["buyPrice"]
+    second = drifting.next_response()[1]["products"]["ASHWREATH"]["quick_status"]["buyPrice"]
+    assert first != second
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.5) is None
+
+
+def test_load_run_reports_latency_and_rate_limited_requests():
+    server, url = start_standin(BazaarStandIn([synthetic_payload()]))
+    try:
+        with patch.object(shared_data, "BAZAAR_API_URL", url), \
+                patch.object(api_index, "RATE_LIMIT_MAX_REQUESTS", 10):
+            report = asyncio.run(run_load(
+                api_index.app,
+                total_requests=30,
+                concurrency=4,
+                query_factory=lambda _index: {"plots": 1},
+            ))
+    finally:
+        server.shutdown()
+
+    assert report["status_counts"] == {200: 10, 429: 20}
+    assert report["rate_429"] == 20 / 30
+    assert report["latency_p50_ms"] <= report["latency_p99_ms"]
+    assert report["throughput_rps"] > 0
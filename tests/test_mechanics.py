@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+import pytest
+
+from api import mechanics
+from api.index import MUTATION_CATALOG, _safe_float, _safe_non_negative_int
+
+
+def _compile(name, data):
+    return mechanics.compile_mechanics(name, data, _safe_float, _safe_non_negative_int)
+
+
+def test_catalog_carries_compiled_mechanics():
+    by_name = {mutation["name"]: mutation for mutation in MUTATION_CATALOG}
+
+    assert by_name["Lonelily"]["metric_spawn_chance"] == mechanics.LONELILY_METRIC_SPAWN_CHANCE
+    assert by_name["Ashwreath"]["metric_spawn_chance"] == mechanics.DEFAULT_METRIC_SPAWN_CHANCE
+    assert by_name["Ashwreath"]["warning_messages"] == ()
+    assert by_name["All-in Aloe"]["special_multiplier"] == 60.0
+    assert by_name["All-in Aloe"]["effective_special_multiplier"] == 9.37
+    assert "9.37x" in by_name["All-in Aloe"]["warning_messages"][0]
+
+
+def test_declared_curves_fill_in_values_missing_from_json():
+    jellybean = _compile("Magic Jellybean", {})
+    assert jellybean["growth_stages"] == 120
+    assert jellybean["special_multiplier"] == pytest.approx(10.0)
+    assert "120 growth stages" in jellybean["warning_messages"][0]
+
+    assert mechanics.geometric_ramp(60.0, 14)(14) == pytest.approx(60.0)
+    assert mechanics.linear_ramp(10.0, 120)(60) == pytest.approx(5.5)
+
+
+def test_registered_mechanics_apply_without_touching_the_row_code():
+    custom = mechanics.MutationMechanics(
+        spawn_chance=0.1,
+        growth_stages=4,
+        stage_multiplier=mechanics.linear_ramp(3.0, 4),
+        expected_multiplier=lambda raw, stages: raw / 2.0,
+        warnings=("Test Bloom pays {effective_special_multiplier:g}x after {growth_stages} stages.",),
+    )
+    with patch.dict(mechanics.MUTATION_MECHANICS):
+        mechanics.register_mechanics("Test Bloom", custom)
+        compiled = _compile("Test Bloom", {})
+
+    assert compiled == {
+        "growth_stages": 4,
+        "special_multiplier": 3.0,
+        "effective_special_multiplier": 1.5,
+        "metric_spawn_chance": 0.1,
+        "stage_multipliers": (1.0, 1.5, 2.0, 2.5, 3.0),
+        "reset_chance": 0.0,
+        "harvest_stage_tunable": True,
+        "footprint": 1,
+        "max_adjacent_crops": None,
+        "spread_chance": 0.0,
+        "stage_curve_placeholder": False,
+        "warning_messages": ("Test Bloom pays 1.5x after 4 stages.",),
+    }
+    assert "Test Bloom" not in mechanics.MUTATION_MECHANICS
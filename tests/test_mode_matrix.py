@@ -0,0 +1,53 @@
+from unittest.mock import patch
+
+import pytest
+
+from api import index as api_index
+from api.index import MATRIX_SELL_MODES, MATRIX_SETUP_MODES, MUTATION_CATALOG, build_price_dependency_index, get_leaderboard
+
+ITEMS = sorted(build_price_dependency_index(MUTATION_CATALOG))
+SNAPSHOT = {
+    item: {
+        "buyPrice": 100.0 + position,
+        "sellPrice": 80.0 + position,
+        "buyMovingWeek": 16_800 + position,
+        "sellMovingWeek": 8_400,
+        "buySummary": [[100.0 + position, 50], [120.0 + position, 500]],
+        "sellSummary": [[80.0 + position, 30], [60.0 + position, 500]],
+    }
+    for position, item in enumerate(ITEMS)
+}
+
+
+def _rows(**params):
+    with patch("api.index.get_bazaar_prices", return_value=SNAPSHOT):
+        return {row["mutationName"]: row for row in get_leaderboard(plots=3, **params)["leaderboard"]}
+
+
+@pytest.mark.parametrize("mode", ["profit", "hourly", "liquidity"])
+def test_matrix_cells_match_separate_requests_per_mode_pair(mode):
+    matrix_rows = _rows(mode=mode, mode_matrix=True)
+    for setup_index, setup_mode in enumerate(MATRIX_SETUP_MODES):
+        for sell_index, sell_mode in enumerate(MATRIX_SELL_MODES):
+            separate = _rows(mode=mode, setup_mode=setup_mode, sell_mode=sell_mode)
+            for name, row in matrix_rows.items():
+                matrix = row["mode_matrix"]
+                assert matrix["profit"][setup_index][sell_index] == pytest.approx(separate[name]["profit"])
+                assert matrix["profit_per_hour"][setup_index][sell_index] == pytest.approx(separate[name]["profit_per_hour"])
+                assert matrix["liquidity_adjusted_profit_per_hour"][setup_index][sell_index] == pytest.approx(
+                    separate[name]["liquidity_adjusted_profit_per_hour"]
+                )
+
+
+def test_best_combination_follows_the_ranking_metric():
+    rows = _rows(mode="hourly", mode_matrix=True)
+    matrix = rows["Magic Jellybean"]["mode_matrix"]
+    best = matrix["best"]
+    cells = [value for values in matrix["profit_per_hour"] for value in values]
+
+    assert best["metric"] == "profit_per_hour"
+    assert best["value"] == max(cells)
+    assert matrix["profit_per_hour"][MATRIX_SETUP_MODES.index(best["setup_mode"])][MATRIX_SELL_MODES.index(best["sell_mode"])] == best["value"]
+    # Buying at the bid and selling at the ask beats crossing the spread both ways.
+    assert (best["setup_mode"], best["sell_mode"]) == ("buy_order", "sell_offer")
+    assert _rows(mode="hourly")["Magic Jellybean"]["mode_matrix"] is None
@@ -1,7 +1,7 @@
 import math
 import pytest
 
-from mut_calc import compute_profit_rates
+from api.mut_calc import compute_profit_rates
 
 
 def test_g_zero_matches_npv_identity_per_cycle():
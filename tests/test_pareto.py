@@ -0,0 +1,90 @@
+import random
+from unittest.mock import patch
+
+import pytest
+
+from api import index as api_index
+from api.index import get_leaderboard, parse_pareto_metrics, pareto_point
+from api.pareto import pareto_front
+
+
+def _brute_force(points):
+    def dominates(a, b):
+        return all(x >= y for x, y in zip(a, b)) and any(x > y for x, y in zip(a, b))
+
+    return [index for index, point in enumerate(points) if not any(dominates(other, point) for other in points)]
+
+
+@pytest.mark.parametrize("dimensions", [1, 2, 3, 4, 5])
+def test_front_matches_pairwise_dominance(dimensions):
+    rng = random.Random(dimensions)
+    for _trial in range(300):
+        # Small integer grids force plenty of ties and duplicates; -inf ties like any other value.
+        points = [
+            tuple(float("-inf") if rng.random() < 0.2 else float(rng.randint(0, 5)) for _ in range(dimensions))
+            for _ in range(rng.randint(0, 40))
+        ]
+        assert pareto_front(points) == _brute_force(points)
+
+
+def test_duplicates_keep_each_other_and_infinite_values_still_compete():
+    assert pareto_front([(1.0, 2.0), (1.0, 2.0), (0.0, 1.0)]) == [0, 1]
+    assert pareto_front([(float("-inf"), 5.0), (1.0, 1.0)]) == [0, 1]
+    assert pareto_front([(float("-inf"), float("-inf"))]) == [0]
+    assert pareto_front([(float("-inf"), 4.0, float("-inf")), (1.0, 1.0, 1.0)]) == [0, 1]
+
+
+def test_metric_directions_parse_with_defaults():
+    assert parse_pareto_metrics("profit_per_hour, opt_cost ,estimated_time_hours:max,nope,opt_cost:max") == [
+        ("profit_per_hour", "max"),
+        ("opt_cost", "min"),
+        ("estimated_time_hours", "max"),
+    ]
+    row = {"profit_per_hour": 10.0, "opt_cost": 4.0, "hourly": {"expected_hours": None}}
+    assert pareto_point(row, [("profit_per_hour", "max"), ("opt_cost", "min")]) == (10.0, -4.0)
+    assert pareto_point(row, [("profit_per_hour", "max"), ("opt_cost", "min"), ("expected_hours", "min")]) is None
+
+
+def test_leaderboard_marks_the_non_dominated_rows():
+    snapshot = {
+        "Magic Jellybean": {"buyPrice": 1000, "sellPrice": 600},
+        "All-in Aloe": {"buyPrice": 90000, "sellPrice": 60000},
+        "Devourer": {"buyPrice": 40000, "sellPrice": 39000},
+    }
+    metrics = "profit_per_hour,opt_cost,estimated_time_hours"
+    with patch("api.index.get_bazaar_prices", return_value=snapshot):
+        result = get_leaderboard(plots=3, mode="hourly", pareto=metrics)
+        columns = get_leaderboard(plots=3, mode="hourly", pareto=metrics, response_format="columns")
+        plain = get_leaderboard(plots=3, mode="hourly")
+
+    rows = result["leaderboard"]
+    parsed = parse_pareto_metrics(metrics)
+    points = [pareto_point(row, parsed) for row in rows]
+    frontier = [row["mutationName"] for row, point in zip(rows, points) if row["pareto_optimal"]]
+
+    assert frontier == result["metadata"]["pareto"]["frontier"]
+    assert [entry["direction"] for entry in result["metadata"]["pareto"]["metrics"]] == ["max", "min", "min"]
+    assert [rows[index]["mutationName"] for index in _brute_force(points)] == frontier
+    assert rows[0]["pareto_optimal"]  # The best profit / hour is never dominated.
+    assert columns["columns"]["pareto_optimal"] == [row["pareto_optimal"] for row in rows]
+    assert "pareto_optimal" not in plain["leaderboard"][0]
+    assert plain["metadata"]["pareto"] is None
+
+
+def test_rows_missing_a_metric_sit_out_of_the_frontier():
+    snapshot = {
+        "Magic Jellybean": {"buyPrice": 1000, "sellPrice": 600},
+        "All-in Aloe": {"buyPrice": 90000, "sellPrice": 60000},
+        "Devourer": {"buyPrice": 40000, "sellPrice": 39000},
+    }
+    with patch("api.index.get_bazaar_prices", return_value=snapshot):
+        result = get_leaderboard(plots=3, mode="hourly", pareto="profit_per_hour,risk_adjusted_profit_per_hour")
+        alone = get_leaderboard(plots=3, mode="hourly", pareto="profit_per_hour")
+
+    # A fresh worker has no price history to risk-adjust with, so every row sits out, by name.
+    rows = result["leaderboard"]
+    assert all(row["risk_adjusted_profit_per_hour"] is None and row["pareto_optimal"] is None for row in rows)
+    assert result["metadata"]["pareto"]["excluded"] == [row["mutationName"] for row in rows]
+    assert result["metadata"]["pareto"]["frontier"] == []
+    assert alone["metadata"]["pareto"]["excluded"] == []
+    assert alone["metadata"]["pareto"]["frontier"]
@@ -0,0 +1,102 @@
+import time
+from unittest.mock import patch
+
+import pytest
+
+from api.index import get_leaderboard
+from api.optimize import maximize_linear_program
+from api.planner import plan_milestones, plan_target_quantity
+
+
+def test_simplex_solves_small_program_with_shadow_prices():
+    # max 3x + 2y s.t. x + y <= 4, x + 3y <= 6, x <= 3  ->  x=3, y=1, objective 11.
+    result = maximize_linear_program([3.0, 2.0], [[1.0, 1.0], [1.0, 3.0], [1.0, 0.0]], [4.0, 6.0, 3.0])
+
+    assert result.status == "optimal"
+    assert result.objective == pytest.approx(11.0)
+    assert result.x == pytest.approx([3.0, 1.0])
+    assert result.duals == pytest.approx([2.0, 0.0, 1.0])
+
+
+def test_simplex_reports_unbounded_programs():
+    result = maximize_linear_program([1.0, 1.0], [[1.0, -1.0]], [1.0])
+    assert result.status == "unbounded"
+
+
+def test_plan_prefers_one_batch_that_covers_everything_over_two_specialists():
+    options = [
+        {"name": "Wheat Only", "hours": 5.0, "yields": {"Wheat": 100.0}},
+        {"name": "Carrot Only", "hours": 5.0, "yields": {"Carrot": 100.0}},
+        {"name": "Both", "hours": 8.0, "yields": {"Wheat": 100.0, "Carrot": 100.0}},
+    ]
+    plan = plan_milestones(options, {"Wheat": 100.0, "Carrot": 100.0})
+
+    assert plan["status"] == "complete"
+    assert plan["total_hours"] == pytest.approx(8.0)
+    assert [(step["mutationName"], step["batches"]) for step in plan["schedule"]] == [("Both", 1)]
+
+
+def test_plan_rounds_to_whole_batches_and_reports_uncoverable_crops():
+    options = [
+        {"name": "Wheat Farm", "hours": 2.0, "yields": {"Wheat": 30.0}},
+        {"name": "Big Wheat Farm", "hours": 5.0, "yields": {"Wheat": 100.0}},
+    ]
+    plan = plan_milestones(options, {"Wheat": 130.0, "Cactus": 10.0})
+
+    assert plan["status"] == "partial"
+    assert plan["uncoverable_crops"] == ["Cactus"]
+    assert plan["coverage"]["Wheat"]["planned"] >= 130.0
+    assert plan["total_hours"] == pytest.approx(7.0)
+    assert plan["lower_bound_hours"] <= plan["total_hours"]
+    assert plan["schedule"][-1]["end_hours"] == pytest.approx(plan["total_hours"])
+
+
+def test_target_quantity_rounds_batches_and_finds_cheaper_mixed_allocation():
+    plan = plan_target_quantity(
+        ["Fast", "Small", "None"],
+        [100.0, 30.0, 0.0],
+        [10.0, 2.0, 4.0],
+        250.0,
+    )
+
+    assert plan["batches"] == [3, 9, None]
+    assert plan["hours_to_target"] == [30.0, 18.0, None]
+    assert plan["best"] == {"mutationName": "Small", "batches": 9, "expected_hours": 18.0}
+    assert plan["mixed"] is None
+
+    plan = plan_target_quantity(["Fast", "Small"], [100.0, 30.0], [5.0, 2.0], 230.0)
+    assert plan["best"]["expected_hours"] == 15.0
+    assert plan["mixed"] == {
+        "allocation": [{"mutationName": "Fast", "batches": 2}, {"mutationName": "Small", "batches": 1}],
+        "expected_hours": 12.0,
+    }
+
+
+def test_low_yield_plans_add_batches_in_bulk():
+    options = [
+        {"name": "Trickle", "hours": 3.0, "yields": {"Wheat": 0.7, "Carrot": 0.2}},
+        {"name": "Drip", "hours": 2.0, "yields": {"Carrot": 0.3}},
+    ]
+    plan = plan_milestones(options, {"Wheat": 70_000.0, "Carrot": 40_000.0})
+
+    assert plan["status"] == "complete"
+    # Trickle alone covers Wheat; Drip tops up the Carrot it leaves.
+    assert {step["mutationName"]: step["batches"] for step in plan["schedule"]} == {"Trickle": 100_000, "Drip": 66_667}
+    assert plan["total_hours"] >= plan["lower_bound_hours"]
+
+
+def test_beginner_milestone_plan_stays_interactive():
+    beginner = dict(
+        mode="smart", plots=1, fortune=0, gh_upgrade=0, unique_crops=0,
+        evergreen_chip_level=0, improved_harvest_boost=False,
+    )
+    with patch("api.index.get_bazaar_prices", return_value={}):
+        get_leaderboard(plots=1)  # Catalog and layout caches, which every request shares.
+        started = time.perf_counter()
+        plan = get_leaderboard(**beginner)["metadata"]["milestone_plan"]
+        elapsed = time.perf_counter() - started
+
+    # Low yields need thousands of batches; that must not mean thousands of planner passes.
+    assert plan["status"] == "complete" and plan["total_batches"] > 1000
+    assert plan["total_hours"] >= plan["lower_bound_hours"]
+    assert elapsed < 1.0
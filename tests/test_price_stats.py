@@ -0,0 +1,88 @@
+import math
+import random
+import time
+from unittest.mock import patch
+
+import pytest
+
+from api import index as api_index
+from api.cache_backend import MemoryCacheBackend, SharedFileCacheBackend
+from api.index import get_leaderboard
+from api.price_stats import PRICE_STATS_WINDOW, SECONDS_PER_HOUR, PriceHistory, RollingPriceStats, mid_prices
+
+
+def test_rolling_stats_match_a_rescan_of_the_window():
+    rng = random.Random(7)
+    stats = RollingPriceStats(window=20)
+    prices = []
+    for step in range(75):
+        prices.append(100.0 * math.exp(rng.gauss(0.0, 0.05) + (step * 0.01)))
+        stats.update(prices[-1], observed_at=step * 30.0)
+
+    window = prices[-20:]
+    returns = [math.log(b / a) for a, b in zip(window, window[1:])]
+    return_mean = sum(returns) / len(returns)
+    return_variance = sum((r - return_mean) ** 2 for r in returns) / len(returns)
+    summary = stats.summary()
+
+    assert summary["samples"] == 20
+    assert summary["mean"] == pytest.approx(sum(window) / 20)
+    assert summary["std"] == pytest.approx(math.sqrt(sum((p - summary["mean"]) ** 2 for p in window) / 20))
+    assert summary["hourly_volatility"] == pytest.approx(math.sqrt(return_variance / (30.0 / SECONDS_PER_HOUR)))
+    assert summary["drawdown"] == pytest.approx(1.0 - window[-1] / max(window))
+
+
+def test_history_annotates_a_copy_of_the_snapshot():
+    history = PriceHistory()
+    snapshot = {"Wheat": {"buyPrice": 10.0, "sellPrice": 8.0}, "Cactus": {"buyPrice": 0, "sellPrice": 0}}
+
+    annotated = history.observe(snapshot, observed_at=0.0)
+
+    assert "priceStats" not in snapshot["Wheat"]
+    assert annotated["Wheat"]["priceStats"]["mean"] == pytest.approx(9.0)
+    assert annotated["Wheat"]["priceStats"]["hourly_volatility"] is None
+    assert annotated["Cactus"] is snapshot["Cactus"]
+
+
+def test_leaderboard_penalizes_volatile_sell_prices():
+    # Earlier versions installed by other workers; this worker's history starts empty.
+    backend = MemoryCacheBackend()
+    now = time.time()
+    for step, price in enumerate([60_000, 66_000, 57_000, 63_000, 59_000]):
+        earlier = {"All-in Aloe": {"buyPrice": price * 1.05, "sellPrice": price}}
+        installed = backend.install_snapshot(earlier, 0.0)
+        backend.record_price_samples(installed.version, now - 30.0 * (6 - step), mid_prices(earlier), keep=PRICE_STATS_WINDOW)
+    snapshot = {
+        "All-in Aloe": {"buyPrice": 63_000, "sellPrice": 60_000},
+        "Devourer": {"buyPrice": 40_000, "sellPrice": 39_000},
+    }
+    with patch.object(api_index, "_price_history", PriceHistory()), \
+            patch.object(api_index, "_cache_backend", backend), \
+            patch("api.index.get_bazaar_prices", return_value=snapshot):
+        cautious = {row["mutationName"]: row for row in get_leaderboard(plots=3, mode="hourly")["leaderboard"]}
+        neutral = {row["mutationName"]: row for row in get_leaderboard(plots=3, mode="hourly", risk_aversion=0.0)["leaderboard"]}
+
+    aloe = cautious["All-in Aloe"]
+    assert aloe["price_risk"]["samples"] == 6
+    assert aloe["price_risk"]["profit_per_hour_sigma"] > 0
+    assert aloe["risk_adjusted_profit_per_hour"] == pytest.approx(aloe["profit_per_hour"] - aloe["price_risk"]["profit_per_hour_sigma"])
+    assert neutral["All-in Aloe"]["risk_adjusted_profit_per_hour"] == pytest.approx(aloe["profit_per_hour"])
+    # One sample has no returns yet, so there is nothing to penalize with.
+    assert cautious["Devourer"]["risk_adjusted_profit_per_hour"] is None
+
+
+def test_workers_that_take_turns_installing_share_one_series(tmp_path):
+    workers = [(SharedFileCacheBackend(str(tmp_path)), PriceHistory()) for _ in range(2)]
+    prices = [100.0, 110.0, 99.0, 121.0]
+    with patch.object(api_index, "BAZAAR_CACHE_TTL_SECONDS", 0):
+        for step, price in enumerate(prices):
+            backend, history = workers[step % 2]
+            with patch.object(api_index, "_cache_backend", backend), \
+                    patch.object(api_index, "_price_history", history), \
+                    patch("api.index.get_bazaar_prices", return_value={"Wheat": {"buyPrice": price, "sellPrice": price}}):
+                stats = api_index.get_cached_bazaar_prices()["Wheat"]["priceStats"]
+
+    # The last installer saw every version, including the ones the other worker fetched.
+    assert stats["samples"] == len(prices)
+    assert stats["mean"] == pytest.approx(sum(prices) / len(prices))
+    assert [history.version for _backend, history in workers] == [3, 4]
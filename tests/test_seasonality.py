@@ -0,0 +1,119 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import index as api_index
+from api.cache_backend import SharedFileCacheBackend
+from api.index import MUTATION_CATALOG, build_price_dependency_index, get_leaderboard
+from api.seasonality import SEASONALITY_WEEKS, SeasonalityIndex, hour_of_week, hour_of_week_label
+
+MONDAY = 4 * 86400.0  # 1970-01-05 00:00 UTC
+WEEK = 7 * 86400.0
+
+
+def _feed(index, prices_at, weeks=2, per_hour=3):
+    """Observe `per_hour` snapshots in every hour of `weeks` weeks, priced by `prices_at(bucket)`."""
+    for week in range(weeks):
+        for bucket in range(168):
+            for step in range(per_hour):
+                index.observe(prices_at(bucket), observed_at=MONDAY + (week * WEEK) + (bucket * 3600.0) + (step * 600.0))
+    # One more snapshot closes the last hour.
+    index.observe(prices_at(0), observed_at=MONDAY + (weeks * WEEK))
+
+
+def test_hour_of_week_buckets_start_monday_utc():
+    assert hour_of_week(MONDAY) == 0
+    assert hour_of_week(MONDAY + WEEK - 1) == 167
+    assert hour_of_week_label(14 + 24) == "Tue 14:00 UTC"
+
+
+def test_finished_hours_fold_into_their_bucket_as_hourly_means():
+    index = SeasonalityIndex()
+    for step, price in enumerate([100.0, 110.0, 120.0]):
+        index.observe({"Wheat": {"buyPrice": price, "sellPrice": price - 10, "buyVolume": 5}}, observed_at=MONDAY + 3600 * 5 + step * 60)
+    assert index.profile("Wheat")[5] is None
+
+    index.observe({"Wheat": {"buyPrice": 1.0, "sellPrice": 1.0}}, observed_at=MONDAY + 3600 * 6)
+    hours = index.profile("Wheat")
+    assert hours[5] == {"buyPrice": 110.0, "sellPrice": 100.0, "spread": 10.0, "volume": 5.0, "weeks": 1}
+    assert sum(entry is not None for entry in hours) == 1
+    assert index.profile("Carrot") is None
+
+
+def test_buckets_keep_a_bounded_number_of_weeks():
+    index = SeasonalityIndex()
+    _feed(index, lambda bucket: {"Wheat": {"buyPrice": 10.0, "sellPrice": 9.0}}, weeks=SEASONALITY_WEEKS + 3, per_hour=1)
+
+    assert {entry["weeks"] for entry in index.profile("Wheat")} == {SEASONALITY_WEEKS}
+
+
+def test_best_window_weighs_every_item_in_the_order():
+    index = SeasonalityIndex()
+    # Wheat is cheapest at hour 3, Carrot at hour 100; Carrot dominates the order by value.
+    _feed(index, lambda bucket: {
+        "Wheat": {"buyPrice": 8.0 if bucket == 3 else 10.0, "sellPrice": 8.0},
+        "Carrot": {"buyPrice": 50.0 if bucket == 100 else 100.0, "sellPrice": 40.0},
+    })
+
+    buy = index.best_window({"Wheat": 100.0, "Carrot": 1000.0}, "buyPrice", buying=True, now=MONDAY)
+    assert buy["hour_of_week"] == 100
+    assert buy["change"] == pytest.approx(-500.0)
+    assert index.best_window({"Wheat": 100.0}, "buyPrice", buying=True)["hour_of_week"] == 3
+    assert index.best_window({"Potato": 1.0}, "buyPrice", buying=True) is None
+
+
+def test_best_window_change_is_measured_from_the_current_hour():
+    index = SeasonalityIndex()
+    # Wheat costs 20 at hour 10, 10 at hour 3, and 15 otherwise.
+    _feed(index, lambda bucket: {"Wheat": {"buyPrice": {3: 10.0, 10: 20.0}.get(bucket, 15.0), "sellPrice": 8.0}})
+
+    at_best = index.best_window({"Wheat": 150.0}, "buyPrice", buying=True, now=MONDAY + 3 * 3600)
+    assert at_best["hour_of_week"] == 3
+    assert at_best["change"] == pytest.approx(0.0)
+    # From the dear hour, 150 coins of Wheat now costs 75 at hour 3.
+    from_peak = index.best_window({"Wheat": 150.0}, "buyPrice", buying=True, now=MONDAY + 10 * 3600)
+    assert from_peak["change"] == pytest.approx(-75.0)
+
+
+def test_index_is_shared_through_the_backend_and_survives_restarts(tmp_path):
+    writer = SeasonalityIndex(SharedFileCacheBackend(str(tmp_path)))
+    _feed(writer, lambda bucket: {"Wheat": {"buyPrice": 10.0 + bucket, "sellPrice": 9.0}}, weeks=1, per_hour=2)
+
+    # A fresh worker (or the same one after a restart) reads the same buckets.
+    reader = SeasonalityIndex(SharedFileCacheBackend(str(tmp_path)))
+    assert reader.profile("Wheat") == writer.profile("Wheat")
+    assert reader.profile("Wheat")[7]["buyPrice"] == 17.0
+
+    # An hour left open by one installer is finished by the next.
+    writer.observe({"Wheat": {"buyPrice": 50.0, "sellPrice": 9.0}}, observed_at=MONDAY + WEEK + 60)
+    reader.observe({"Wheat": {"buyPrice": 70.0, "sellPrice": 9.0}}, observed_at=MONDAY + WEEK + 3600)
+    hour = reader.profile("Wheat")[0]
+    # Week 0 averaged 10; the shared hour averaged the closing snapshot (10) and the writer's 50.
+    assert hour["weeks"] == 2
+    assert hour["buyPrice"] == pytest.approx((10.0 + 30.0) / 2)
+
+
+def test_leaderboard_projects_profit_for_timed_orders():
+    index = SeasonalityIndex()
+    items = sorted(build_price_dependency_index(MUTATION_CATALOG))
+    # Everything trades 20% dearer in the Friday evening hour.
+    _feed(index, lambda bucket: {
+        item: {"buyPrice": 120.0 if bucket == 4 * 24 + 18 else 100.0, "sellPrice": 90.0}
+        for item in items
+    })
+    snapshot = {item: {"buyPrice": 100.0, "sellPrice": 90.0} for item in items}
+    with patch.object(api_index, "_seasonality_index", index), \
+            patch("api.index.get_bazaar_prices", return_value=snapshot):
+        rows = {row["mutationName"]: row for row in get_leaderboard(plots=3, sell_mode="sell_offer", order_timing=True)["leaderboard"]}
+        client = TestClient(api_index.app)
+        seasonality = client.get("/api/seasonality", params={"items": "Ashwreath,Nope"}).json()
+
+    timing = rows["Magic Jellybean"]["order_timing"]
+    assert timing["sell_window"] == "Fri 18:00 UTC"
+    assert timing["revenue_change"] == pytest.approx(0.2 * sum(rows["Magic Jellybean"]["price_risk"]["revenue_by_item"].values()))
+    assert timing["buy_hour_of_week"] != 4 * 24 + 18
+    assert timing["projected_profit"] == pytest.approx(rows["Magic Jellybean"]["profit"] + timing["revenue_change"] - timing["setup_cost_change"])
+    assert list(seasonality["items"]) == ["Ashwreath"]
+    assert seasonality["items"]["Ashwreath"]["best_sell_offer_window"] == "Fri 18:00 UTC"
+    assert len(seasonality["items"]["Ashwreath"]["hours"]) == 168
@@ -0,0 +1,104 @@
+from unittest.mock import patch
+
+import pytest
+
+from api import garden, layout, mechanics
+from api.index import MUTATION_CATALOG, get_leaderboard
+
+DEVOURER = next(mutation for mutation in MUTATION_CATALOG if mutation["name"] == "Devourer")
+RULE = garden.adjacency_rule(DEVOURER)
+
+
+def _ring_layout(period):
+    """Devourer spots every `period` cells, corners Zombud and edges Puffercloud."""
+    grid = [[None] * garden.GREENHOUSE_SIZE for _ in range(garden.GREENHOUSE_SIZE)]
+    spots = []
+    for top in range(1, garden.GREENHOUSE_SIZE - 1, period):
+        for left in range(1, garden.GREENHOUSE_SIZE - 1, period):
+            spots.append((top, left))
+            for row in (-1, 0, 1):
+                for col in (-1, 0, 1):
+                    if row or col:
+                        grid[top + row][left + col] = "Zombud" if row and col else "Puffercloud"
+    return grid, spots
+
+
+def _spread(grid, spots, spread_chance, trials=256):
+    return garden.simulate_spread(grid, spots, RULE, spawn_chance=0.25, growth_stages=16, spread_chance=spread_chance, trials=trials)
+
+
+def test_no_spread_keeps_every_planned_spot():
+    grid, spots = _ring_layout(2)
+    result = _spread(grid, spots, 0.0, trials=32)
+    assert result["planned_spots"] == 16
+    assert result["surviving_spots"] == 16
+    assert result["destroyed"] == {"Zombud": 0.0, "Puffercloud": 0.0}
+
+
+def test_isolated_rings_lose_fewer_spots_than_shared_rings():
+    shared = _spread(*_ring_layout(2), 0.02)
+    isolated = _spread(*_ring_layout(3), 0.02)
+
+    assert shared["survival_rate"] < 1.0
+    assert isolated["survival_rate"] > shared["survival_rate"]
+    assert sum(shared["destroyed"].values()) > 0
+    # Seeded, so the estimate is reproducible.
+    assert _spread(*_ring_layout(2), 0.02) == shared
+
+
+def test_spread_losses_are_reported_by_default_and_priced_on_request():
+    rows = {row["mutationName"]: row for row in get_leaderboard(plots=2)["leaderboard"]}
+    applied = {row["mutationName"]: row for row in get_leaderboard(plots=2, apply_spread_risk=True)["leaderboard"]}
+    devourer = rows["Devourer"]
+    risk = devourer["spread_risk"]
+    measured = layout.spread_risk_for(DEVOURER)
+
+    assert rows["Ashwreath"]["spread_risk"] is None
+    assert DEVOURER["spread_chance"] == mechanics.DEVOURER_SPREAD_CHANCE
+    assert risk["applied"] is False and applied["Devourer"]["spread_risk"]["applied"] is True
+    assert risk["survival_rate"] == measured["survival_rate"] < 1.0
+    # The assumed spread chance leaves the default ranking alone.
+    assert devourer["breakdown"]["yields"][-1]["amount"] == 16 * 2
+    assert risk["lost_revenue"] == pytest.approx(devourer["revenue"] * (1 - risk["survival_rate"]))
+
+    priced = applied["Devourer"]
+    assert priced["breakdown"]["yields"][-1]["amount"] == pytest.approx(16 * 2 * risk["survival_rate"])
+    assert priced["opt_cost"] == pytest.approx(devourer["opt_cost"] + risk["replant_cost"])
+    assert priced["spread_risk"]["lost_revenue"] == pytest.approx(priced["revenue"] * (1 - risk["survival_rate"]) / risk["survival_rate"])
+    assert any("Devourer can spread" in message for message in devourer["warning_messages"])
+
+
+def test_the_sale_is_priced_at_the_surviving_quantity():
+    # Insta-selling walks these buy orders: 20 at 39k, 10 at 38k, then 30k.
+    snapshot = {"Devourer": {"buyPrice": 40000, "sellPrice": 39000, "sellSummary": [[39000, 20], [38000, 10], [30000, 100]]}}
+    with patch("api.index.get_bazaar_prices", return_value=snapshot):
+        rows = {row["mutationName"]: row for row in get_leaderboard(plots=2, sell_mode="insta_sell", apply_spread_risk=True)["leaderboard"]}
+
+    sale = rows["Devourer"]["breakdown"]["yields"][-1]
+    sold = 16 * 2 * rows["Devourer"]["spread_risk"]["survival_rate"]
+    assert sale["amount"] == pytest.approx(sold)
+    assert 20 < sold < 30  # Eaten spots keep the sale off the 30k level a full batch would reach.
+    assert sale["unit_price"] == pytest.approx((20 * 39000 + (sold - 20) * 38000) / sold)
+
+
+def test_spread_risk_compares_isolation_layouts():
+    risk = {row["mutationName"]: row for row in get_leaderboard(plots=1)["leaderboard"]}["Devourer"]["spread_risk"]
+    by_layout = {entry["layout"]: entry for entry in risk["layouts"]}
+
+    assert set(by_layout) == {"searched", "shared_rings", "private_rings"}
+    assert by_layout["searched"]["survival_rate"] == risk["survival_rate"]
+    assert by_layout["searched"]["profit_loss"] == pytest.approx(risk["profit_loss"])
+    # Private rings give up spots for redundancy: fewer planned, but nothing shared to lose.
+    assert by_layout["private_rings"]["planned_spots"] < by_layout["shared_rings"]["planned_spots"]
+    assert by_layout["private_rings"]["survival_rate"] > by_layout["shared_rings"]["survival_rate"]
+    for entry in risk["layouts"]:
+        assert entry["surviving_spots"] == pytest.approx(entry["planned_spots"] * entry["survival_rate"])
+
+
+def test_spread_and_garden_age_spawns_the_same_way():
+    grid, spots = _ring_layout(3)
+    result = garden.simulate_spread(grid, spots[:1], RULE, spawn_chance=1.0, growth_stages=3, spread_chance=0.0, trials=4)
+    # The spawn cycle plus three growth cycles, the last of which harvests: 1/p + g, as the garden measures.
+    assert result["batch_cycles"] == 1 + 3
+    (measured,) = garden.simulate_garden([grid], RULE, spawn_chance=1.0, growth_stages=3, cycles=40)
+    assert measured["harvests_per_cycle"] * result["batch_cycles"] == pytest.approx(measured["qualifying_spots"], rel=0.05)
@@ -0,0 +1,62 @@
+from unittest.mock import patch
+
+import pytest
+
+from api import index as api_index
+from api.index import get_leaderboard
+from api.stability import price_noise_widths, rank_stability
+
+
+def _row(name, score, exposure):
+    return {"mutationName": name, "score": score, "price_exposure": exposure}
+
+
+def test_widths_are_relative_half_spreads_and_skip_one_sided_quotes():
+    widths = price_noise_widths(
+        {"Wheat": {"buyPrice": 110, "sellPrice": 90}, "Carrot": {"buyPrice": 5, "sellPrice": 0}},
+        ["Wheat", "Carrot", "Potato"],
+    )
+
+    assert widths == {"Wheat": pytest.approx(0.1)}
+
+
+def test_rank_probabilities_follow_the_shared_price_shock():
+    # A scores 10 + 20s against B's 0 for a shock s uniform in [-1, 1], so A leads 75% of the time.
+    rows = [_row("A", 10.0, {"X": 20.0}), _row("B", 0.0, {})]
+    stability = rank_stability(rows, {"X": 1.0}, draws=4000, seed=3)
+
+    assert stability["A"]["p_top1"] == pytest.approx(0.75, abs=0.03)
+    assert stability["A"]["p_top1"] + stability["B"]["p_top1"] == pytest.approx(1.0)
+    assert (stability["A"]["rank_low"], stability["A"]["rank_high"]) == (1, 2)
+    assert stability == rank_stability(rows, {"X": 1.0}, draws=4000, seed=3)
+
+
+def test_rows_that_share_an_ingredient_move_together():
+    # Both rows pay for X, so its shock never swaps them.
+    rows = [_row("A", 10.0, {"X": -50.0}), _row("B", 9.0, {"X": -50.0})]
+    stability = rank_stability(rows, {"X": 1.0}, draws=500)
+
+    assert stability["A"]["p_top1"] == 1.0
+    assert stability["B"]["rank_low"] == stability["B"]["rank_high"] == 2
+
+
+def test_leaderboard_reports_rank_stability_on_request():
+    snapshot = {
+        "Magic Jellybean": {"buyPrice": 1000, "sellPrice": 600},
+        "All-in Aloe": {"buyPrice": 90000, "sellPrice": 60000},
+        "Devourer": {"buyPrice": 40000, "sellPrice": 39000},
+    }
+    with patch("api.index.get_bazaar_prices", return_value=snapshot):
+        result = get_leaderboard(plots=3, mode="hourly", stability_draws=300)
+        plain = get_leaderboard(plots=3, mode="hourly")
+
+    rows = {row["mutationName"]: row for row in result["leaderboard"]}
+    assert result["metadata"]["stability_draws"] == 300
+    assert rows["All-in Aloe"]["price_exposure"]["All-in Aloe"] > 0
+    assert rows["All-in Aloe"]["price_exposure"]["Magic Jellybean"] < 0
+    assert sum(row["rank_stability"]["p_top1"] for row in rows.values()) == pytest.approx(1.0)
+    assert sum(row["rank_stability"]["p_top5"] for row in rows.values()) == pytest.approx(5.0)
+    for row in rows.values():
+        stability = row["rank_stability"]
+        assert stability["rank_low"] <= stability["median_rank"] <= stability["rank_high"]
+    assert "rank_stability" not in plain["leaderboard"][0]
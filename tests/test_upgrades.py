@@ -0,0 +1,108 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import index as api_index
+from api.index import get_leaderboard, get_upgrade_gains
+from api.upgrades import parse_upgrade_costs
+
+SNAPSHOT = {
+    "Magic Jellybean": {"buyPrice": 1000, "sellPrice": 600},
+    "All-in Aloe": {"buyPrice": 90000, "sellPrice": 60000},
+    "Devourer": {"buyPrice": 40000, "sellPrice": 39000},
+    "Wheat": {"buyPrice": 8, "sellPrice": 6},
+    "Sugar Cane": {"buyPrice": 10, "sellPrice": 8},
+    "Cactus": {"buyPrice": 9, "sellPrice": 7},
+}
+PLAYER = {
+    "plots": 2,
+    "fortune": 1800,
+    "gh_yield_upgrade": 4,
+    "gh_speed_upgrade": 5,
+    "unique_crops": 8,
+    "evergreen_chip_level": 10,
+    "overdrive_chip_level": 3,
+    "overdrive_crop": "Wheat",
+    "infini_vacuum": True,
+    "hypercharge_level": 2,
+}
+# Each step and the leaderboard params that take it.
+STEPPED = {
+    "fortune": {"fortune": 1900},
+    "greenhouse_yield": {"gh_yield_upgrade": 5},
+    "greenhouse_speed": {"gh_speed_upgrade": 6},
+    "unique_crop": {"unique_crops": 9},
+    "evergreen_chip": {"evergreen_chip_level": 11},
+    "overdrive_chip": {"overdrive_chip_level": 4},
+    "hypercharge_chip": {"hypercharge_level": 3},
+}
+
+
+def _rows(**params):
+    return {row["mutationName"]: row for row in get_leaderboard(**{**PLAYER, **params})["leaderboard"]}
+
+
+def test_costs_parse_known_steps_only():
+    costs = parse_upgrade_costs("greenhouse_yield:5e6, fortune:2000000,nope:1,unique_crop:-3,overdrive_chip:x", ["fortune", "greenhouse_yield", "unique_crop"])
+
+    assert costs == {"greenhouse_yield": 5e6, "fortune": 2e6}
+
+
+def test_step_gains_match_rerunning_the_leaderboard():
+    with patch("api.index.get_bazaar_prices", return_value=SNAPSHOT):
+        report = get_upgrade_gains(get_leaderboard(**PLAYER), upgrade_costs="greenhouse_yield:1e6,unique_crop:4e6")
+        base = _rows()
+        stepped = {name: _rows(**params) for name, params in STEPPED.items()}
+
+    assert set(report["steps"]) == set(STEPPED)
+    for entry in report["mutations"]:
+        name = entry["mutationName"]
+        for step, rows in stepped.items():
+            gain = entry["gains"][step]
+            assert gain["profit"] == pytest.approx(rows[name]["profit"] - base[name]["profit"], rel=1e-9, abs=1e-6), (name, step)
+            assert gain["profit_per_hour"] == pytest.approx(rows[name]["profit_per_hour"] - base[name]["profit_per_hour"], rel=1e-9, abs=1e-6), (name, step)
+
+    aloe = next(entry for entry in report["mutations"] if entry["mutationName"] == "All-in Aloe")
+    assert aloe["gains"]["greenhouse_yield"]["profit_per_coin"] == pytest.approx(aloe["gains"]["greenhouse_yield"]["profit"] / 1e6)
+    assert aloe["gains"]["fortune"]["cost"] is None
+    assert aloe["best_step"] in {"greenhouse_yield", "unique_crop"}
+
+
+def test_derivatives_are_the_slopes_of_the_step_gains():
+    with patch("api.index.get_bazaar_prices", return_value=SNAPSHOT):
+        report = get_upgrade_gains(get_leaderboard(**PLAYER), upgrade_costs="")
+
+    steps = report["steps"]
+    for entry in report["mutations"]:
+        derivatives = entry["derivatives"]["profit"]
+        # Profit is linear in fortune, overdrive and the additive base, so slope x step is exact.
+        assert entry["gains"]["fortune"]["profit"] == pytest.approx(derivatives["fortune"] * steps["fortune"]["deltas"]["fortune"])
+        assert entry["gains"]["overdrive_chip"]["profit"] == pytest.approx(derivatives["overdrive_bonus"] * steps["overdrive_chip"]["deltas"]["overdrive_bonus"])
+        assert entry["gains"]["greenhouse_yield"]["profit"] == pytest.approx(derivatives["additive_base"] * steps["greenhouse_yield"]["deltas"]["additive_base"])
+        assert entry["gains"]["greenhouse_speed"]["profit"] == 0.0
+        if entry["profit_per_hour"]:
+            assert entry["derivatives"]["profit_per_hour"]["cycle_time_hours"] * entry["gains"]["greenhouse_speed"]["profit_per_hour"] <= 0
+
+
+def test_maxed_player_only_has_fortune_and_open_chips():
+    with patch("api.index.get_bazaar_prices", return_value=SNAPSHOT):
+        client = TestClient(api_index.app)
+        response = client.get("/api/upgrades", params={"plots": 3, "overdrive_chip_level": 20})
+        columns = client.get("/api/upgrades", params={"format": "columns"})
+
+    assert response.status_code == 200
+    assert "X-RateLimit-Limit" in response.headers
+    assert set(response.json()["steps"]) == {"fortune"}
+    assert columns.status_code == 400
+
+
+def test_overdrive_without_a_crop_goes_to_the_best_crop():
+    with patch("api.index.get_bazaar_prices", return_value=SNAPSHOT):
+        report = get_upgrade_gains(get_leaderboard(plots=3, overdrive_chip_level=0), upgrade_costs="")
+
+    for entry in report["mutations"]:
+        gain = entry["gains"]["overdrive_chip"]
+        if gain["profit"] > 0:
+            assert gain["overdrive_crop"] is not None
+            assert gain["profit"] <= entry["gains"]["fortune"]["profit"] * 7.0 / 100.0 + 1e-6